@@ -4,6 +4,10 @@ import mathutils
 from .panel import OBJECT_PT_GridGeneratorPanel
 from .operators.generate_nodes import GenerateNodesOperator
 from .operators.create_edges import CreateEdgesOperator
+from .operators.delete_grid import DeleteGridOperator
+from .operators.bake_edges import BakeEdgesOperator
+from .operators.clear_grid_cache import ClearGridCacheOperator
+from .operators.fit_grid import FitGridToSelectionOperator
 from .operators.update_operators import (
     UpdateTextSizeOperator,
     UpdateEdgeSizeOperator,
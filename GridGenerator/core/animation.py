@@ -0,0 +1,349 @@
+import logging
+import time
+from types import SimpleNamespace
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+
+from . import registry
+from .billboard import TEXT_INDEX_ATTRIBUTE
+from .labels import LabelDataCache, label_axes, label_locations, label_texts
+from .lattice import index_lookup, lattice_for_settings
+from .node_cloud import INDEX_ATTRIBUTES
+from .procedural import MODIFIER_NAME as PROCEDURAL_MODIFIER, procedural_inputs, write_inputs
+from .topology import edge_topology, used_rows
+
+# Animated grids: on every frame change the keyframed distances and unit scale
+# of the scene settings are applied to the objects and data of the active grid
+# as it was built. Locations and scales of all grid objects are written with one
+# foreach_set each, meshes with one foreach_set per mesh, and only labels whose
+# text changed are pointed at another shared curve or glyph. Grids are bound when
+# animation is turned on, after a build and after a file load: binding creates
+# the curves and glyphs of every text the keyframes reach in the frame range, so
+# the frame handler never creates or deletes anything.
+
+logger = logging.getLogger(__name__)
+
+ANIMATED_KEYS = ('distance_x', 'distance_y', 'distance_z', 'unit_scale')
+
+# Bindings of grids to the rows of their objects, by grid pointer
+_bindings = {}
+
+
+def animated_values(grid_settings):
+    return tuple(getattr(grid_settings, key) for key in ANIMATED_KEYS)
+
+
+def _point_rows(mesh, lookup):
+    # Lattice rows of the points of a mesh carrying the lattice index attributes
+    indices = np.empty((len(mesh.vertices), 3), dtype=np.int32)
+    for axis, name in enumerate(INDEX_ATTRIBUTES):
+        values = np.empty(len(mesh.vertices), dtype=np.int32)
+        mesh.attributes[name].data.foreach_get("value", values)
+        indices[:, axis] = values
+    return np.array([lookup[index] for index in map(tuple, indices.tolist())], dtype=np.int64)
+
+
+def _sampled_distances(scene):
+    # Distances at every frame of the scene range, rounded like the float properties
+    grid_settings = scene.grid_settings
+    current = tuple(getattr(grid_settings, key) for key in ANIMATED_KEYS[:3])
+    action = scene.animation_data.action if scene.animation_data is not None else None
+    fcurves = [action.fcurves.find(f"grid_settings.{key}") if action is not None else None
+               for key in ANIMATED_KEYS[:3]]
+    samples = {current}
+    if any(fcurve is not None for fcurve in fcurves):
+        for frame in range(scene.frame_start, scene.frame_end + 1):
+            samples.add(tuple(float(np.float32(fcurve.evaluate(frame))) if fcurve is not None else value
+                              for fcurve, value in zip(fcurves, current)))
+    return samples
+
+
+class GridBinding:
+    # Rows of the lattice every object, vertex and label of a grid was built from
+
+    def __init__(self, grid, scene):
+        self.grid = grid
+        self.snapshot = registry.settings_snapshot(grid)
+        self.base = lattice_for_settings(self.snapshot)
+        self.base_scale = self.snapshot.get('unit_scale', 1.0)
+        self.values = None
+        lookup = index_lookup(self.base)
+        slots = {obj: slot for slot, obj in enumerate(grid.objects)}
+        self.object_count = len(slots)
+
+        nodes = [(slots[obj], lookup[registry.parse_key(key)])
+                 for key, obj in registry.object_map(grid, 'nodes').items()]
+        self.node_slots, self.node_rows = self._split(nodes)
+
+        labels = [(slots[obj], lookup[registry.parse_key(key)])
+                  for key, obj in registry.object_map(grid, 'labels').items()]
+        self.label_slots, self.label_rows = self._split(labels)
+
+        self._bind_edges(grid, slots, lookup)
+        # Objects whose transform is written, tagged since foreach_set skips the update callbacks
+        objects = list(grid.objects)
+        moved = np.unique(np.concatenate((self.node_slots, self.label_slots, self.edge_slots)))
+        self.moved_objects = [objects[slot] for slot in moved.tolist()]
+
+        self.cloud = registry.get_member(grid, 'cloud')
+        self.edge_mesh = registry.get_member(grid, 'edge_mesh')
+        self.edge_mesh_rows = used_rows(edge_topology(self.base))[0] if self.edge_mesh is not None else None
+
+        self.billboard = registry.get_member(grid, 'billboard')
+        self.billboard_rows = None
+        self.billboard_index = None
+        if self.billboard is not None:
+            self.billboard_rows = _point_rows(self.billboard.data, lookup)
+
+        self.procedural = registry.get_member(grid, 'procedural')
+        self.missed_texts = False
+        self._bind_texts(scene)
+
+    def _bind_texts(self, scene):
+        # Labels keep sharing one curve, and billboard points one glyph, per text:
+        # a new text is a pointer to another shared curve or glyph, made here
+        self.label_objects = [self.grid.objects[slot] for slot in self.label_slots.tolist()]
+        self.text_curves = {}
+        self.glyph_index = {}
+        rows = self._text_rows()
+        if not len(rows) or self.procedural is not None:
+            return
+        mask = np.zeros(len(self.base.coords), dtype=bool)
+        mask[rows] = True
+        texts = {}
+        for distances in _sampled_distances(scene):
+            settings = dict(self.snapshot, **dict(zip(ANIMATED_KEYS[:3], distances)))
+            lattice = lattice_for_settings(settings)
+            texts.update(dict.fromkeys(text for _, text in label_texts(lattice, SimpleNamespace(**settings), mask)))
+
+        font_path = self.snapshot.get('custom_font') if self.snapshot.get('use_custom_font') else None
+        cache = LabelDataCache(self.grid, font_path or None)
+        self.text_curves = {text: cache.curve(text) for text in texts}
+        if self.billboard is not None:
+            glyphs = registry.object_map(self.grid, 'glyphs')
+            collection = registry.get_member(self.grid, 'glyph_collection')
+            for text in texts:
+                if text not in glyphs:
+                    glyph = bpy.data.objects.new(f"GridGlyph_{len(glyphs):06d}", self.text_curves[text])
+                    collection.objects.link(glyph)
+                    glyphs[text] = glyph
+            registry.set_map(self.grid, 'glyphs', glyphs)
+            # The instancer picks glyphs by their position in name order
+            order = {obj.name: i for i, obj in enumerate(sorted(collection.objects, key=lambda obj: obj.name))}
+            self.glyph_index = {text: order[glyph.name] for text, glyph in glyphs.items()}
+        cache.store()
+
+    def _text_rows(self):
+        if self.billboard_rows is None:
+            return self.label_rows
+        return np.concatenate((self.label_rows, self.billboard_rows))
+
+    @staticmethod
+    def _split(pairs):
+        if not pairs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        slots, rows = zip(*pairs)
+        return np.array(slots, dtype=np.int64), np.array(rows, dtype=np.int64)
+
+    def _bind_edges(self, grid, slots, lookup):
+        # Edges run along one world axis: moving them is a translation plus a
+        # stretch of the local axis that maps onto it, so thickness never changes
+        pairs = []
+        for key, obj in registry.object_map(grid, 'edges').items():
+            start, end = key.split("-")
+            pairs.append((slots[obj], lookup[registry.parse_key(start)], lookup[registry.parse_key(end)]))
+        self.edge_slots = np.array([pair[0] for pair in pairs], dtype=np.int64)
+        self.edge_rows = np.array([pair[1:] for pair in pairs], dtype=np.int64).reshape(-1, 2)
+        base = self.base.coords
+        self.edge_base_start = base[self.edge_rows[:, 0]]
+        delta = base[self.edge_rows[:, 1]] - self.edge_base_start
+        self.edge_axis = np.argmax(np.abs(delta), axis=1)
+        self.edge_base_length = np.abs(delta[np.arange(len(delta)), self.edge_axis])
+
+        # Transforms as built, taken from the lattice since the objects may already have moved
+        self.edge_base_scale = np.ones((len(pairs), 3))
+        if registry.get_member(grid, 'edge_curve') is not None:
+            # Instanced edges sit on their start and stretch the unit curve along local Z
+            self.edge_base_location = self.edge_base_start.copy()
+            self.edge_local_axis = np.full(len(pairs), 2, dtype=np.int64)
+            self.edge_base_scale[:, 2] = self.edge_base_length
+        else:
+            # Curve edges keep world-space points under an identity transform
+            self.edge_base_location = np.zeros((len(pairs), 3))
+            self.edge_local_axis = self.edge_axis
+
+    def is_stale(self, grid):
+        return len(grid.objects) != self.object_count or registry.settings_snapshot(grid) != self.snapshot
+
+    def apply(self, grid_settings):
+        values = animated_values(grid_settings)
+        if values == self.values:
+            return False
+        self.values = values
+
+        settings = dict(self.snapshot, **dict(zip(ANIMATED_KEYS[:3], values[:3])))
+        ratio = values[3] / self.base_scale if self.base_scale else 1.0
+        if self.procedural is not None:
+            self._apply_procedural(settings, ratio)
+            return True
+
+        lattice = lattice_for_settings(settings)
+        coords = lattice.coords * ratio
+        label_settings = SimpleNamespace(**settings)
+        label_axis = label_axes(lattice, label_settings)
+
+        objects = self.grid.objects
+        count = len(objects)
+        locations = np.empty(count * 3, dtype=np.float32)
+        scales = np.empty(count * 3, dtype=np.float32)
+        objects.foreach_get("location", locations)
+        objects.foreach_get("scale", scales)
+        locations = locations.reshape(-1, 3)
+        scales = scales.reshape(-1, 3)
+
+        locations[self.node_slots] = coords[self.node_rows]
+        if len(self.label_rows):
+            locations[self.label_slots] = label_locations(coords[self.label_rows], label_axis[self.label_rows],
+                                                          label_settings)
+        if len(self.edge_rows):
+            self._move_edges(coords, locations, scales)
+
+        objects.foreach_set("location", locations.ravel())
+        objects.foreach_set("scale", scales.ravel())
+        for obj in self.moved_objects:
+            obj.update_tag(refresh={'OBJECT'})
+
+        if self.cloud is not None:
+            self._write_points(self.cloud.data, coords)
+        if self.edge_mesh is not None:
+            self._write_points(self.edge_mesh.data, coords[self.edge_mesh_rows])
+        if self.billboard_rows is not None:
+            rows = self.billboard_rows
+            self._write_points(self.billboard.data,
+                               label_locations(coords[rows], label_axis[rows], label_settings))
+        self._write_texts(lattice, label_settings)
+        return True
+
+    def _move_edges(self, coords, locations, scales):
+        rows = np.arange(len(self.edge_rows))
+        start = coords[self.edge_rows[:, 0]]
+        length = np.abs((coords[self.edge_rows[:, 1]] - start)[rows, self.edge_axis])
+        stretch = length / np.maximum(self.edge_base_length, 1e-12)
+
+        offset = self.edge_base_location - self.edge_base_start
+        offset[rows, self.edge_axis] *= stretch
+        locations[self.edge_slots] = start + offset
+        scale = self.edge_base_scale.copy()
+        scale[rows, self.edge_local_axis] *= stretch
+        scales[self.edge_slots] = scale
+
+    def _write_points(self, mesh, points):
+        mesh.vertices.foreach_set("co", np.asarray(points, dtype=np.float32).ravel())
+        mesh.update()
+
+    def _write_texts(self, lattice, settings):
+        if not self.text_curves:
+            return
+        mask = np.zeros(len(lattice.coords), dtype=bool)
+        mask[self._text_rows()] = True
+        texts = dict(label_texts(lattice, settings, mask))
+        missed = False
+        for obj, row in zip(self.label_objects, self.label_rows.tolist()):
+            curve = self.text_curves.get(texts.get(row))
+            if curve is None:
+                missed = True
+            elif obj.data != curve:
+                obj.data = curve
+
+        if self.billboard_rows is not None:
+            index = np.array([self.glyph_index.get(texts.get(row), -1) for row in self.billboard_rows.tolist()],
+                             dtype=np.int32)
+            mesh = self.billboard.data
+            if self.billboard_index is None:
+                self.billboard_index = np.empty(len(mesh.vertices), dtype=np.int32)
+                mesh.attributes[TEXT_INDEX_ATTRIBUTE].data.foreach_get("value", self.billboard_index)
+            unknown = index < 0
+            missed |= bool(unknown.any())
+            index[unknown] = self.billboard_index[unknown]
+            if not np.array_equal(index, self.billboard_index):
+                mesh.attributes[TEXT_INDEX_ATTRIBUTE].data.foreach_set("value", index)
+                mesh.update()
+                self.billboard_index = index
+
+        if missed and not self.missed_texts:
+            # Values past the frame range, or keyframes edited after binding
+            self.missed_texts = True
+            logger.warning("Some labels of %s keep their text: it was not bound. Turn Animate Grid off and on "
+                           "to bind the current keyframes", self.grid.name)
+
+    def _apply_procedural(self, settings, ratio):
+        obj = self.procedural
+        modifier = obj.modifiers.get(PROCEDURAL_MODIFIER)
+        if modifier is None or modifier.node_group is None:
+            return
+        inputs = procedural_inputs(SimpleNamespace(**settings))
+        inputs = {"Size": tuple(value * ratio for value in inputs["Size"])}
+        write_inputs(modifier, inputs)
+        obj.update_tag()
+
+
+def bind_active_grid(scene):
+    # Binds the active grid if the scene animates it. Binding creates datablocks,
+    # so it runs from operators, update callbacks and load_post, never per frame.
+    live = {grid.as_pointer() for grid in registry.iter_grids()}
+    for key in [key for key in _bindings if key not in live]:
+        del _bindings[key]
+    grid = registry.get_active_grid(scene)
+    if grid is None:
+        return None
+    _bindings.pop(grid.as_pointer(), None)
+    if not scene.grid_settings.animate_grid:
+        return None
+    binding = _bindings[grid.as_pointer()] = GridBinding(grid, scene)
+    binding.apply(scene.grid_settings)
+    return binding
+
+
+def animate_grid(scene):
+    grid = registry.get_active_grid(scene)
+    if grid is None:
+        return False
+    binding = _bindings.get(grid.as_pointer())
+    if binding is None:
+        return False
+    if binding.is_stale(grid):
+        _bindings.pop(grid.as_pointer(), None)
+        logger.warning("%s changed since it was bound. Turn Animate Grid off and on to bind it again", grid.name)
+        return False
+    start = time.perf_counter()
+    try:
+        changed = binding.apply(scene.grid_settings)
+    except (KeyError, ReferenceError) as error:
+        # The grid changed under the binding
+        _bindings.pop(grid.as_pointer(), None)
+        logger.warning("Could not animate %s: %s", grid.name, error)
+        return False
+    if changed:
+        logger.debug("Animated %s in %.4f s", grid.name, time.perf_counter() - start)
+    return changed
+
+
+def clear_bindings():
+    _bindings.clear()
+
+
+@persistent
+def animate_grids(scene, depsgraph=None):
+    if scene.grid_settings.animate_grid:
+        animate_grid(scene)
+
+
+@persistent
+def reset_bindings(*args):
+    # Pointers are not stable across file loads, the animated grids are bound again
+    clear_bindings()
+    for scene in bpy.data.scenes:
+        if scene.grid_settings.animate_grid:
+            bind_active_grid(scene)
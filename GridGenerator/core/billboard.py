@@ -0,0 +1,123 @@
+import bpy
+import numpy as np
+
+from . import registry
+from .node_cloud import INDEX_ATTRIBUTES
+from .procedural import _TreeBuilder, write_inputs
+
+# Billboarded labels are one point mesh whose Geometry Nodes modifier instances
+# a glyph object per point and turns every instance toward the camera. The
+# whole grid is a single depsgraph node instead of one TRACK_TO constraint per
+# label object.
+
+BILLBOARD_GROUP_NAME = "GridGenerator Label Billboard"
+BILLBOARD_OBJECT_NAME = "GridLabels"
+GLYPH_COLLECTION_NAME = "GridLabel Glyphs"
+MODIFIER_NAME = "Label Billboard"
+TEXT_INDEX_ATTRIBUTE = "text_index"
+
+GROUP_INPUTS = (
+    ("Geometry", 'NodeSocketGeometry', None),
+    ("Glyphs", 'NodeSocketCollection', None),
+    ("Camera", 'NodeSocketObject', None),
+    ("Text Size", 'NodeSocketFloat', 0.5),
+    ("Face Camera", 'NodeSocketBool', True),
+    ("Rotation", 'NodeSocketVector', (0.0, 0.0, 0.0)),
+)
+
+
+def _build_group():
+    group = bpy.data.node_groups.new(BILLBOARD_GROUP_NAME, 'GeometryNodeTree')
+    for name, socket_type, default in GROUP_INPUTS:
+        socket = group.interface.new_socket(name, in_out='INPUT', socket_type=socket_type)
+        if default is not None:
+            socket.default_value = default
+    group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    b = _TreeBuilder(group)
+    gi = b.node('NodeGroupInput')
+    go = b.node('NodeGroupOutput')
+
+    # Children come out sorted by name, which is the order text_index refers to
+    glyphs = b.node('GeometryNodeCollectionInfo', {'Collection': gi.outputs['Glyphs'],
+                                                   'Separate Children': True, 'Reset Children': True},
+                    transform_space='ORIGINAL').outputs[0]
+
+    position = b.node('GeometryNodeInputPosition').outputs['Position']
+    camera = b.node('GeometryNodeObjectInfo', {'Object': gi.outputs['Camera']},
+                    transform_space='RELATIVE').outputs['Location']
+    facing = b.align((0.0, 0.0, 0.0), b.vmath('SUBTRACT', camera, position), 'Z')
+    facing = b.align(facing, (0.0, 0.0, 1.0), 'Y', pivot_axis='Z')
+    rotation = b.switch('ROTATION', gi.outputs['Face Camera'], gi.outputs['Rotation'], facing)
+
+    instances = b.node('GeometryNodeInstanceOnPoints', {
+        'Points': gi.outputs['Geometry'],
+        'Instance': glyphs,
+        'Pick Instance': True,
+        'Instance Index': b.attribute(TEXT_INDEX_ATTRIBUTE, 'INT'),
+        'Rotation': rotation,
+        'Scale': gi.outputs['Text Size'],
+    }).outputs['Instances']
+    b.set_input(go.inputs['Geometry'], instances)
+    return group
+
+
+def get_billboard_group():
+    group = bpy.data.node_groups.get(BILLBOARD_GROUP_NAME)
+    if group is None:
+        group = _build_group()
+    return group
+
+
+def build_billboard(grid, texts, locations, indices, size, cache, camera=None, rotation=None):
+    # One glyph object per distinct text, sharing the cached label curves
+    glyph_collection = bpy.data.collections.new(GLYPH_COLLECTION_NAME)
+    glyphs = {}
+    for i, text in enumerate(dict.fromkeys(texts)):
+        glyph = bpy.data.objects.new(f"GridGlyph_{i:06d}", cache.curve(text))
+        glyph_collection.objects.link(glyph)
+        glyphs[text] = glyph
+    cache.store()
+    order = {obj.name: i for i, obj in enumerate(sorted(glyphs.values(), key=lambda obj: obj.name))}
+    text_index = np.array([order[glyphs[text].name] for text in texts], dtype=np.int32)
+
+    mesh = bpy.data.meshes.new(BILLBOARD_OBJECT_NAME)
+    mesh.vertices.add(len(texts))
+    mesh.vertices.foreach_set("co", np.asarray(locations, dtype=np.float32).ravel())
+    attribute = mesh.attributes.new(TEXT_INDEX_ATTRIBUTE, 'INT', 'POINT')
+    attribute.data.foreach_set("value", text_index)
+    # Lattice index of every point, so the points can be moved without the layout
+    indices = np.asarray(indices, dtype=np.int32).reshape(-1, 3)
+    for axis, attribute_name in enumerate(INDEX_ATTRIBUTES):
+        mesh.attributes.new(attribute_name, 'INT', 'POINT').data.foreach_set("value", indices[:, axis])
+    mesh.update()
+
+    obj = bpy.data.objects.new(BILLBOARD_OBJECT_NAME, mesh)
+    registry.link_object(grid, obj)
+    modifier = obj.modifiers.new(name=MODIFIER_NAME, type='NODES')
+    modifier.node_group = get_billboard_group()
+    if camera is not None:
+        write_inputs(modifier, {"Camera": camera})
+    write_inputs(modifier, {
+        "Glyphs": glyph_collection,
+        "Text Size": size,
+        "Face Camera": camera is not None,
+        "Rotation": tuple(rotation) if rotation is not None else (0.0, 0.0, 0.0),
+    })
+
+    registry.set_member(grid, 'billboard', obj)
+    registry.set_member(grid, 'glyph_collection', glyph_collection)
+    registry.set_map(grid, 'glyphs', glyphs)
+    return obj
+
+
+def set_billboard_text_size(grid, size):
+    obj = registry.get_member(grid, 'billboard')
+    if obj is None:
+        return False
+    modifier = obj.modifiers.get(MODIFIER_NAME)
+    if modifier is None or modifier.node_group is None:
+        return False
+    write_inputs(modifier, {"Text Size": size})
+    obj.update_tag()
+    return True
@@ -0,0 +1,160 @@
+import math
+
+import numpy as np
+
+from .lattice import UNIT_SCALE, axis_subdivisions, grid_rotation
+
+# World-space bounds of scene data and the grid extents that fit them. The
+# points of each object are read with one foreach_get and reduced with NumPy,
+# so objects with millions of vertices take milliseconds.
+
+# Objects whose geometry can be fitted, point data is read where it exists and
+# the bounding box is used for everything else, volumes included
+FIT_TYPES = {'MESH', 'POINTCLOUD', 'CURVES', 'VOLUME', 'CURVE', 'SURFACE', 'META', 'FONT'}
+POINT_TYPES = {'MESH', 'POINTCLOUD', 'CURVES'}
+
+# Units the fit picks from, decimeters and the like are left to the user
+FIT_UNITS = ('nm', 'µm', 'mm', 'cm', 'm', 'km')
+NICE_STEPS = (1.0, 2.0, 2.5, 5.0)
+
+# Limits of the distance settings
+MIN_DISTANCE = 0.1
+MAX_DISTANCE = 1000.0
+
+
+def _positions(data):
+    attribute = data.attributes.get("position") if hasattr(data, "attributes") else None
+    if attribute is None or attribute.data_type != 'FLOAT_VECTOR' or attribute.domain != 'POINT':
+        return None
+    points = np.empty(len(attribute.data) * 3, dtype=np.float32)
+    attribute.data.foreach_get("vector", points)
+    return points.reshape(-1, 3)
+
+
+def _local_points(obj, depsgraph):
+    # Points of the evaluated geometry in object space, None if it has no point data
+    if obj.type not in POINT_TYPES:
+        return None
+    evaluated = obj.evaluated_get(depsgraph)
+    if obj.type != 'MESH':
+        return _positions(evaluated.data)
+    if not obj.modifiers:
+        return _positions(obj.data)
+    mesh = evaluated.to_mesh()
+    try:
+        return _positions(mesh)
+    finally:
+        evaluated.to_mesh_clear()
+
+
+def _transformed_bounds(points, matrix):
+    # One world axis at a time: reducing a contiguous 1D array is several times
+    # faster than reducing an (N, 3) array along its first axis
+    linear = matrix[:3, :3].astype(points.dtype)
+    lower, upper = np.empty(3), np.empty(3)
+    for axis in range(3):
+        values = points @ linear[axis]
+        lower[axis], upper[axis] = values.min(), values.max()
+    return lower + matrix[:3, 3], upper + matrix[:3, 3]
+
+
+def object_bounds(obj, depsgraph):
+    # (lower, upper, point count) in world space, None for empty geometry
+    matrix = np.array(obj.evaluated_get(depsgraph).matrix_world, dtype=np.float64)
+    points = _local_points(obj, depsgraph)
+    if points is None:
+        points = np.array([corner[:] for corner in obj.evaluated_get(depsgraph).bound_box], dtype=np.float64)
+        count = 0
+    else:
+        count = len(points)
+    if not len(points):
+        return None
+    lower, upper = _transformed_bounds(points, matrix)
+    return lower, upper, count
+
+
+def selection_bounds(objects, depsgraph):
+    # (lower, upper, point count) over all objects, None if none has geometry
+    lowers, uppers = [], []
+    total = 0
+    for obj in objects:
+        bounds = object_bounds(obj, depsgraph)
+        if bounds is None:
+            continue
+        lower, upper, count = bounds
+        lowers.append(lower)
+        uppers.append(upper)
+        total += count
+    if not lowers:
+        return None
+    return np.min(lowers, axis=0), np.max(uppers, axis=0), total
+
+
+def nice_numbers(value):
+    # 1, 2, 2.5 and 5 times a power of ten, ascending from the first one not below value
+    exponent = math.floor(math.log10(value))
+    while True:
+        base = 10.0 ** exponent
+        for step in NICE_STEPS:
+            nice = step * base
+            if nice >= value * (1 - 1e-9):
+                yield nice
+        exponent += 1
+
+
+def fit_unit(extent):
+    # Largest unit the extent (in meters) is at least one of
+    for unit in reversed(FIT_UNITS):
+        if UNIT_SCALE[unit] <= extent:
+            return unit
+    return FIT_UNITS[0]
+
+
+def _fit_axis(lower, upper, subdivisions):
+    # (origin, distance) of the smallest nice spacing whose divisions cover
+    # [lower, upper], with the origin on the coarsest step that still fits
+    minimum = max((upper - lower) / subdivisions, MIN_DISTANCE / subdivisions)
+    for spacing in nice_numbers(minimum):
+        for snap in (spacing, spacing / 2, spacing / 10):
+            origin = math.floor(lower / snap) * snap
+            if origin + spacing * subdivisions >= upper - 1e-9 * spacing:
+                return origin, spacing * subdivisions
+
+
+def fit_settings(lower, upper, settings, linear=None):
+    # (GridSettings values, clamped distance names) that fit the grid around a
+    # world-space box. settings is a mapping of the current values, the grid keeps
+    # its type and subdivisions. linear is the 3x3 rotation and scale of the grid
+    # root, the rotation of the settings is used for a grid that has none yet.
+    if linear is None:
+        linear = grid_rotation(settings)
+    corners = np.array([(x, y, z) for x in (lower[0], upper[0])
+                        for y in (lower[1], upper[1]) for z in (lower[2], upper[2])])
+    # Grid space of the rotated and scaled root, a 2D grid spans its local X and Y
+    local = corners @ np.linalg.inv(linear).T
+    local_lower, local_upper = local.min(axis=0), local.max(axis=0)
+    axes = 2 if settings['grid_type'] == '2D_GRID' else 3
+    names = ('distance_x', 'distance_y', 'distance_z')[:axes]
+    subdivisions = axis_subdivisions(settings)
+
+    # A spacing rounded up past the distance limit moves to the next larger unit
+    first = FIT_UNITS.index(fit_unit(float(np.max(local_upper[:axes] - local_lower[:axes]))))
+    for unit in FIT_UNITS[first:]:
+        scale = UNIT_SCALE[unit]
+        axis_fits = [_fit_axis(local_lower[axis] / scale, local_upper[axis] / scale, subdivisions[axis])
+                     for axis in range(axes)]
+        if all(distance <= MAX_DISTANCE for _, distance in axis_fits):
+            break
+
+    fitted = {'unit_measure': unit}
+    clamped = []
+    origin = local_lower.copy()
+    for axis, (name, (start, distance)) in enumerate(zip(names, axis_fits)):
+        origin[axis] = start * scale
+        if distance > MAX_DISTANCE:
+            # Past the largest unit: the grid no longer covers the box along this axis
+            clamped.append(name)
+            distance = MAX_DISTANCE
+        fitted[name] = distance
+    fitted['grid_origin'] = tuple((linear @ origin).tolist())
+    return fitted, clamped
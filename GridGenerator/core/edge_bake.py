@@ -0,0 +1,130 @@
+import bpy
+import numpy as np
+
+from . import registry
+
+# Bakes the edges of a grid, whatever backend built them, into one low-poly
+# mesh: open tubes with a fixed number of sides or flat ribbons facing a point.
+# The geometry is generated with NumPy and written with foreach_set.
+
+BAKED_EDGES_NAME = "EdgeObj_Baked"
+MIN_SIDES = 3
+MIN_LENGTH = 1e-9
+
+
+def _curve_points(curve):
+    return [point.co.xyz[:] for spline in curve.splines for point in spline.points]
+
+
+def _grid_matrix(grid, obj):
+    # Object to grid root space, where the baked mesh is built
+    matrix = np.array(obj.matrix_world)
+    root = registry.get_member(grid, 'root')
+    return np.linalg.inv(np.array(root.matrix_world)) @ matrix if root is not None else matrix
+
+
+def edge_segments(grid):
+    # (starts, ends) in grid space, from curve edges, instanced edges or the single edge mesh
+    starts, ends = [], []
+    points = {}
+    for obj in registry.object_map(grid, 'edges').values():
+        local = points.get(obj.data)
+        if local is None:
+            local = points[obj.data] = np.array(_curve_points(obj.data), dtype=np.float64)
+        if len(local) < 2:
+            continue
+        matrix = _grid_matrix(grid, obj)
+        co = local @ matrix[:3, :3].T + matrix[:3, 3]
+        starts.append(co[:-1])
+        ends.append(co[1:])
+
+    edge_mesh = registry.get_member(grid, 'edge_mesh')
+    if edge_mesh is not None:
+        mesh = edge_mesh.data
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get("co", co)
+        vertices = np.empty(len(mesh.edges) * 2, dtype=np.int64)
+        mesh.edges.foreach_get("vertices", vertices)
+        matrix = _grid_matrix(grid, edge_mesh)
+        co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        vertices = vertices.reshape(-1, 2)
+        starts.append(co[vertices[:, 0]])
+        ends.append(co[vertices[:, 1]])
+
+    if not starts:
+        return np.empty((0, 3)), np.empty((0, 3))
+    starts, ends = np.concatenate(starts), np.concatenate(ends)
+    keep = np.linalg.norm(ends - starts, axis=1) > MIN_LENGTH
+    return starts[keep], ends[keep]
+
+
+def bake_polygons(edge_count, mode, sides):
+    # Every tube side and every ribbon is one quad
+    return edge_count * (sides if mode == 'TUBES' else 1)
+
+
+def sides_for_budget(edge_count, resolution, budget):
+    # Each tube side is one quad; 0 means the budget cannot afford a closed tube
+    if not budget:
+        return resolution
+    sides = min(resolution, budget // max(edge_count, 1))
+    return sides if sides >= MIN_SIDES else 0
+
+
+def _frames(directions):
+    # Two unit vectors perpendicular to each direction and to each other
+    helper = np.where(np.abs(directions[:, 2:3]) < 0.9, (0.0, 0.0, 1.0), (1.0, 0.0, 0.0))
+    u = np.cross(directions, helper)
+    u /= np.linalg.norm(u, axis=1, keepdims=True)
+    return u, np.cross(directions, u)
+
+
+def tube_geometry(starts, ends, radius, sides):
+    directions = ends - starts
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    u, v = _frames(directions)
+
+    angles = np.linspace(0.0, 2.0 * np.pi, sides, endpoint=False)
+    ring = (np.cos(angles)[None, :, None] * u[:, None, :]
+            + np.sin(angles)[None, :, None] * v[:, None, :]) * radius
+    # (E, 2, sides, 3): the start ring, then the end ring of every edge
+    vertices = np.stack((starts[:, None, :] + ring, ends[:, None, :] + ring), axis=1).reshape(-1, 3)
+
+    k = np.arange(sides)
+    k_next = (k + 1) % sides
+    base = (np.arange(len(starts)) * 2 * sides)[:, None]
+    faces = np.stack((base + k, base + k_next, base + sides + k_next, base + sides + k), axis=2)
+    return vertices, faces.reshape(-1, 4)
+
+
+def ribbon_geometry(starts, ends, radius, eye):
+    # One quad per edge, its width perpendicular to the edge and to the view direction
+    directions = ends - starts
+    view = np.asarray(eye, dtype=np.float64) - (starts + ends) * 0.5
+    width = np.cross(directions, view)
+    length = np.linalg.norm(width, axis=1, keepdims=True)
+    # Edges pointing straight at the eye fall back to any perpendicular
+    fallback, _ = _frames(directions / np.linalg.norm(directions, axis=1, keepdims=True))
+    width = np.where(length > MIN_LENGTH, width / np.maximum(length, MIN_LENGTH), fallback) * radius
+
+    vertices = np.stack((starts - width, starts + width, ends + width, ends - width), axis=1).reshape(-1, 3)
+    faces = np.arange(len(vertices)).reshape(-1, 4)
+    return vertices, faces
+
+
+def build_baked_mesh(vertices, faces, grid, smooth=False, name=BAKED_EDGES_NAME):
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", vertices.astype(np.float32).ravel())
+    corners = faces.shape[1]
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.astype(np.int32).ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, corners, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    if smooth:
+        mesh.shade_smooth()
+
+    obj = bpy.data.objects.new(name, mesh)
+    registry.link_object(grid, obj)
+    return obj
@@ -0,0 +1,26 @@
+import bpy
+from mathutils import Vector
+
+EDGE_CURVE_NAME = "EdgeObj_Unit"
+
+
+def new_edge_curve(radius, name=EDGE_CURVE_NAME):
+    # Unit segment along local Z, shared by every edge of a grid
+    curve = bpy.data.curves.new(type="CURVE", name=name)
+    curve.dimensions = '3D'
+    curve.resolution_u = 2
+    spline = curve.splines.new('POLY')
+    spline.points.add(1)
+    spline.points[0].co = (0.0, 0.0, 0.0, 1.0)
+    spline.points[1].co = (0.0, 0.0, 1.0, 1.0)
+    curve.bevel_depth = radius
+    return curve
+
+
+def place_edge(obj, start, end):
+    # Scaling only along Z stretches the segment without distorting the bevel profile
+    start = Vector(start)
+    direction = Vector(end) - start
+    obj.location = start
+    obj.rotation_euler = direction.to_track_quat('Z', 'Y').to_euler()
+    obj.scale = (1.0, 1.0, direction.length)
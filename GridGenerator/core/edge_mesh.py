@@ -0,0 +1,30 @@
+import bpy
+import numpy as np
+
+from . import registry
+
+EDGE_MESH_NAME = "EdgeObj_Mesh"
+
+
+def set_skin_radius(mesh, radius):
+    # One bulk write for every skin vertex
+    layer = mesh.skin_vertices[0].data
+    layer.foreach_set("radius", [radius] * (2 * len(layer)))
+    mesh.update()
+
+
+def build_edge_mesh(coords, edges, radius, collection, name=EDGE_MESH_NAME):
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set("co", np.asarray(coords, dtype=np.float32).ravel())
+    mesh.edges.add(len(edges))
+    mesh.edges.foreach_set("vertices", np.asarray(edges, dtype=np.int32).ravel())
+    mesh.update()
+
+    obj = bpy.data.objects.new(name, mesh)
+    registry.link_object(collection, obj)
+
+    # The skin modifier gives the bare edges a tube-like thickness
+    obj.modifiers.new(name="Skin", type='SKIN')
+    set_skin_radius(mesh, radius)
+    return obj
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+
+import bpy
+
+from . import registry
+from .teardown import teardown
+
+# Built grids are written to one .blend file per settings hash and appended
+# back on a cache hit instead of being regenerated. Files are evicted oldest
+# first once the directory grows past its size limit.
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+CACHE_DIRECTORY_NAME = "grid_generator_cache"
+CACHE_SUFFIX = ".blend"
+
+# Settings that never change what generate_nodes or create_edges build
+IGNORED_KEYS = (
+    'incremental_update',
+    'text_size',
+    'edge_size',
+    'emission_color',
+    'emission_strength',
+    'unit_scale',
+    'target_unit_measure',
+    'bake_mode',
+    'bake_resolution',
+    'bake_polygon_budget',
+    'animate_grid',
+    'budget_action',
+    'budget_objects',
+    'budget_memory',
+    'budget_seconds',
+    'grid_origin',
+    'log_level',
+    'profile_capture',
+    'write_profile_report',
+    'profile_report',
+    'use_grid_cache',
+    'grid_cache_directory',
+    'grid_cache_size',
+)
+
+_DUPLICATE_SUFFIX = re.compile(r"\.\d{3,}$")
+
+
+def cache_directory(path=""):
+    path = bpy.path.abspath(path) if path else ""
+    if not path or path.startswith("//"):
+        try:
+            path = bpy.utils.user_resource('DATAFILES', path=CACHE_DIRECTORY_NAME, create=True)
+        except (OSError, ValueError):
+            path = ""
+    if not path:
+        path = os.path.join(tempfile.gettempdir(), CACHE_DIRECTORY_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_limit(grid_settings):
+    return grid_settings.grid_cache_size * 1024 * 1024
+
+
+def cache_key(settings, stage, camera_location=None):
+    key = {name: value for name, value in settings.items() if name not in IGNORED_KEYS}
+    key['stage'] = stage
+    key['cache_version'] = CACHE_VERSION
+    key['descriptor_version'] = registry.DESCRIPTOR_VERSION
+    # Distance LOD labels depend on where the camera stood
+    if settings.get('show_numbers') and settings.get('label_lod') == 'DISTANCE' and camera_location is not None:
+        key['camera'] = [round(value, 6) for value in camera_location]
+    encoded = json.dumps(key, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def cache_path(directory, key):
+    return os.path.join(directory, key + CACHE_SUFFIX)
+
+
+def _merge_duplicates(new_ids, existing_ids):
+    # Appending brings its own copy of shared node groups, the local ones are kept
+    for id_data in new_ids:
+        match = _DUPLICATE_SUFFIX.search(id_data.name)
+        if match is None:
+            continue
+        original = existing_ids.get(id_data.name[:match.start()])
+        if original is not None and original not in new_ids:
+            id_data.user_remap(original)
+            existing_ids.remove(id_data)
+
+
+def load_grid(path, scene, camera=None):
+    if not os.path.isfile(path):
+        return None
+    objects_before = set(bpy.data.objects)
+    groups_before = set(bpy.data.node_groups)
+    try:
+        with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+            data_to.collections = list(data_from.collections)
+    except (OSError, RuntimeError) as error:
+        logger.warning("Could not load cached grid %s: %s", path, error)
+        return None
+
+    grid = next((coll for coll in data_to.collections if registry.is_grid(coll)), None)
+    if grid is None:
+        logger.warning("Cached file %s holds no grid", path)
+        return None
+    scene.collection.children.link(grid)
+
+    # The camera the labels tracked comes along with them and is swapped for this scene's
+    own = set(grid.all_objects)
+    glyphs = registry.get_member(grid, 'glyph_collection')
+    if glyphs is not None:
+        own.update(glyphs.all_objects)
+    strays = [obj for obj in bpy.data.objects if obj not in objects_before and obj not in own]
+    for obj in strays:
+        if camera is not None and obj.type == 'CAMERA':
+            obj.user_remap(camera)
+    teardown(strays)
+    _merge_duplicates([group for group in bpy.data.node_groups if group not in groups_before],
+                      bpy.data.node_groups)
+
+    os.utime(path)
+    return grid
+
+
+def store_grid(grid, path, max_bytes=0):
+    partial = path + ".partial"
+    try:
+        bpy.data.libraries.write(partial, {grid}, path_remap='ABSOLUTE', fake_user=False, compress=True)
+        os.replace(partial, path)
+    except (OSError, RuntimeError) as error:
+        logger.warning("Could not cache grid in %s: %s", path, error)
+        return False
+    if max_bytes:
+        evict(os.path.dirname(path), max_bytes, keep=path)
+    return True
+
+
+def cache_entries(directory):
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith(CACHE_SUFFIX):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return sorted(entries)
+
+
+def evict(directory, max_bytes, keep=None):
+    # Least recently used files go first, a hit refreshes the modification time
+    entries = cache_entries(directory)
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError as error:
+            logger.warning("Could not evict %s: %s", path, error)
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear_cache(directory):
+    return evict(directory, 0)
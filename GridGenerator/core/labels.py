@@ -0,0 +1,207 @@
+import bpy
+import numpy as np
+
+from . import registry
+from .lattice import grid_rotation
+from .teardown import teardown
+
+# IDProperty keys are limited to 63 bytes
+MAX_CACHE_KEY = 63
+
+DIRECTION_VECTORS = {
+    'X': (1.0, 0.0, 0.0),
+    '-X': (-1.0, 0.0, 0.0),
+    'Y': (0.0, 1.0, 0.0),
+    '-Y': (0.0, -1.0, 0.0),
+    'Z': (0.0, 0.0, 1.0),
+    '-Z': (0.0, 0.0, -1.0),
+}
+
+
+def axis_offsets(grid_settings):
+    # Row k holds the text offset applied to labels of axis k (X, Y, Z)
+    return np.array([
+        np.array(DIRECTION_VECTORS[getattr(grid_settings, f"text_direction_{axis}")])
+        * getattr(grid_settings, f"text_offset_{axis}")
+        for axis in ('x', 'y', 'z')
+    ])
+
+
+def label_locations(coords, axes, grid_settings):
+    # Text offsets are world directions, as before grids had a root. The root
+    # rotates 2D grids, so the offsets are turned back into grid space.
+    rotation = grid_rotation({key: getattr(grid_settings, key) for key in registry.ROOT_ORIENTATION_KEYS})
+    return coords + (axis_offsets(grid_settings) @ rotation)[axes]
+
+
+def axis_values(lattice, grid_settings):
+    # Plain distance of every node along each axis, in the unit of measure
+    distances = np.array((grid_settings.distance_x, grid_settings.distance_y, grid_settings.distance_z))
+    return lattice.indices * (distances / np.maximum(lattice.subdivisions, 1))
+
+
+def tick_matrix(lattice, grid_settings):
+    # (N, 3) bool, True where a node is a tick of that axis. Ticks run along one
+    # boundary edge per axis, on the near or far side of each other axis, so a
+    # grid gets one label per axis value instead of one per node.
+    indices = lattice.indices
+    n = np.array(lattice.subdivisions)
+    interval = max(1, grid_settings.tick_interval)
+    enabled = np.array(grid_settings.tick_axes, dtype=bool)
+    far = np.array(grid_settings.tick_far_side, dtype=bool)
+    # The plane has no Z values to mark, nor a far side along Z
+    axes = 2 if lattice.grid_type == '2D_GRID' else 3
+    exterior = lattice.grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2')
+    ticks = np.zeros(indices.shape, dtype=bool)
+    for axis in range(axes):
+        if n[axis] == 0 or not enabled[axis]:
+            continue
+        if exterior:
+            # These grids already are one line per axis
+            on_edge = lattice.axes == axis
+        else:
+            others = [other for other in range(axes) if other != axis]
+            on_edge = (indices[:, others] == np.where(far, n, 0)[others]).all(axis=1)
+        ticks[:, axis] = on_edge & ((indices[:, axis] % interval == 0) | (indices[:, axis] == n[axis]))
+    return ticks
+
+
+def label_axes(lattice, grid_settings):
+    # Axis whose text offset each label takes: ticks follow the axis they mark
+    if getattr(grid_settings, 'label_lod', 'ALL') != 'AXIS_TICKS':
+        return lattice.axes
+    ticks = tick_matrix(lattice, grid_settings)
+    return np.where(ticks.any(axis=1), np.argmax(ticks, axis=1), lattice.axes).astype(np.int8)
+
+
+def label_mask(lattice, grid_settings, camera_location=None):
+    # Level of detail: rows left out here never get a label object
+    lod = getattr(grid_settings, 'label_lod', 'ALL')
+    indices = lattice.indices
+    n = np.array(lattice.subdivisions)
+    if lod == 'EVERY_NTH':
+        stride = max(1, grid_settings.label_stride)
+        return ((indices % stride == 0) | (indices == n)).all(axis=1)
+    if lod == 'BOUNDARY':
+        # Nodes on the edges of the bounding box lie on at least two of its faces
+        return ((indices == 0) | (indices == n)).sum(axis=1) >= 2
+    if lod == 'AXIS_TICKS':
+        return tick_matrix(lattice, grid_settings).any(axis=1)
+    if lod == 'DISTANCE' and camera_location is not None:
+        distance = np.linalg.norm(lattice.coords - np.asarray(camera_location), axis=1)
+        return distance <= grid_settings.label_distance
+    return np.ones(len(indices), dtype=bool)
+
+
+def label_texts(lattice, grid_settings, mask):
+    # (row, text) of every labelled row in mask
+    grid_type = grid_settings.grid_type
+    if getattr(grid_settings, 'label_lod', 'ALL') == 'AXIS_TICKS':
+        # A node where ticks of several axes meet shows each of their values
+        ticks = tick_matrix(lattice, grid_settings) & mask[:, None]
+        values = axis_values(lattice, grid_settings)
+        for row in np.flatnonzero(ticks.any(axis=1)).tolist():
+            yield row, ", ".join(f"{values[row, axis]:.2f}" for axis in np.flatnonzero(ticks[row]).tolist())
+        return
+
+    if grid_type in ['CUBIC_INTERNAL_EDGES', 'CUBIC_EXTERIOR']:
+        rows = np.flatnonzero(mask)
+        for row, (x, y, z) in zip(rows.tolist(), lattice.coords[rows].tolist()):
+            yield row, f"{x:.2f},{y:.2f},{z:.2f}"
+        return
+
+    # Exterior and 2D labels show the plain distance along a single axis
+    values = axis_values(lattice, grid_settings)
+
+    if grid_type == '2D_GRID':
+        show_x = grid_settings.length_axis_2d in ['X', 'BOTH']
+        show_y = grid_settings.length_axis_2d in ['Y', 'BOTH']
+        x, y = lattice.indices[:, 0], lattice.indices[:, 1]
+        mask = mask & (((x == 0) & show_y) | ((y == 0) & show_x))
+    rows = np.flatnonzero(mask)
+
+    for row in rows.tolist():
+        x, y, _ = lattice.indices[row].tolist()
+        if grid_type == '2D_GRID' and x == 0 and y == 0:
+            yield row, "0.00, 0.00" if grid_settings.length_axis_2d == 'BOTH' else "0.00"
+        else:
+            yield row, f"{values[row, lattice.axes[row]]:.2f}"
+
+
+class LabelDataCache:
+    # Loads the custom font once and shares one FONT curve among all labels
+    # with the same text. The curves are recorded in the grid descriptor so
+    # they can be reused by later builds and evicted when the grid is rebuilt.
+
+    def __init__(self, grid, font_path=None):
+        self.grid = grid
+        self.curves = registry.object_map(grid, 'label_curves')
+        self.font = None
+        self.font_failed = False
+        if font_path:
+            try:
+                self.font = bpy.data.fonts.load(font_path, check_existing=True)
+            except RuntimeError:
+                self.font_failed = True
+
+    def curve(self, text):
+        curve = self.curves.get(text)
+        if curve is None:
+            curve = bpy.data.curves.new(f"GridLabel_{text}", type='FONT')
+            curve.body = text
+            curve.align_x = 'CENTER'
+            curve.align_y = 'CENTER'
+            if self.font is not None:
+                curve.font = self.font
+            if len(text.encode()) <= MAX_CACHE_KEY:
+                self.curves[text] = curve
+        return curve
+
+    def store(self):
+        registry.register_map(self.grid, 'label_curves', self.curves)
+        if self.font is not None:
+            registry.set_member(self.grid, 'font', self.font)
+
+
+def evict_label_cache(grid):
+    # Drops the shared curves, and the font, that no label uses anymore
+    curves = registry.object_map(grid, 'label_curves')
+    font = registry.get_member(grid, 'font')
+    registry.clear_roles(grid, ['label_curves', 'font'])
+
+    kept = {text: curve for text, curve in curves.items() if curve.users > 0}
+    freed = teardown((), list(curves.values()) + [font])
+    registry.set_map(grid, 'label_curves', kept)
+
+    try:
+        if font is not None and font.users > 0:
+            registry.set_member(grid, 'font', font)
+    except ReferenceError:
+        # Purged right after the last curve that used it
+        pass
+    return freed
+
+
+def build_labels(collection, names, texts, locations, size, cache,
+                 camera=None, rotation=None):
+    # Datablocks are created directly, without bpy.ops.object.text_add, and are
+    # only linked once the whole batch exists so the view layer syncs once.
+    objects = []
+    scale = (size,) * 3
+    for name, text, location in zip(names, texts, locations):
+        obj = bpy.data.objects.new(name, cache.curve(text))
+        obj.location = location
+        obj.scale = scale
+        if rotation is not None:
+            obj.rotation_euler = rotation
+        if camera is not None:
+            constraint = obj.constraints.new(type='TRACK_TO')
+            constraint.target = camera
+            constraint.track_axis = 'TRACK_Z'
+            constraint.up_axis = 'UP_Y'
+        objects.append(obj)
+
+    for obj in objects:
+        registry.link_object(collection, obj)
+    cache.store()
+    return objects
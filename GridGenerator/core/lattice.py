@@ -0,0 +1,200 @@
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+# Layout engine for every grid type. It only depends on NumPy so it can be
+# exercised and timed outside Blender.
+
+UNIT_SCALE = {
+    'nm': 1e-9,
+    'µm': 1e-6,
+    'mm': 0.001,
+    'cm': 0.01,
+    'dm': 0.1,
+    'm': 1,
+    'dam': 10,
+    'hm': 100,
+    'km': 1000
+}
+
+# Rotation (axis, degrees) that maps the XY plane onto each 2D orientation
+ORIENTATIONS = {
+    'XY': None,
+    'XZ': ('X', 90),
+    'YZ': ('Y', 90),
+    '-XY': ('X', 180),
+    '-XZ': ('X', -90),
+    '-YZ': ('Y', -90),
+}
+
+AXIS_X, AXIS_Y, AXIS_Z = 0, 1, 2
+AXIS_NAMES = ('X', 'Y', 'Z')
+
+# GridSettings values that decide the number of divisions along each axis
+SUBDIVISION_KEYS = ('use_axis_subdivisions', 'subdivisions', 'subdivisions_x', 'subdivisions_y', 'subdivisions_z')
+
+
+class Lattice(NamedTuple):
+    grid_type: str
+    subdivisions: tuple  # (nx, ny, nz) divisions along each axis
+    coords: np.ndarray    # (N, 3) float64 node positions
+    indices: np.ndarray   # (N, 3) int64 lattice indices (ix, iy, iz)
+    axes: np.ndarray      # (N,) int8 axis used to offset each node label
+    rotation: np.ndarray  # (3, 3) orientation applied to coords
+
+
+def unit_scale_factor(unit):
+    return UNIT_SCALE.get(unit, 1)
+
+
+def rotation_matrix(orientation):
+    spec = ORIENTATIONS.get(orientation)
+    if spec is None:
+        return np.identity(3)
+    axis, degrees = spec
+    c = math.cos(math.radians(degrees))
+    s = math.sin(math.radians(degrees))
+    if axis == 'X':
+        return np.array(((1.0, 0.0, 0.0), (0.0, c, -s), (0.0, s, c)))
+    return np.array(((c, 0.0, s), (0.0, 1.0, 0.0), (-s, 0.0, c)))
+
+
+def axis_subdivisions(settings):
+    # settings is a mapping of GridSettings values, see SUBDIVISION_KEYS
+    if settings.get('use_axis_subdivisions'):
+        return (int(settings['subdivisions_x']), int(settings['subdivisions_y']),
+                int(settings['subdivisions_z']))
+    n = int(settings['subdivisions'])
+    return (n, n, n)
+
+
+def _subdivisions(subdivisions):
+    if isinstance(subdivisions, (int, np.integer)):
+        return (int(subdivisions),) * 3
+    return tuple(int(n) for n in subdivisions)
+
+
+def exterior_corners(grid_type, subdivisions):
+    nx, ny, nz = _subdivisions(subdivisions)
+    last = (nx, 0, nz) if grid_type == 'EXTERIOR_EDGES_2' else (0, 0, nz)
+    return np.array(((0, 0, 0), (nx, 0, 0), (0, ny, 0), last), dtype=np.int64)
+
+
+def exterior_axes(grid_type):
+    # Corner pairs joined by the three axis lines
+    return ((0, 1), (0, 2), (0, 3) if grid_type == 'EXTERIOR_EDGES_1' else (1, 3))
+
+
+def exterior_lines(grid_type, subdivisions):
+    # (start corner, end corner, divisions) of each axis line, in X, Y, Z order
+    return [(a, b, n) for (a, b), n in zip(exterior_axes(grid_type), _subdivisions(subdivisions))]
+
+
+def _block(xs, ys, zs):
+    # Same ordering as nested "for z / for y / for x" loops
+    z, y, x = np.meshgrid(zs, ys, xs, indexing='ij')
+    return np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1).astype(np.int64)
+
+
+def _cubic_internal(nx, ny, nz):
+    idx = _block(np.arange(nx + 1), np.arange(ny + 1), np.arange(nz + 1))
+    x, y, z = idx.T
+    axes = np.select([x == nx, y == ny, z == nz], [AXIS_X, AXIS_Y, AXIS_Z], AXIS_X)
+    return idx, axes
+
+
+def _cubic_exterior(nx, ny, nz):
+    full_x, full_y = np.arange(nx + 1), np.arange(ny + 1)
+    inner_y, inner_z = np.arange(1, ny), np.arange(1, nz)
+
+    caps = _block(full_x, full_y, np.array((0, nz)))
+    x, y, _ = caps.T
+    caps_axes = np.select([x == nx, y == ny], [AXIS_X, AXIS_Y], AXIS_Z)
+
+    sides = np.concatenate([_block(full_x, [y], inner_z) for y in (0, ny)])
+    sides_axes = np.where(sides[:, 0] == nx, AXIS_X, AXIS_Y)
+
+    ends_x = np.concatenate([_block([x], inner_y, inner_z) for x in (0, nx)])
+    ends_x_axes = np.full(len(ends_x), AXIS_X)
+
+    idx = np.concatenate((caps, sides, ends_x))
+    axes = np.concatenate((caps_axes, sides_axes, ends_x_axes))
+    return idx, axes
+
+
+def _exterior_edges(grid_type, nx, ny, nz):
+    corners = exterior_corners(grid_type, (nx, ny, nz))
+    x, y, z = corners.T
+    corner_axes = np.select([(x == nx) & (z == 0), y == ny, z == nz],
+                            [AXIS_X, AXIS_Y, AXIS_Z], AXIS_X)
+
+    subs, sub_axes = [], []
+    for a, b, n in exterior_lines(grid_type, (nx, ny, nz)):
+        direction = (corners[b] - corners[a]) // n
+        steps = np.arange(1, n)[:, None]
+        subs.append(corners[a] + steps * direction)
+        sub_axes.append(np.full(n - 1, int(np.argmax(direction))))
+
+    idx = np.concatenate([corners] + subs)
+    axes = np.concatenate([corner_axes] + sub_axes)
+    return idx, axes
+
+
+def _grid_2d(nx, ny):
+    idx = _block(np.arange(nx + 1), np.arange(ny + 1), [0])
+    axes = np.where(idx[:, 0] == 0, AXIS_Y, AXIS_X)
+    axes[(idx[:, 0] == 0) & (idx[:, 1] == 0)] = AXIS_X
+    return idx, axes
+
+
+def build_lattice(grid_type, subdivisions, distances, orientation='XY'):
+    # subdivisions is a single count for every axis or an (nx, ny, nz) tuple
+    n = _subdivisions(subdivisions)
+    if grid_type == 'CUBIC_INTERNAL_EDGES':
+        idx, axes = _cubic_internal(*n)
+    elif grid_type == 'CUBIC_EXTERIOR':
+        idx, axes = _cubic_exterior(*n)
+    elif grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2'):
+        idx, axes = _exterior_edges(grid_type, *n)
+    elif grid_type == '2D_GRID':
+        idx, axes = _grid_2d(n[0], n[1])
+    else:
+        raise ValueError(f"Unknown grid type: {grid_type}")
+
+    coords = idx * (np.asarray(distances, dtype=np.float64) / np.array(n))
+    rotation = rotation_matrix(orientation if grid_type == '2D_GRID' else 'XY')
+    if grid_type == '2D_GRID':
+        coords = coords @ rotation.T
+
+    return Lattice(grid_type, n, coords, idx, axes.astype(np.int8), rotation)
+
+
+def grid_rotation(settings):
+    # Orientation carried by the grid root, only 2D grids have one
+    if settings['grid_type'] != '2D_GRID':
+        return np.identity(3)
+    return rotation_matrix(settings['grid_2d_orientation'])
+
+
+def lattice_for_settings(settings):
+    # settings is a plain mapping of GridSettings values, e.g. a registry snapshot.
+    # Coordinates are in grid space: the grid root applies the 2D orientation.
+    scale = unit_scale_factor(settings['unit_measure'])
+    distances = (settings['distance_x'] * scale,
+                 settings['distance_y'] * scale,
+                 settings['distance_z'] * scale)
+    return build_lattice(settings['grid_type'], axis_subdivisions(settings), distances)
+
+
+def node_names(lattice):
+    if lattice.grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2'):
+        names = [f"GridNode_{i}" for i in range(4)]
+        for a, b, n in exterior_lines(lattice.grid_type, lattice.subdivisions):
+            names.extend(f"GridNode_sub_{a}_{b}_{i}" for i in range(1, n))
+        return names
+    return [f"GridNode_{x}_{y}_{z}" for x, y, z in lattice.indices.tolist()]
+
+
+def index_lookup(lattice):
+    return {key: row for row, key in enumerate(map(tuple, lattice.indices.tolist()))}
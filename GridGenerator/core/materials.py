@@ -0,0 +1,53 @@
+import bpy
+
+from . import registry
+
+EMISSIVE_MATERIAL_NAME = "Emissive Material"
+
+
+def _new_emissive_material(name):
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+
+    # Clear existing nodes
+    nodes.clear()
+
+    node_emission = nodes.new(type='ShaderNodeEmission')
+    node_output = nodes.new(type='ShaderNodeOutputMaterial')
+    links.new(node_emission.outputs['Emission'], node_output.inputs['Surface'])
+    return mat
+
+
+def _emission_node(mat):
+    if mat is None or mat.node_tree is None:
+        return None
+    return next((node for node in mat.node_tree.nodes if node.type == 'EMISSION'), None)
+
+
+def grid_material(grid, color, strength):
+    # One material per grid, kept in the descriptor and only re-tinted on later calls
+    mat = registry.get_member(grid, 'material')
+    node_emission = _emission_node(mat)
+    if node_emission is None:
+        mat = _new_emissive_material(EMISSIVE_MATERIAL_NAME)
+        registry.set_member(grid, 'material', mat)
+        node_emission = _emission_node(mat)
+    node_emission.inputs['Color'].default_value = color
+    node_emission.inputs['Strength'].default_value = strength
+    return mat
+
+
+def grid_surfaces(grid):
+    # Labels share their curves, so each datablock is only visited once
+    objects = registry.members(grid, ['labels', 'glyphs', 'edges', 'edge_mesh', 'baked_edges', 'procedural'])
+    return list(dict.fromkeys(obj.data for obj in objects if obj.data is not None))
+
+
+def assign_material(data_blocks, mat):
+    for data in data_blocks:
+        if not data.materials:
+            data.materials.append(mat)
+        elif data.materials[0] != mat:
+            data.materials[0] = mat
@@ -0,0 +1,79 @@
+import bpy
+import numpy as np
+
+from . import registry
+
+NODE_CLOUD_NAME = "GridNode_Cloud"
+INDEX_ATTRIBUTES = ("ix", "iy", "iz")
+MARKER_GROUPS = {
+    'SPHERE': "GridGenerator Sphere Marker",
+    'POINT': "GridGenerator Point Marker",
+}
+
+
+def _new_marker_group(marker):
+    group = bpy.data.node_groups.new(MARKER_GROUPS[marker], 'GeometryNodeTree')
+    group.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    group.interface.new_socket("Radius", in_out='INPUT', socket_type='NodeSocketFloat')
+    group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = group.nodes
+    links = group.links
+    group_in = nodes.new('NodeGroupInput')
+    group_out = nodes.new('NodeGroupOutput')
+
+    if marker == 'SPHERE':
+        sphere = nodes.new('GeometryNodeMeshIcoSphere')
+        sphere.inputs['Subdivisions'].default_value = 1
+        links.new(group_in.outputs['Radius'], sphere.inputs['Radius'])
+        instancer = nodes.new('GeometryNodeInstanceOnPoints')
+        links.new(group_in.outputs['Geometry'], instancer.inputs['Points'])
+        links.new(sphere.outputs['Mesh'], instancer.inputs['Instance'])
+        # Keep the raw vertices next to the markers so their attributes stay readable
+        join = nodes.new('GeometryNodeJoinGeometry')
+        links.new(group_in.outputs['Geometry'], join.inputs['Geometry'])
+        links.new(instancer.outputs['Instances'], join.inputs['Geometry'])
+        links.new(join.outputs['Geometry'], group_out.inputs['Geometry'])
+    else:
+        points = nodes.new('GeometryNodeMeshToPoints')
+        links.new(group_in.outputs['Geometry'], points.inputs['Mesh'])
+        links.new(group_in.outputs['Radius'], points.inputs['Radius'])
+        links.new(points.outputs['Points'], group_out.inputs['Geometry'])
+
+    return group
+
+
+def get_marker_group(marker):
+    group = bpy.data.node_groups.get(MARKER_GROUPS[marker])
+    if group is None:
+        group = _new_marker_group(marker)
+    return group
+
+
+def set_marker(obj, marker, radius):
+    for modifier in [m for m in obj.modifiers if m.type == 'NODES']:
+        obj.modifiers.remove(modifier)
+    if marker == 'NONE':
+        return
+
+    group = get_marker_group(marker)
+    modifier = obj.modifiers.new(name="Node Marker", type='NODES')
+    modifier.node_group = group
+    modifier[group.interface.items_tree['Radius'].identifier] = radius
+
+
+def build_node_cloud(lattice, collection, marker='NONE', radius=0.05, name=NODE_CLOUD_NAME):
+    # Vertex order matches the lattice rows, so row indices stay valid for edges and labels
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(lattice.coords))
+    mesh.vertices.foreach_set("co", lattice.coords.astype(np.float32).ravel())
+
+    for axis, attribute_name in enumerate(INDEX_ATTRIBUTES):
+        attribute = mesh.attributes.new(attribute_name, 'INT', 'POINT')
+        attribute.data.foreach_set("value", lattice.indices[:, axis].astype(np.int32))
+    mesh.update()
+
+    obj = bpy.data.objects.new(name, mesh)
+    registry.link_object(collection, obj)
+    set_marker(obj, marker, radius)
+    return obj
@@ -0,0 +1,258 @@
+import json
+from types import SimpleNamespace
+from typing import NamedTuple
+
+from .labels import label_mask, label_texts
+from .lattice import axis_subdivisions, lattice_for_settings
+from .procedural import procedural_label_count, procedural_labels_shown
+
+# Preflight cost of a build, computed from the grid topology in closed form
+# without creating anything. Labels are counted exactly on lattices small
+# enough to lay out and bounded from above on larger ones. The per-item costs
+# are rough averages of Blender 4.2 builds, good for the order of magnitude
+# that decides whether a build is reasonable, not for exact figures.
+
+# Lattices up to this many nodes are laid out to count their labels exactly
+EXACT_LABEL_NODES = 50000
+
+OBJECT_BYTES = 4096       # object, its evaluated copy and its share of the undo step
+DATA_BYTES = 2048         # curve or mesh datablock without its geometry
+LABEL_BYTES = 8192        # evaluated glyph geometry of one text
+CONSTRAINT_BYTES = 512
+VERTEX_BYTES = 64         # position, attributes and evaluated copy
+NODE_BYTES = 320          # lattice arrays, key and name strings per node during the build
+GLYPH_VERTICES = 120      # vertices of one label realized by Geometry Nodes
+
+OBJECT_SECONDS = 60e-6
+DATA_SECONDS = 80e-6
+CONSTRAINT_SECONDS = 40e-6
+VERTEX_SECONDS = 5e-8
+PROCEDURAL_VERTEX_SECONDS = 2e-7
+
+PARTS = ('nodes', 'labels', 'edges')
+NODE_PARTS = ('nodes', 'labels')
+EDGE_PARTS = ('edges',)
+
+# Settings changed, in order, to bring a build within budget, and the part each one affects
+DEGRADE_STEPS = (
+    ('nodes', 'node_mode', 'POINT_CLOUD'),
+    ('labels', 'label_facing', 'BILLBOARD'),
+    ('edges', 'edge_mode', 'MESH'),
+    ('labels', 'label_lod', 'AXIS_TICKS'),
+    ('labels', 'show_numbers', False),
+)
+
+# Budget settings, which never change what is built
+BUDGET_KEYS = ('budget_action', 'budget_objects', 'budget_memory', 'budget_seconds')
+
+
+class Cost(NamedTuple):
+    objects: int = 0
+    datablocks: int = 0
+    vertices: int = 0
+    memory: int = 0      # bytes
+    seconds: float = 0.0
+
+
+class Estimate(NamedTuple):
+    nodes: int
+    edges: int
+    labels: int
+    labels_exact: bool
+    parts: dict  # {part: Cost}
+
+    def total(self, parts=PARTS):
+        costs = [self.parts[part] for part in parts]
+        return Cost(*(sum(values) for values in zip(*costs))) if costs else Cost()
+
+
+def _cost(objects=0, data=0, vertices=0, constraints=0, labels=0, extra_bytes=0, seconds=0.0):
+    memory = (objects * OBJECT_BYTES + data * DATA_BYTES + vertices * VERTEX_BYTES
+              + constraints * CONSTRAINT_BYTES + labels * LABEL_BYTES + extra_bytes)
+    seconds += (objects * OBJECT_SECONDS + data * DATA_SECONDS + vertices * VERTEX_SECONDS
+                + constraints * CONSTRAINT_SECONDS)
+    return Cost(objects, objects + data, vertices, memory, seconds)
+
+
+def node_count(grid_type, subdivisions):
+    nx, ny, nz = subdivisions
+    if grid_type == 'CUBIC_INTERNAL_EDGES':
+        return (nx + 1) * (ny + 1) * (nz + 1)
+    if grid_type == 'CUBIC_EXTERIOR':
+        return (nx + 1) * (ny + 1) * (nz + 1) - (nx - 1) * (ny - 1) * (nz - 1)
+    if grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2'):
+        return nx + ny + nz + 1
+    return (nx + 1) * (ny + 1)
+
+
+def edge_count(grid_type, subdivisions):
+    # Same count as core.topology.edge_topology
+    n = subdivisions
+    if grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2'):
+        return sum(n)
+    if grid_type == '2D_GRID':
+        return 2 * (n[0] + n[1])
+    total = 0
+    for axis in range(3):
+        a, b = (n[other] for other in range(3) if other != axis)
+        if grid_type == 'CUBIC_INTERNAL_EDGES':
+            total += n[axis] * (a + 1) * (b + 1)
+        else:
+            # Lines along the axis that lie on the shell of the box
+            total += n[axis] * ((a + 1) * (b + 1) - (a - 1) * (b - 1))
+    return total
+
+
+def _kept(n, stride):
+    # Indices 0..n that are multiples of stride, plus n
+    return n // stride + 1 + (1 if n % stride else 0)
+
+
+def _label_bound(settings, subdivisions, nodes):
+    # Upper bound of the label count of lattices too large to lay out
+    n = subdivisions
+    lod = settings.get('label_lod', 'ALL')
+    if lod == 'AXIS_TICKS':
+        interval = max(1, settings['tick_interval'])
+        axes = 2 if settings['grid_type'] == '2D_GRID' else 3
+        return sum(_kept(n[axis], interval) for axis in range(axes) if settings['tick_axes'][axis])
+    if settings['grid_type'] == '2D_GRID':
+        shown = settings.get('length_axis_2d', 'BOTH')
+        return {'X': n[0] + 1, 'Y': n[1] + 1}.get(shown, n[0] + n[1] + 1)
+    if lod == 'EVERY_NTH':
+        stride = max(1, settings['label_stride'])
+        kept = [_kept(count, stride) for count in n]
+        total = kept[0] * kept[1] * kept[2]
+        if settings['grid_type'] == 'CUBIC_EXTERIOR':
+            total -= max(kept[0] - 2, 0) * max(kept[1] - 2, 0) * max(kept[2] - 2, 0)
+        return min(total, nodes)
+    if lod == 'BOUNDARY':
+        return min(8 + 4 * sum(count - 1 for count in n), nodes)
+    return nodes
+
+
+def label_count(settings, subdivisions, nodes, camera_location=None):
+    # (count, exact)
+    if not settings.get('show_numbers'):
+        return 0, True
+    exact = settings.get('label_lod') != 'DISTANCE' or camera_location is not None
+    if nodes > EXACT_LABEL_NODES:
+        return _label_bound(settings, subdivisions, nodes), False
+    lattice = lattice_for_settings(settings)
+    namespace = SimpleNamespace(**settings)
+    mask = label_mask(lattice, namespace, camera_location)
+    return sum(1 for _ in label_texts(lattice, namespace, mask)), exact
+
+
+def estimate(settings, camera_location=None):
+    # settings is a plain mapping of GridSettings values, e.g. a registry snapshot
+    grid_type = settings['grid_type']
+    subdivisions = axis_subdivisions(settings)
+    nodes = node_count(grid_type, subdivisions)
+    edges = edge_count(grid_type, subdivisions)
+
+    if settings.get('generation_mode') == 'GEOMETRY_NODES':
+        # One object, the geometry is realized on every evaluation. The group
+        # ignores the label detail and drops labels past its limit.
+        namespace = SimpleNamespace(**settings)
+        labels = procedural_label_count(namespace) if procedural_labels_shown(namespace) else 0
+        exact = True
+        parts = {
+            'nodes': _cost(objects=1, data=2, vertices=nodes, seconds=nodes * PROCEDURAL_VERTEX_SECONDS),
+            'labels': _cost(vertices=labels * GLYPH_VERTICES,
+                            seconds=labels * GLYPH_VERTICES * PROCEDURAL_VERTEX_SECONDS),
+            'edges': _cost(vertices=2 * edges, seconds=2 * edges * PROCEDURAL_VERTEX_SECONDS),
+        }
+        return Estimate(nodes, edges, labels, exact, parts)
+
+    labels, exact = label_count(settings, subdivisions, nodes, camera_location)
+
+    if settings.get('node_mode') == 'POINT_CLOUD':
+        node_cost = _cost(objects=1, data=1, vertices=nodes, extra_bytes=nodes * NODE_BYTES)
+    else:
+        node_cost = _cost(objects=nodes, extra_bytes=nodes * NODE_BYTES)
+
+    if not labels:
+        label_cost = Cost()
+    elif settings.get('label_facing') == 'BILLBOARD':
+        # One glyph object and curve per text, instanced on the points of one mesh
+        label_cost = _cost(objects=labels + 1, data=labels + 2, vertices=labels, labels=labels)
+    else:
+        label_cost = _cost(objects=labels, data=labels, constraints=labels, labels=labels)
+
+    edge_mode = settings.get('edge_mode')
+    if edge_mode == 'MESH':
+        edge_cost = _cost(objects=1, data=1, vertices=min(nodes, 2 * edges))
+    elif edge_mode == 'INSTANCED':
+        edge_cost = _cost(objects=edges, data=1)
+    else:
+        edge_cost = _cost(objects=edges, data=edges, vertices=2 * edges)
+
+    return Estimate(nodes, edges, labels, exact, {'nodes': node_cost, 'labels': label_cost, 'edges': edge_cost})
+
+
+def over_budget(cost, grid_settings):
+    # Descriptions of every limit the cost exceeds
+    exceeded = []
+    if grid_settings.budget_objects and cost.objects > grid_settings.budget_objects:
+        exceeded.append(f"{cost.objects} objects > {grid_settings.budget_objects}")
+    if grid_settings.budget_memory and cost.memory > grid_settings.budget_memory * 1024 * 1024:
+        exceeded.append(f"{cost.memory / 1024 / 1024:.0f} MB > {grid_settings.budget_memory} MB")
+    if grid_settings.budget_seconds and cost.seconds > grid_settings.budget_seconds:
+        exceeded.append(f"{cost.seconds:.0f} s > {grid_settings.budget_seconds:.0f} s")
+    return exceeded
+
+
+_last_estimate = (None, None)
+
+
+def cached_estimate(settings):
+    # The panel redraws often, the estimate is only recomputed when the settings change
+    global _last_estimate
+    key = json.dumps({name: value for name, value in settings.items() if name not in BUDGET_KEYS},
+                     sort_keys=True, default=str)
+    if _last_estimate[0] != key:
+        _last_estimate = (key, estimate(settings))
+    return _last_estimate[1]
+
+
+def enforce_budget(operator, grid_settings, settings, parts, camera_location=None):
+    # True if the operator may build. settings is the mapping estimated, degrading
+    # writes its changes to both it and the scene settings.
+    action = grid_settings.budget_action
+    if action == 'OFF':
+        return True
+    cost = estimate(settings, camera_location).total(parts)
+    exceeded = over_budget(cost, grid_settings)
+    if not exceeded:
+        return True
+
+    if action == 'WARN':
+        operator.report({'WARNING'}, f"Over budget: {', '.join(exceeded)}")
+        return True
+    if action == 'REFUSE':
+        operator.report({'ERROR'}, f"Over budget: {', '.join(exceeded)}. Lower the subdivisions or raise the budget.")
+        return False
+
+    changes = []
+    for part, key, value in DEGRADE_STEPS:
+        if part not in parts or settings.get(key) == value:
+            continue
+        previous = settings[key]
+        settings[key] = value
+        degraded = estimate(settings, camera_location).total(parts)
+        if degraded.memory >= cost.memory and degraded.objects >= cost.objects and degraded.seconds >= cost.seconds:
+            # No cheaper for this build, the setting is left alone
+            settings[key] = previous
+            continue
+        setattr(grid_settings, key, value)
+        changes.append(f"{key.replace('_', ' ')} to {value}")
+        cost = degraded
+        exceeded = over_budget(cost, grid_settings)
+        if not exceeded:
+            break
+    if exceeded:
+        operator.report({'ERROR'}, f"Over budget even when degraded: {', '.join(exceeded)}")
+        return False
+    operator.report({'WARNING'}, f"Over budget, changed {', '.join(changes)}")
+    return True
@@ -0,0 +1,390 @@
+import bpy
+
+from . import registry
+from .labels import axis_offsets
+from .lattice import SUBDIVISION_KEYS, axis_subdivisions, unit_scale_factor
+
+# Procedural grids are a single object whose Geometry Nodes modifier builds the
+# lattice edges and the labels natively. The modifier inputs are rewritten from
+# GridSettings whenever a bound property changes, so tweaks re-evaluate in
+# native code instead of going through a Python rebuild.
+
+PROCEDURAL_GROUP_NAME = "GridGenerator Procedural Grid"
+PROCEDURAL_OBJECT_NAME = "GridProcedural"
+MODIFIER_NAME = "Procedural Grid"
+
+# Labels are laid out one per repeat-zone iteration, past this many the
+# procedural grid leaves them out and the panel says so
+MAX_PROCEDURAL_LABELS = 1000
+
+GRID_TYPE_INDEX = {
+    'CUBIC_INTERNAL_EDGES': 0,
+    'CUBIC_EXTERIOR': 1,
+    'EXTERIOR_EDGES_1': 2,
+    'EXTERIOR_EDGES_2': 3,
+    '2D_GRID': 4,
+}
+
+GROUP_INPUTS = (
+    ("Grid Type", 'NodeSocketInt', 0),
+    ("Size", 'NodeSocketVector', (1.0, 1.0, 1.0)),
+    ("Subdivisions X", 'NodeSocketInt', 2),
+    ("Subdivisions Y", 'NodeSocketInt', 2),
+    ("Subdivisions Z", 'NodeSocketInt', 2),
+    ("Unit Scale", 'NodeSocketFloat', 1.0),
+    ("Edge Radius", 'NodeSocketFloat', 0.05),
+    ("Show Numbers", 'NodeSocketBool', True),
+    ("Text Size", 'NodeSocketFloat', 0.5),
+    ("Offset X", 'NodeSocketVector', (0.0, 0.0, 0.0)),
+    ("Offset Y", 'NodeSocketVector', (0.0, 0.0, 0.0)),
+    ("Offset Z", 'NodeSocketVector', (0.0, 0.0, 0.0)),
+    ("Label X", 'NodeSocketBool', True),
+    ("Label Y", 'NodeSocketBool', True),
+    ("Rotation", 'NodeSocketVector', (0.0, 0.0, 0.0)),
+    ("Camera", 'NodeSocketObject', None),
+)
+
+
+class _TreeBuilder:
+    def __init__(self, group):
+        self.nodes = group.nodes
+        self.links = group.links
+
+    def node(self, bl_idname, inputs=None, **props):
+        node = self.nodes.new(bl_idname)
+        # Properties first: data types decide which sockets exist
+        for key, value in props.items():
+            setattr(node, key, value)
+        for key, value in (inputs or {}).items():
+            self.set_input(node.inputs[key], value)
+        return node
+
+    def set_input(self, socket, value):
+        if isinstance(value, bpy.types.NodeSocket):
+            self.links.new(value, socket)
+        elif value is not None:
+            socket.default_value = value
+
+    def math(self, operation, a, b=0.0):
+        return self.node('ShaderNodeMath', {0: a, 1: b}, operation=operation).outputs[0]
+
+    def vmath(self, operation, a, b=(0.0, 0.0, 0.0)):
+        return self.node('ShaderNodeVectorMath', {0: a, 1: b}, operation=operation).outputs[0]
+
+    def scale(self, vector, factor):
+        return self.node('ShaderNodeVectorMath', {0: vector, 'Scale': factor}, operation='SCALE').outputs[0]
+
+    def combine(self, x=0.0, y=0.0, z=0.0):
+        return self.node('ShaderNodeCombineXYZ', {'X': x, 'Y': y, 'Z': z}).outputs[0]
+
+    def separate(self, vector):
+        return self.node('ShaderNodeSeparateXYZ', {'Vector': vector}).outputs
+
+    def compare(self, operation, a, b, data_type='FLOAT'):
+        offset = 2 if data_type == 'INT' else 0
+        node = self.node('FunctionNodeCompare', {offset: a, offset + 1: b},
+                         data_type=data_type, operation=operation)
+        return node.outputs['Result']
+
+    def switch(self, input_type, condition, false, true):
+        node = self.node('GeometryNodeSwitch', {'Switch': condition, 'False': false, 'True': true},
+                         input_type=input_type)
+        return node.outputs[0]
+
+    def index_switch(self, data_type, index, items):
+        node = self.node('GeometryNodeIndexSwitch', {'Index': index}, data_type=data_type)
+        while len(node.index_switch_items) < len(items):
+            node.index_switch_items.new()
+        for socket, item in zip(node.inputs[1:], items):
+            self.set_input(socket, item)
+        return node.outputs[0]
+
+    def join(self, *geometries):
+        node = self.node('GeometryNodeJoinGeometry')
+        for geometry in geometries:
+            self.links.new(geometry, node.inputs[0])
+        return node.outputs[0]
+
+    def transform(self, geometry, translation=None, rotation=None):
+        node = self.node('GeometryNodeTransform', {'Geometry': geometry, 'Translation': translation,
+                                                   'Rotation': rotation})
+        return node.outputs[0]
+
+    def line(self, start, offset, count):
+        node = self.node('GeometryNodeMeshLine', {'Count': count, 'Start Location': start, 'Offset': offset})
+        return node.outputs['Mesh']
+
+    def realize(self, geometry):
+        return self.node('GeometryNodeRealizeInstances', {'Geometry': geometry}).outputs[0]
+
+    def instance(self, points, instance):
+        node = self.node('GeometryNodeInstanceOnPoints', {'Points': points, 'Instance': instance})
+        return self.realize(node.outputs['Instances'])
+
+    def store(self, geometry, name, data_type, value):
+        node = self.node('GeometryNodeStoreNamedAttribute', {'Geometry': geometry, 'Name': name, 'Value': value},
+                         data_type=data_type, domain='POINT')
+        return node.outputs[0]
+
+    def attribute(self, name, data_type):
+        return self.node('GeometryNodeInputNamedAttribute', {'Name': name}, data_type=data_type).outputs['Attribute']
+
+    def sample(self, geometry, value, index, data_type):
+        node = self.node('GeometryNodeSampleIndex', {'Geometry': geometry, 'Value': value, 'Index': index},
+                         data_type=data_type, domain='POINT')
+        return node.outputs[0]
+
+    def to_string(self, value):
+        return self.node('FunctionNodeValueToString', {'Value': value, 'Decimals': 2}).outputs[0]
+
+    def replace(self, string, find, replacement):
+        return self.node('FunctionNodeReplaceString', {'String': string, 'Find': find,
+                                                       'Replace': replacement}).outputs[0]
+
+    def align(self, rotation, vector, axis, pivot_axis='AUTO'):
+        try:
+            node = self.node('FunctionNodeAlignRotationToVector', axis=axis, pivot_axis=pivot_axis)
+        except RuntimeError:
+            node = self.node('FunctionNodeAlignEulerToVector', axis=axis, pivot_axis=pivot_axis)
+        self.set_input(node.inputs['Rotation'], rotation)
+        self.set_input(node.inputs['Vector'], vector)
+        return node.outputs['Rotation']
+
+
+def _labelled(b, geometry, value, offset):
+    geometry = b.store(geometry, "label_value", 'FLOAT', value)
+    return b.store(geometry, "label_offset", 'FLOAT_VECTOR', offset)
+
+
+def _build_group():
+    group = bpy.data.node_groups.new(PROCEDURAL_GROUP_NAME, 'GeometryNodeTree')
+    for name, socket_type, default in GROUP_INPUTS:
+        socket = group.interface.new_socket(name, in_out='INPUT', socket_type=socket_type)
+        if default is not None:
+            socket.default_value = default
+    group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    b = _TreeBuilder(group)
+    gi = b.node('NodeGroupInput')
+    go = b.node('NodeGroupOutput')
+
+    grid_type = gi.outputs['Grid Type']
+    size = gi.outputs['Size']
+    nx, ny, nz = gi.outputs['Subdivisions X'], gi.outputs['Subdivisions Y'], gi.outputs['Subdivisions Z']
+    unit = gi.outputs['Unit Scale']
+    count_x, count_y, count_z = (b.math('ADD', n, 1.0) for n in (nx, ny, nz))
+    sx, sy, sz = b.separate(size)[:3]
+    step = b.vmath('DIVIDE', size, b.combine(nx, ny, nz))
+    stx, sty, stz = b.separate(step)[:3]
+    origin = (0.0, 0.0, 0.0)
+
+    position = b.node('GeometryNodeInputPosition').outputs['Position']
+    px, py, pz = b.separate(position)[:3]
+    value_x = b.math('DIVIDE', px, unit)
+    value_y = b.math('DIVIDE', py, unit)
+    value_z = b.math('DIVIDE', pz, unit)
+    offset_x, offset_y, offset_z = gi.outputs['Offset X'], gi.outputs['Offset Y'], gi.outputs['Offset Z']
+
+    # CUBIC_INTERNAL_EDGES: XY grids stacked along Z plus Z pillars on every grid point
+    plane = b.node('GeometryNodeMeshGrid', {'Size X': sx, 'Size Y': sy,
+                                            'Vertices X': count_x, 'Vertices Y': count_y}).outputs['Mesh']
+    plane = b.transform(plane, translation=b.combine(b.math('MULTIPLY', sx, 0.5),
+                                                     b.math('MULTIPLY', sy, 0.5), 0.0))
+    z_line = b.line(origin, b.combine(0.0, 0.0, stz), count_z)
+    layers = b.instance(z_line, plane)
+    pillars = b.instance(plane, z_line)
+    internal_edges = b.join(layers, pillars)
+
+    # CUBIC_EXTERIOR: the subdivided surface of a cube
+    cube = b.node('GeometryNodeMeshCube', {'Size': size, 'Vertices X': count_x, 'Vertices Y': count_y,
+                                           'Vertices Z': count_z}).outputs['Mesh']
+    cube = b.transform(cube, translation=b.scale(size, 0.5))
+
+    # Cubic labels take the offset of the first axis at its maximum, as in the Python path
+    at_max = [b.compare('GREATER_THAN', p, b.math('SUBTRACT', s, b.math('MULTIPLY', st, 0.5)))
+              for p, s, st in ((px, sx, stx), (py, sy, sty), (pz, sz, stz))]
+    cubic_offset = b.switch('VECTOR', at_max[0],
+                            b.switch('VECTOR', at_max[1],
+                                     b.switch('VECTOR', at_max[2], offset_x, offset_z),
+                                     offset_y),
+                            offset_x)
+    cubic_points = b.switch('GEOMETRY', b.compare('EQUAL', grid_type, 1, data_type='INT'), layers, cube)
+    cubic_labels = _labelled(b, cubic_points, 0.0, cubic_offset)
+
+    # EXTERIOR_EDGES_1/2: three subdivided axis lines
+    x_line = b.line(origin, b.combine(stx, 0.0, 0.0), count_x)
+    y_line = b.line(origin, b.combine(0.0, sty, 0.0), count_y)
+    z_line_1 = b.line(origin, b.combine(0.0, 0.0, stz), count_z)
+    z_line_2 = b.line(b.combine(sx, 0.0, 0.0), b.combine(0.0, 0.0, stz), count_z)
+    exterior_edges_1 = b.join(x_line, y_line, z_line_1)
+    exterior_edges_2 = b.join(x_line, y_line, z_line_2)
+
+    x_labels = _labelled(b, x_line, value_x, offset_x)
+    y_labels = _labelled(b, b.line(b.combine(0.0, sty, 0.0), b.combine(0.0, sty, 0.0), ny), value_y, offset_y)
+    z_labels_1 = _labelled(b, b.line(b.combine(0.0, 0.0, stz), b.combine(0.0, 0.0, stz), nz),
+                           value_z, offset_z)
+    z_labels_2 = _labelled(b, b.line(b.combine(sx, 0.0, stz), b.combine(0.0, 0.0, stz), nz),
+                           value_z, offset_z)
+    exterior_labels_1 = b.join(x_labels, y_labels, z_labels_1)
+    exterior_labels_2 = b.join(x_labels, y_labels, z_labels_2)
+
+    # 2D_GRID: only the boundary edges of the plane, labels along x == 0 and y == 0
+    face_count = b.node('GeometryNodeInputMeshEdgeNeighbors').outputs['Face Count']
+    interior = b.compare('NOT_EQUAL', face_count, 1, data_type='INT')
+    boundary = b.node('GeometryNodeDeleteGeometry', {'Geometry': plane, 'Selection': interior},
+                      domain='EDGE').outputs[0]
+    label_x = gi.outputs['Label X']
+    label_y = gi.outputs['Label Y']
+    y_start = b.switch('VECTOR', label_x, origin, b.combine(0.0, sty, 0.0))
+    y_count = b.switch('INT', label_x, count_y, ny)
+    plane_y_labels = _labelled(b, b.line(y_start, b.combine(0.0, sty, 0.0), y_count), value_y, offset_y)
+    plane_labels = b.join(b.switch('GEOMETRY', label_x, None, x_labels),
+                          b.switch('GEOMETRY', label_y, None, plane_y_labels))
+
+    rotation = gi.outputs['Rotation']
+    edges = b.index_switch('GEOMETRY', grid_type,
+                           [internal_edges, cube, exterior_edges_1, exterior_edges_2, boundary])
+    edges = b.transform(edges, rotation=rotation)
+    profile = b.node('GeometryNodeCurvePrimitiveCircle', {'Resolution': 8,
+                                                          'Radius': gi.outputs['Edge Radius']})
+    curves = b.node('GeometryNodeMeshToCurve', {'Mesh': edges}).outputs['Curve']
+    tubes = b.node('GeometryNodeCurveToMesh', {'Curve': curves,
+                                               'Profile Curve': profile.outputs['Curve']}).outputs['Mesh']
+
+    label_points = b.index_switch('GEOMETRY', grid_type,
+                                  [cubic_labels, cubic_labels, exterior_labels_1, exterior_labels_2,
+                                   plane_labels])
+    label_points = b.transform(label_points, rotation=rotation)
+    label_count = b.node('GeometryNodeAttributeDomainSize', {'Geometry': label_points},
+                         component='MESH').outputs['Point Count']
+
+    # String to Curves takes a single string, so labels are built one per iteration.
+    # Each iteration only adds glyph instances, which are cheap to carry along,
+    # and all of them are realized and filled once after the loop.
+    repeat_in = b.node('GeometryNodeRepeatInput')
+    repeat_out = b.node('GeometryNodeRepeatOutput')
+    repeat_in.pair_with_output(repeat_out)
+    repeat_out.repeat_items.clear()
+    repeat_out.repeat_items.new('GEOMETRY', "Labels")
+    repeat_out.repeat_items.new('INT', "Index")
+    b.set_input(repeat_in.inputs['Iterations'],
+                b.switch('INT', gi.outputs['Show Numbers'], 0, label_count))
+
+    index = repeat_in.outputs['Index']
+    anchor = b.sample(label_points, position, index, 'FLOAT_VECTOR')
+    value = b.sample(label_points, b.attribute("label_value", 'FLOAT'), index, 'FLOAT')
+    offset = b.sample(label_points, b.attribute("label_offset", 'FLOAT_VECTOR'), index, 'FLOAT_VECTOR')
+
+    ax, ay, az = b.separate(anchor)[:3]
+    xyz_text = b.replace(b.replace(b.replace("X,Y,Z", "X", b.to_string(ax)), "Y", b.to_string(ay)),
+                         "Z", b.to_string(az))
+    is_cubic = b.compare('LESS_THAN', grid_type, 2, data_type='INT')
+    text = b.switch('STRING', is_cubic, b.to_string(value), xyz_text)
+
+    glyphs = b.node('GeometryNodeStringToCurves', {'String': text, 'Size': gi.outputs['Text Size']},
+                    align_x='CENTER', align_y='MIDDLE').outputs['Curve Instances']
+
+    location = b.vmath('ADD', anchor, offset)
+    camera = b.node('GeometryNodeObjectInfo', {'Object': gi.outputs['Camera']},
+                    transform_space='RELATIVE').outputs['Location']
+    facing = b.align(origin, b.vmath('SUBTRACT', camera, location), 'Z')
+    facing = b.align(facing, (0.0, 0.0, 1.0), 'Y', pivot_axis='Z')
+    is_2d = b.compare('EQUAL', grid_type, 4, data_type='INT')
+    label_rotation = b.switch('ROTATION', is_2d, facing, rotation)
+    placed = b.node('GeometryNodeTransform', {'Geometry': glyphs, 'Translation': location,
+                                              'Rotation': label_rotation}).outputs[0]
+
+    b.set_input(repeat_out.inputs['Labels'], b.join(repeat_in.outputs['Labels'], placed))
+    b.set_input(repeat_out.inputs['Index'], b.math('ADD', index, 1.0))
+
+    labels = b.node('GeometryNodeFillCurve', {'Curve': b.realize(repeat_out.outputs['Labels'])}).outputs['Mesh']
+    b.set_input(go.inputs['Geometry'], b.join(tubes, labels))
+    return group
+
+
+def get_procedural_group():
+    group = bpy.data.node_groups.get(PROCEDURAL_GROUP_NAME)
+    if group is None:
+        group = _build_group()
+    return group
+
+
+def procedural_label_count(grid_settings):
+    # Labels the group lays out: every node of cubic grids, the axis lines otherwise
+    nx, ny, nz = axis_subdivisions({key: getattr(grid_settings, key) for key in SUBDIVISION_KEYS})
+    grid_type = grid_settings.grid_type
+    if grid_type == '2D_GRID':
+        return {'X': nx + 1, 'Y': ny + 1}.get(grid_settings.length_axis_2d, nx + ny + 1)
+    if grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2'):
+        return nx + ny + nz + 1
+    count = (nx + 1) * (ny + 1) * (nz + 1)
+    if grid_type == 'CUBIC_EXTERIOR':
+        count -= (nx - 1) * (ny - 1) * (nz - 1)
+    return count
+
+
+def procedural_labels_shown(grid_settings):
+    return grid_settings.show_numbers and procedural_label_count(grid_settings) <= MAX_PROCEDURAL_LABELS
+
+
+def procedural_inputs(grid_settings):
+    scale = unit_scale_factor(grid_settings.unit_measure)
+    offsets = axis_offsets(grid_settings).tolist()
+    nx, ny, nz = axis_subdivisions({key: getattr(grid_settings, key) for key in SUBDIVISION_KEYS})
+    return {
+        "Grid Type": GRID_TYPE_INDEX[grid_settings.grid_type],
+        "Size": (grid_settings.distance_x * scale,
+                 grid_settings.distance_y * scale,
+                 grid_settings.distance_z * scale),
+        "Subdivisions X": nx,
+        "Subdivisions Y": ny,
+        "Subdivisions Z": nz,
+        "Unit Scale": scale,
+        "Edge Radius": grid_settings.base_edge_size * scale,
+        "Show Numbers": procedural_labels_shown(grid_settings),
+        "Text Size": grid_settings.base_text_size * scale,
+        "Offset X": offsets[0],
+        "Offset Y": offsets[1],
+        "Offset Z": offsets[2],
+        "Label X": grid_settings.length_axis_2d in ['X', 'BOTH'],
+        "Label Y": grid_settings.length_axis_2d in ['Y', 'BOTH'],
+        # The grid root carries the 2D orientation
+        "Rotation": (0.0, 0.0, 0.0),
+    }
+
+
+def write_inputs(modifier, values):
+    items = modifier.node_group.interface.items_tree
+    for name, value in values.items():
+        modifier[items[name].identifier] = value
+
+
+def build_procedural_grid(grid, grid_settings, camera=None):
+    mesh = bpy.data.meshes.new(PROCEDURAL_OBJECT_NAME)
+    obj = bpy.data.objects.new(PROCEDURAL_OBJECT_NAME, mesh)
+    registry.link_object(grid, obj)
+    modifier = obj.modifiers.new(name=MODIFIER_NAME, type='NODES')
+    modifier.node_group = get_procedural_group()
+    if camera is not None:
+        write_inputs(modifier, {"Camera": camera})
+    write_inputs(modifier, procedural_inputs(grid_settings))
+    registry.set_member(grid, 'procedural', obj)
+    return obj
+
+
+def sync_procedural_grid(scene):
+    grid = registry.get_active_grid(scene)
+    if grid is None:
+        return
+    obj = registry.get_member(grid, 'procedural')
+    if obj is None:
+        return
+    modifier = obj.modifiers.get(MODIFIER_NAME)
+    if modifier is None or modifier.node_group is None:
+        return
+    previous = registry.settings_snapshot(grid)
+    write_inputs(modifier, procedural_inputs(scene.grid_settings))
+    registry.store_settings(grid, scene.grid_settings)
+    registry.update_root(grid, previous, registry.settings_snapshot(grid))
+    # ID-property writes on the modifier do not tag the depsgraph by themselves
+    obj.update_tag()
@@ -0,0 +1,166 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+import bpy
+
+from . import registry
+from .teardown import ID_LABELS
+
+# Log records of every add-on module go through this logger
+logger = logging.getLogger(__package__.rpartition(".")[0] or __package__)
+
+REPORT_NAME = "grid_generator_profile.json"
+TOP_FUNCTIONS = 20
+
+DATA_COLLECTIONS = {
+    'OBJECT': "objects",
+    'MESH': "meshes",
+    'CURVE': "curves",
+    'FONT': "fonts",
+    'MATERIAL': "materials",
+}
+
+# Latest profile of each operation, shown in the panel
+last_profiles = {}
+
+
+def configure_logging(level):
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(name)s %(levelname)s: %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+
+def datablock_counts():
+    return Counter({id_type: len(getattr(bpy.data, attr)) for id_type, attr in DATA_COLLECTIONS.items()})
+
+
+def report_path(path):
+    path = bpy.path.abspath(path) if path else ""
+    if not path or path.startswith("//"):
+        # Unsaved files have no directory for relative paths
+        path = os.path.join(tempfile.gettempdir(), REPORT_NAME)
+    return path
+
+
+class BuildProfile:
+    # Times named phases of an operator and counts the datablocks it creates
+    # and frees. cProfile and tracemalloc only run when capture is enabled.
+
+    def __init__(self, operation, capture=False, path=None, settings=None):
+        self.operation = operation
+        self.capture = capture
+        self.path = path
+        self.settings = settings or {}
+        self.phases = {}
+        self.counters = Counter()
+        self.freed = Counter()
+        self.total = 0.0
+        self.peak_memory = None
+        self.top_functions = []
+        self._profiler = None
+
+    def __enter__(self):
+        self._before = datablock_counts()
+        if self.capture:
+            tracemalloc.start()
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.total = time.perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.top_functions = self._top_functions(self._profiler)
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        after = datablock_counts()
+        for id_type, (_, plural) in ID_LABELS.items():
+            created = after[id_type] - self._before[id_type] + self.freed[id_type]
+            if created:
+                self.counters[f"{plural}_created"] = created
+            if self.freed[id_type]:
+                self.counters[f"{plural}_freed"] = self.freed[id_type]
+
+        last_profiles[self.operation] = self.as_dict()
+        if exc_type is None and self.path is not None:
+            self.write()
+        logger.info(self.summary())
+        return False
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            logger.debug("%s: %s took %.4f s", self.operation, name, elapsed)
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def add_freed(self, freed):
+        self.freed.update(freed)
+
+    def _top_functions(self, profiler):
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        rows = []
+        for (filename, line, function), (_, calls, _, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{line}({function})",
+                "calls": calls,
+                "cumulative": cumulative,
+            })
+        rows.sort(key=lambda row: row["cumulative"], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+
+    def summary(self):
+        phases = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items())
+        return f"{self.operation}: {self.total:.3f}s" + (f" ({phases})" if phases else "")
+
+    def as_dict(self):
+        return {
+            "operation": self.operation,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_seconds": self.total,
+            "phases": dict(self.phases),
+            "counters": dict(self.counters),
+            "peak_memory_bytes": self.peak_memory,
+            "top_functions": self.top_functions,
+            "settings": self.settings,
+        }
+
+    def write(self):
+        path = report_path(self.path)
+        try:
+            with open(path, "w", encoding="utf-8") as report:
+                json.dump({"profiles": last_profiles}, report, indent=2)
+        except OSError as error:
+            logger.warning("Could not write profile report %s: %s", path, error)
+            return None
+        logger.debug("Profile report written to %s", path)
+        return path
+
+
+def profile_for(operator, grid_settings):
+    configure_logging(grid_settings.log_level)
+    path = grid_settings.profile_report if grid_settings.write_profile_report else None
+    return BuildProfile(operator.bl_label, grid_settings.profile_capture, path,
+                        registry.snapshot_settings(grid_settings))
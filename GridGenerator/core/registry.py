@@ -0,0 +1,226 @@
+import bpy
+import mathutils
+
+from .lattice import grid_rotation
+from .teardown import teardown
+
+# Every generated grid lives in its own collection. The collection carries an
+# ID-property descriptor with the settings snapshot it was built from and the
+# lattice-index to object maps, so lookups never go through object names and
+# the whole record is saved with the .blend file. Every object of a grid is
+# parented to one root empty, so moving, scaling or reorienting the whole grid
+# is a single transform write.
+
+DESCRIPTOR_KEY = "grid_generator"
+DESCRIPTOR_VERSION = 1
+
+# Roles stored as {"ix_iy_iz": object} maps, glyphs are keyed by label text
+MAP_ROLES = ("nodes", "labels", "edges", "glyphs")
+# Roles that hold a single object
+SINGLE_ROLES = ("root", "cloud", "edge_mesh", "procedural", "billboard", "baked_edges")
+# Roles stored as {key: datablock} maps of shared, non-object data
+DATA_MAP_ROLES = ("label_curves",)
+# Roles that hold a single shared, non-object datablock
+DATA_ROLES = ("font", "material", "edge_curve", "glyph_collection")
+
+ROOT_NAME = "GridRoot"
+# Settings the root transform follows. They are only written when they change,
+# so a grid the user moved or turned by hand stays where it is.
+ROOT_ORIENTATION_KEYS = ("grid_type", "grid_2d_orientation")
+ROOT_LOCATION_KEYS = ("grid_origin",)
+
+# Name prefixes of the loose objects the add-on built before grids were recorded
+BASELINE_PREFIXES = ("GridNode_", "EdgeObj_")
+
+
+def is_grid(collection):
+    return collection is not None and DESCRIPTOR_KEY in collection
+
+
+def grid_key(index):
+    return "_".join(str(int(i)) for i in index)
+
+
+def edge_key(start_index, end_index):
+    return f"{grid_key(start_index)}-{grid_key(end_index)}"
+
+
+def parse_key(key):
+    return tuple(int(i) for i in key.split("_"))
+
+
+def snapshot_settings(grid_settings):
+    snapshot = {}
+    for prop in grid_settings.bl_rna.properties:
+        if prop.identifier == 'rna_type' or prop.type in {'POINTER', 'COLLECTION'}:
+            continue
+        value = getattr(grid_settings, prop.identifier)
+        if getattr(prop, "is_array", False):
+            value = list(value)
+        snapshot[prop.identifier] = value
+    return snapshot
+
+
+def create_grid(scene, name="Grid"):
+    grid = bpy.data.collections.new(name)
+    scene.collection.children.link(grid)
+    grid[DESCRIPTOR_KEY] = {
+        "version": DESCRIPTOR_VERSION,
+        "settings": {},
+        **{role: {} for role in MAP_ROLES},
+    }
+    new_root(grid)
+    scene.grid_settings.active_grid = grid
+    return grid
+
+
+def baseline_objects(scene):
+    # Nodes, labels and edges of a grid built without a registry, found by name
+    return [obj for obj in scene.objects
+            if obj.name.startswith(BASELINE_PREFIXES) and not any(is_grid(coll) for coll in obj.users_collection)]
+
+
+def get_active_grid(scene):
+    grid = scene.grid_settings.active_grid
+    return grid if is_grid(grid) else None
+
+
+def iter_grids():
+    return (coll for coll in bpy.data.collections if is_grid(coll))
+
+
+def descriptor(grid):
+    return grid[DESCRIPTOR_KEY]
+
+
+def store_settings(grid, grid_settings):
+    descriptor(grid)["settings"] = snapshot_settings(grid_settings)
+
+
+def settings_snapshot(grid):
+    return descriptor(grid)["settings"].to_dict()
+
+
+def new_root(grid):
+    root = bpy.data.objects.new(ROOT_NAME, None)
+    root.empty_display_type = 'ARROWS'
+    grid.objects.link(root)
+    set_member(grid, 'root', root)
+    return root
+
+
+def update_root(grid, previous, settings):
+    # previous and settings are snapshots, previous is empty for a new grid
+    root = get_member(grid, 'root')
+    if any(previous.get(key) != settings.get(key) for key in ROOT_ORIENTATION_KEYS):
+        root.rotation_euler = mathutils.Matrix(grid_rotation(settings).tolist()).to_euler()
+    if any(previous.get(key) != settings.get(key) for key in ROOT_LOCATION_KEYS):
+        root.location = settings.get('grid_origin', (0.0, 0.0, 0.0))
+
+
+def copy_placement(source, target):
+    # A grid replacing another one keeps the position and size the user gave it,
+    # and its rotation unless the orientation settings changed
+    source_root = get_member(source, 'root')
+    target_root = get_member(target, 'root')
+    if source_root is not None and target_root is not None:
+        target_root.location = source_root.location
+        target_root.scale = source_root.scale
+        previous, settings = settings_snapshot(source), settings_snapshot(target)
+        if all(previous.get(key) == settings.get(key) for key in ROOT_ORIENTATION_KEYS):
+            target_root.rotation_euler = source_root.rotation_euler
+
+
+def to_grid_space(grid, location):
+    root = get_member(grid, 'root')
+    if root is None or location is None:
+        return location
+    return root.matrix_world.inverted() @ mathutils.Vector(location)
+
+
+def link_object(grid, obj):
+    grid.objects.link(obj)
+    root = get_member(grid, 'root')
+    if root is not None:
+        obj.parent = root
+
+
+def register_map(grid, role, objects):
+    # One assignment converts the whole dict instead of one IDProperty write per key
+    data = descriptor(grid)
+    merged = dict(data[role].items()) if role in data else {}
+    merged.update(objects)
+    data[role] = merged
+
+
+def set_map(grid, role, objects):
+    descriptor(grid)[role] = objects
+
+
+def object_map(grid, role):
+    data = descriptor(grid)
+    if role not in data:
+        return {}
+    return {key: obj for key, obj in data[role].items() if obj is not None}
+
+
+def set_member(grid, role, obj):
+    descriptor(grid)[role] = obj
+
+
+def get_member(grid, role):
+    return descriptor(grid).get(role)
+
+
+def members(grid, roles=MAP_ROLES + SINGLE_ROLES):
+    objects = []
+    for role in roles:
+        if role in MAP_ROLES:
+            objects.extend(object_map(grid, role).values())
+        elif role in SINGLE_ROLES:
+            obj = get_member(grid, role)
+            if obj is not None:
+                objects.append(obj)
+    return objects
+
+
+def data_members(grid, roles=DATA_MAP_ROLES + DATA_ROLES):
+    data = []
+    for role in roles:
+        if role in DATA_MAP_ROLES:
+            data.extend(object_map(grid, role).values())
+        elif role in DATA_ROLES:
+            id_data = get_member(grid, role)
+            if id_data is not None:
+                data.append(id_data)
+    return data
+
+
+def delete_objects(objects):
+    return teardown(objects)
+
+
+def delete_members(grid, roles):
+    # Descriptor references count as users, so they are released before the purge
+    objects = members(grid, roles)
+    data = data_members(grid, roles)
+    clear_roles(grid, roles)
+    return teardown(objects, data)
+
+
+def delete_grid(grid):
+    objects = members(grid)
+    data = data_members(grid)
+    del grid[DESCRIPTOR_KEY]
+    freed = teardown(objects, data)
+    bpy.data.collections.remove(grid)
+    return freed
+
+
+def clear_roles(grid, roles):
+    data = descriptor(grid)
+    for role in roles:
+        if role in MAP_ROLES or role in DATA_MAP_ROLES:
+            data[role] = {}
+        elif role in data:
+            del data[role]
@@ -0,0 +1,68 @@
+from collections import Counter
+
+import bpy
+
+# Grid objects are removed together with the data only they used, in batches
+# through bpy.data.batch_remove, without touching the selection or going
+# through bpy.ops.object.delete.
+
+ID_LABELS = {
+    'OBJECT': ("object", "objects"),
+    'MESH': ("mesh", "meshes"),
+    'CURVE': ("curve", "curves"),
+    'FONT': ("font", "fonts"),
+    'MATERIAL': ("material", "materials"),
+    'COLLECTION': ("collection", "collections"),
+}
+
+# Data that other data references, purged only after everything else
+SHARED_TYPES = {'FONT', 'MATERIAL'}
+
+
+def _fonts(curve):
+    if not isinstance(curve, bpy.types.TextCurve):
+        return ()
+    fonts = (curve.font, curve.font_bold, curve.font_italic, curve.font_bold_italic)
+    # The builtin font is shared by every text in the file
+    return [font for font in fonts if font is not None and font.filepath != "<builtin>"]
+
+
+def _purge(ids, freed):
+    orphans = [id_data for id_data in ids if id_data.users == 0]
+    if orphans:
+        for id_data in orphans:
+            freed[id_data.id_type] += 1
+        bpy.data.batch_remove(orphans)
+
+
+def teardown(objects, extra_data=()):
+    objects = [obj for obj in dict.fromkeys(objects) if obj is not None]
+    extra_data = [id_data for id_data in dict.fromkeys(extra_data) if id_data is not None]
+    data = dict.fromkeys(obj.data for obj in objects if obj.data is not None)
+    data.update(dict.fromkeys(id_data for id_data in extra_data if id_data.id_type not in SHARED_TYPES))
+    shared = dict.fromkeys(slot.material for obj in objects for slot in obj.material_slots
+                           if slot.material is not None)
+    shared.update(dict.fromkeys(material for id_data in data for material in getattr(id_data, "materials", ())
+                                if material is not None))
+    shared.update(dict.fromkeys(font for id_data in data for font in _fonts(id_data)))
+    # Fonts and materials passed in are still used by the data above, they wait for the last pass
+    shared.update(dict.fromkeys(id_data for id_data in extra_data if id_data.id_type in SHARED_TYPES))
+
+    freed = Counter()
+    if objects:
+        freed['OBJECT'] = len(objects)
+        bpy.data.batch_remove(objects)
+    # Users only drop once the owners are gone, so purge in dependency order:
+    # objects, then the curves and meshes they used, then the fonts and materials
+    _purge(list(data), freed)
+    _purge(list(shared), freed)
+    return freed
+
+
+def format_freed(freed):
+    parts = []
+    for id_type, (singular, plural) in ID_LABELS.items():
+        count = freed.get(id_type, 0)
+        if count:
+            parts.append(f"{count} {singular if count == 1 else plural}")
+    return "Freed " + ", ".join(parts) if parts else "Nothing to free"
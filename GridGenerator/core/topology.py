@@ -0,0 +1,93 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .lattice import AXIS_NAMES, exterior_lines
+
+# Canonical edge list of every grid type. Each undirected edge appears exactly
+# once, as a pair of lattice rows, so every edge backend builds the same
+# topology without duplicates. Like the lattice it only depends on NumPy.
+
+
+class EdgeTopology(NamedTuple):
+    rows: np.ndarray  # (E, 2) int64 lattice rows, the start has the lower index along the edge axis
+    axes: np.ndarray  # (E,) int8 axis each edge runs along
+
+
+def _row_lookup(indices, subdivisions):
+    # Sorted linear keys, so neighbours are found with searchsorted instead of a dense volume
+    nx, ny, _ = subdivisions
+    keys = indices[:, 0] + (nx + 1) * (indices[:, 1] + (ny + 1) * indices[:, 2])
+    order = np.argsort(keys, kind='stable')
+    return keys[order], order, (1, nx + 1, (nx + 1) * (ny + 1))
+
+
+def _axis_edges(lattice, shell_axes):
+    # Unit steps along each axis between lattice nodes. With shell_axes, an edge
+    # is kept only if it lies on the boundary of one of those other axes.
+    indices = lattice.indices
+    n = lattice.subdivisions
+    sorted_keys, order, strides = _row_lookup(indices, n)
+    keys = sorted_keys[np.argsort(order)]
+    rows, axes = [], []
+    for axis in range(3):
+        if n[axis] == 0:
+            continue
+        keep = indices[:, axis] < n[axis]
+        if shell_axes is not None:
+            on_shell = np.zeros(len(indices), dtype=bool)
+            for other in shell_axes:
+                if other != axis:
+                    on_shell |= (indices[:, other] == 0) | (indices[:, other] == n[other])
+            keep &= on_shell
+        starts = np.flatnonzero(keep)
+        neighbour = keys[starts] + strides[axis]
+        found = np.searchsorted(sorted_keys, neighbour)
+        found = np.minimum(found, len(sorted_keys) - 1)
+        present = sorted_keys[found] == neighbour
+        rows.append(np.stack((starts[present], order[found[present]]), axis=1))
+        axes.append(np.full(int(present.sum()), axis, dtype=np.int8))
+    return rows, axes
+
+
+def _line_edges(lattice):
+    # Rows 0-3 are the corners, followed by the subdivision nodes of each axis line
+    rows, axes = [], []
+    first_row = 4
+    for axis, (start_row, end_row, n) in enumerate(exterior_lines(lattice.grid_type, lattice.subdivisions)):
+        chain = np.concatenate(([start_row], np.arange(first_row, first_row + n - 1), [end_row]))
+        first_row += n - 1
+        rows.append(np.stack((chain[:-1], chain[1:]), axis=1))
+        axes.append(np.full(len(chain) - 1, axis, dtype=np.int8))
+    return rows, axes
+
+
+def edge_topology(lattice):
+    grid_type = lattice.grid_type
+    if grid_type == 'CUBIC_INTERNAL_EDGES':
+        rows, axes = _axis_edges(lattice, None)
+    elif grid_type == 'CUBIC_EXTERIOR':
+        rows, axes = _axis_edges(lattice, (0, 1, 2))
+    elif grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2'):
+        rows, axes = _line_edges(lattice)
+    elif grid_type == '2D_GRID':
+        # Only the outline of the plane, interior nodes carry labels but no edges
+        rows, axes = _axis_edges(lattice, (0, 1))
+    else:
+        raise ValueError(f"Unknown grid type: {grid_type}")
+    if not rows:
+        return EdgeTopology(np.empty((0, 2), dtype=np.int64), np.empty(0, dtype=np.int8))
+    return EdgeTopology(np.concatenate(rows).astype(np.int64), np.concatenate(axes))
+
+
+def edge_counts(topology):
+    counts = np.bincount(topology.axes, minlength=3)
+    result = {name: int(count) for name, count in zip(AXIS_NAMES, counts)}
+    result['total'] = len(topology.rows)
+    return result
+
+
+def used_rows(topology):
+    # (rows, edges) of a compact vertex list holding only the edge endpoints
+    rows, inverse = np.unique(topology.rows, return_inverse=True)
+    return rows, inverse.reshape(-1, 2)
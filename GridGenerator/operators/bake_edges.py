@@ -0,0 +1,85 @@
+import bpy
+
+from ..core import registry
+from ..core.animation import bind_active_grid
+from ..core.edge_bake import (
+    MIN_SIDES,
+    bake_polygons,
+    build_baked_mesh,
+    edge_segments,
+    ribbon_geometry,
+    sides_for_budget,
+    tube_geometry,
+)
+from ..core.lattice import unit_scale_factor
+from ..core.materials import assign_material
+from ..core.profiling import profile_for
+
+class BakeEdgesOperator(bpy.types.Operator):
+    bl_idname = "object.bake_edges"
+    bl_label = "Bake Edges"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        with profile_for(self, context.scene.grid_settings) as profile:
+            self.profile = profile
+            result = self.bake(context)
+        if result == {'FINISHED'}:
+            bind_active_grid(context.scene)
+        return result
+
+    def bake(self, context):
+        scene = context.scene
+        grid_settings = scene.grid_settings
+        grid = registry.get_active_grid(scene)
+        if grid is None:
+            self.report({'ERROR'}, "No grid found. Generate nodes first.")
+            return {'CANCELLED'}
+
+        with self.profile.phase("segments"):
+            starts, ends = edge_segments(grid)
+        if not len(starts):
+            self.report({'ERROR'}, "The grid has no edges to bake. Create edges first.")
+            return {'CANCELLED'}
+
+        # The mesh is built in grid space, where the edge size applies before the root scale
+        radius = grid_settings.base_edge_size * unit_scale_factor(grid_settings.unit_measure)
+        mode = grid_settings.bake_mode
+        budget = grid_settings.bake_polygon_budget
+        sides = sides_for_budget(len(starts), grid_settings.bake_resolution, budget)
+        if mode == 'TUBES' and sides < MIN_SIDES:
+            self.report({'WARNING'}, f"A budget of {budget} polygons cannot fit "
+                                     f"{len(starts)} tubes. Baking ribbons instead.")
+            mode = 'RIBBONS'
+        elif mode == 'TUBES' and sides < grid_settings.bake_resolution:
+            self.report({'WARNING'}, f"Tubes reduced to {sides} sides to fit a budget of {budget} polygons")
+        polygons = bake_polygons(len(starts), mode, sides)
+        if budget and polygons > budget:
+            self.report({'ERROR'}, f"{len(starts)} edges need {polygons} polygons even as ribbons, "
+                                   f"over the budget of {budget}. Raise the budget or lower the subdivisions.")
+            return {'CANCELLED'}
+
+        with self.profile.phase("geometry"):
+            if mode == 'TUBES':
+                vertices, faces = tube_geometry(starts, ends, radius, sides)
+            else:
+                camera = scene.camera or next((obj for obj in scene.objects if obj.type == 'CAMERA'), None)
+                eye = camera.matrix_world.translation if camera is not None else (0.0, -10.0, 5.0)
+                eye = registry.to_grid_space(grid, eye)
+                vertices, faces = ribbon_geometry(starts, ends, radius, eye)
+
+        with self.profile.phase("mesh"):
+            self.profile.add_freed(registry.delete_members(grid, ['baked_edges']))
+            baked = build_baked_mesh(vertices, faces, grid, smooth=mode == 'TUBES')
+            registry.set_member(grid, 'baked_edges', baked)
+            material = registry.get_member(grid, 'material')
+            if material is not None:
+                assign_material([baked.data], material)
+
+        # The source edges stay for editing but no longer reach the renderer
+        for obj in registry.members(grid, ['edges', 'edge_mesh']):
+            obj.hide_render = True
+        self.profile.count("polygons", len(faces))
+
+        self.report({'INFO'}, f"Baked {len(starts)} edges into {len(faces)} polygons")
+        return {'FINISHED'}
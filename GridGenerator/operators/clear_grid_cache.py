@@ -0,0 +1,14 @@
+import bpy
+
+from ..core.grid_cache import cache_directory, clear_cache
+
+class ClearGridCacheOperator(bpy.types.Operator):
+    bl_idname = "object.clear_grid_cache"
+    bl_label = "Clear Grid Cache"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        directory = cache_directory(context.scene.grid_settings.grid_cache_directory)
+        removed = clear_cache(directory)
+        self.report({'INFO'}, f"Removed {removed} cached grids from {directory}")
+        return {'FINISHED'}
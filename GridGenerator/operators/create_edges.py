@@ -1,161 +1,132 @@
+from types import SimpleNamespace
+
 import bpy
-import mathutils
+
+from ..core import registry
+from ..core.animation import bind_active_grid
+from ..core.edge_instances import new_edge_curve, place_edge
+from ..core.edge_mesh import build_edge_mesh
+from ..core.grid_cache import cache_directory, cache_key, cache_limit, cache_path, load_grid, store_grid
+from ..core.lattice import AXIS_NAMES, lattice_for_settings, node_names, unit_scale_factor
+from ..core.preflight import EDGE_PARTS, enforce_budget
+from ..core.profiling import profile_for
+from ..core.topology import edge_counts, edge_topology, used_rows
 
 class CreateEdgesOperator(bpy.types.Operator):
     bl_idname = "object.create_edges"
     bl_label = "Create Edges"
     bl_options = {'REGISTER', 'UNDO'}
 
-    def create_edge(self, start_obj, end_obj, grid_settings, scale_factor):
-        if start_obj is None or end_obj is None:
-            print(f"Error: Cannot create edge. Start object: {start_obj}, End object: {end_obj}")
-            return
-
-        curve = bpy.data.curves.new(type="CURVE", name="Edge")
-        curve.dimensions = '3D'
-        curve.resolution_u = 2
-        spline = curve.splines.new('POLY')
-        spline.points.add(1)
-        spline.points[0].co = (start_obj.location.x, start_obj.location.y, start_obj.location.z, 1)
-        spline.points[1].co = (end_obj.location.x, end_obj.location.y, end_obj.location.z, 1)
-        edge_obj = bpy.data.objects.new(f"EdgeObj_{start_obj.name}_{end_obj.name}", curve)
-        edge_obj.data.bevel_depth = grid_settings.base_edge_size * scale_factor
-        bpy.context.collection.objects.link(edge_obj)
+    def create_edge(self, start_row, end_row, grid_settings, scale_factor):
+        start = self.coords[start_row]
+        end = self.coords[end_row]
+        name = f"EdgeObj_{self.names[start_row]}_{self.names[end_row]}"
+        if grid_settings.edge_mode == 'INSTANCED':
+            edge_obj = bpy.data.objects.new(name, self.edge_curve)
+            place_edge(edge_obj, start, end)
+        else:
+            curve = bpy.data.curves.new(type="CURVE", name="Edge")
+            curve.dimensions = '3D'
+            curve.resolution_u = 2
+            spline = curve.splines.new('POLY')
+            spline.points.add(1)
+            spline.points[0].co = (start[0], start[1], start[2], 1)
+            spline.points[1].co = (end[0], end[1], end[2], 1)
+            edge_obj = bpy.data.objects.new(name, curve)
+            edge_obj.data.bevel_depth = grid_settings.base_edge_size * scale_factor
+        registry.link_object(self.grid, edge_obj)
+        self.edge_objects[registry.edge_key(self.indices[start_row], self.indices[end_row])] = edge_obj
 
     def execute(self, context):
-        scene = context.scene
-        grid_settings = scene.grid_settings
+        with profile_for(self, context.scene.grid_settings) as profile:
+            self.profile = profile
+            result = self.build(context)
+            if result == {'FINISHED'} and self.cache_path:
+                with profile.phase("cache"):
+                    store_grid(self.grid, self.cache_path, cache_limit(context.scene.grid_settings))
+        if result == {'FINISHED'}:
+            bind_active_grid(context.scene)
+            self.report({'INFO'}, profile.summary())
+        return result
 
-        scale_factor = {
-            'nm': 1e-9,
-            'µm': 1e-6,
-            'mm': 0.001,
-            'cm': 0.01,
-            'dm': 0.1,
-            'm': 1,
-            'dam': 10,
-            'hm': 100,
-            'km': 1000
-        }.get(grid_settings.unit_measure, 1)
+    def load_from_cache(self, scene, snapshot):
+        # The cached grid carries the same nodes, so it replaces the active one whole
+        camera = scene.camera or next((obj for obj in scene.objects if obj.type == 'CAMERA'), None)
+        with self.profile.phase("cache"):
+            path = cache_path(cache_directory(scene.grid_settings.grid_cache_directory),
+                              cache_key(snapshot, 'edges',
+                                        camera.matrix_world.translation if camera is not None else None))
+            cached = load_grid(path, scene, camera)
+            if cached is None:
+                self.cache_path = path
+                return False
+            name = self.grid.name
+            registry.copy_placement(self.grid, cached)
+            self.profile.add_freed(registry.delete_grid(self.grid))
+            cached.name = name
+            scene.grid_settings.active_grid = cached
+        self.profile.count("cache_hits")
+        return True
 
-        dist_x = grid_settings.distance_x * scale_factor
-        dist_y = grid_settings.distance_y * scale_factor
-        dist_z = grid_settings.distance_z * scale_factor
-
-        if grid_settings.grid_type == 'CUBIC_INTERNAL_EDGES':
-            for x in range(grid_settings.subdivisions + 1):
-                for y in range(grid_settings.subdivisions + 1):
-                    for z in range(grid_settings.subdivisions + 1):
-                        current_node = bpy.data.objects.get(f"GridNode_{x}_{y}_{z}")
-                        if current_node:
-                            if x < grid_settings.subdivisions:
-                                next_node_x = bpy.data.objects.get(f"GridNode_{x+1}_{y}_{z}")
-                                if next_node_x:
-                                    self.create_edge(current_node, next_node_x, grid_settings, scale_factor)
-                            if y < grid_settings.subdivisions:
-                                next_node_y = bpy.data.objects.get(f"GridNode_{x}_{y+1}_{z}")
-                                if next_node_y:
-                                    self.create_edge(current_node, next_node_y, grid_settings, scale_factor)
-                            if z < grid_settings.subdivisions:
-                                next_node_z = bpy.data.objects.get(f"GridNode_{x}_{y}_{z+1}")
-                                if next_node_z:
-                                    self.create_edge(current_node, next_node_z, grid_settings, scale_factor)
-        elif grid_settings.grid_type == 'CUBIC_EXTERIOR':
-            # Aristas horizontales (X) en los planos Z = 0 y Z = subdivisions
-            for z in [0, grid_settings.subdivisions]:
-                for y in range(grid_settings.subdivisions + 1):
-                    for x in range(grid_settings.subdivisions):
-                        self.create_edge_by_coords(x, y, z, x+1, y, z, grid_settings, scale_factor)
+    def build(self, context):
+        scene = context.scene
+        self.grid = registry.get_active_grid(scene)
+        if self.grid is None:
+            self.report({'ERROR'}, "No grid found. Generate nodes first.")
+            return {'CANCELLED'}
+        if registry.get_member(self.grid, 'procedural') is not None:
+            self.report({'INFO'}, "Procedural grids build their edges in Geometry Nodes.")
+            return {'CANCELLED'}
 
-            # Aristas horizontales (X) en los planos Y = 0 y Y = subdivisions
-            for y in [0, grid_settings.subdivisions]:
-                for z in range(grid_settings.subdivisions + 1):
-                    for x in range(grid_settings.subdivisions):
-                        self.create_edge_by_coords(x, y, z, x+1, y, z, grid_settings, scale_factor)
+        # Edges follow the settings the nodes were generated with, not the current panel values
+        snapshot = registry.settings_snapshot(self.grid)
+        snapshot['edge_mode'] = scene.grid_settings.edge_mode
+        snapshot['base_edge_size'] = scene.grid_settings.base_edge_size
+        with self.profile.phase("preflight"):
+            # Degrading switches the edge mode in both the scene settings and the snapshot
+            allowed = enforce_budget(self, scene.grid_settings, snapshot, EDGE_PARTS)
+        if not allowed:
+            return {'CANCELLED'}
+        grid_settings = SimpleNamespace(**snapshot)
 
-            # Aristas verticales (Y) en los planos X = 0 y X = subdivisions
-            for x in [0, grid_settings.subdivisions]:
-                for z in range(grid_settings.subdivisions + 1):
-                    for y in range(grid_settings.subdivisions):
-                        self.create_edge_by_coords(x, y, z, x, y+1, z, grid_settings, scale_factor)
+        self.cache_path = None
+        if scene.grid_settings.use_grid_cache and self.load_from_cache(scene, snapshot):
+            return {'FINISHED'}
 
-            # Aristas verticales (Z) en los planos X = 0 y X = subdivisions
-            for x in [0, grid_settings.subdivisions]:
-                for y in range(grid_settings.subdivisions + 1):
-                    for z in range(grid_settings.subdivisions):
-                        self.create_edge_by_coords(x, y, z, x, y, z+1, grid_settings, scale_factor)
+        scale_factor = unit_scale_factor(grid_settings.unit_measure)
 
-            # Aristas verticales (Z) en los planos Y = 0 y Y = subdivisions
-            for y in [0, grid_settings.subdivisions]:
-                for x in range(grid_settings.subdivisions + 1):
-                    for z in range(grid_settings.subdivisions):
-                        self.create_edge_by_coords(x, y, z, x, y, z+1, grid_settings, scale_factor)
+        with self.profile.phase("deletion"):
+            self.profile.add_freed(registry.delete_members(self.grid, ['edges', 'edge_mesh', 'edge_curve', 'baked_edges']))
+        self.edge_objects = {}
+        if grid_settings.edge_mode == 'INSTANCED':
+            # Every edge object points at this one curve, so thickness is a single write
+            self.edge_curve = new_edge_curve(grid_settings.base_edge_size * scale_factor)
+            registry.set_member(self.grid, 'edge_curve', self.edge_curve)
 
-            # Aristas horizontales (Y) en los planos Z = 0 y Z = subdivisions
-            for z in [0, grid_settings.subdivisions]:
-                for x in range(grid_settings.subdivisions + 1):
-                    for y in range(grid_settings.subdivisions):
-                        self.create_edge_by_coords(x, y, z, x, y+1, z, grid_settings, scale_factor)
-        elif grid_settings.grid_type in ['EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2']:
-            corners = [
-                (0, 0, 0),
-                (grid_settings.subdivisions, 0, 0),
-                (0, grid_settings.subdivisions, 0),
-                (grid_settings.subdivisions, 0, grid_settings.subdivisions) if grid_settings.grid_type == 'EXTERIOR_EDGES_2' else (0, 0, grid_settings.subdivisions)
-            ]
-            
-            edges = [
-                (0, 1),  # X-axis
-                (0, 2),  # Y-axis
-                (0, 3) if grid_settings.grid_type == 'EXTERIOR_EDGES_1' else (1, 3)  # Z-axis
-            ]
-            
-            for edge in edges:
-                start = corners[edge[0]]
-                end = corners[edge[1]]
-                start_obj = bpy.data.objects.get(f"GridNode_{edge[0]}")
-                end_obj = bpy.data.objects.get(f"GridNode_{edge[1]}")
-                
-                if start_obj and end_obj:
-                    self.create_edge(start_obj, end_obj, grid_settings, scale_factor)
-                else:
-                    print(f"Error: Cannot find start or end object for edge {edge}. Start: {start_obj}, End: {end_obj}")
-                
-                prev_node = start_obj
-                for i in range(1, grid_settings.subdivisions):
-                    t = i / grid_settings.subdivisions
-                    location = mathutils.Vector(start).lerp(mathutils.Vector(end), t)
-                    sub_node = bpy.data.objects.get(f"GridNode_sub_{edge[0]}_{edge[1]}_{i}")
-                    if sub_node:
-                        if prev_node:
-                            self.create_edge(prev_node, sub_node, grid_settings, scale_factor)
-                        else:
-                            print(f"Error: Previous node not found for subdivision {i}")
-                        prev_node = sub_node
-                    else:
-                        print(f"Error: Subdivision node not found for edge {edge}, subdivision {i}")
-                
-                if prev_node and end_obj:
-                    self.create_edge(prev_node, end_obj, grid_settings, scale_factor)
-                else:
-                    print(f"Error: Cannot create last edge segment. Prev node: {prev_node}, End: {end_obj}")
-        elif grid_settings.grid_type == '2D_GRID':
-            # Crear aristas horizontales
-            for y in [0, grid_settings.subdivisions]:
-                for x in range(grid_settings.subdivisions):
-                    self.create_edge_by_coords(x, y, 0, x+1, y, 0, grid_settings, scale_factor)
+        # Endpoints come straight from the lattice instead of name lookups on node objects
+        with self.profile.phase("layout"):
+            lattice = lattice_for_settings(snapshot)
+            topology = edge_topology(lattice)
+        counts = edge_counts(topology)
+        for axis in AXIS_NAMES:
+            self.profile.count(f"edges_{axis.lower()}", counts[axis])
+        self.profile.count("edges", counts['total'])
 
-            # Crear aristas verticales
-            for x in [0, grid_settings.subdivisions]:
-                for y in range(grid_settings.subdivisions):
-                    self.create_edge_by_coords(x, y, 0, x, y+1, 0, grid_settings, scale_factor)
+        with self.profile.phase("edges"):
+            if grid_settings.edge_mode == 'MESH':
+                # Only edge endpoints become vertices, interior 2D nodes would turn into skin blobs
+                rows, edges = used_rows(topology)
+                if len(edges):
+                    edge_mesh = build_edge_mesh(lattice.coords[rows], edges,
+                                                grid_settings.base_edge_size * scale_factor,
+                                                self.grid)
+                    registry.set_member(self.grid, 'edge_mesh', edge_mesh)
+            else:
+                self.coords = lattice.coords.tolist()
+                self.indices = lattice.indices.tolist()
+                self.names = node_names(lattice)
+                for start_row, end_row in topology.rows.tolist():
+                    self.create_edge(start_row, end_row, grid_settings, scale_factor)
+        registry.register_map(self.grid, 'edges', self.edge_objects)
 
         return {'FINISHED'}
-
-    def create_edge_by_coords(self, x1, y1, z1, x2, y2, z2, grid_settings, scale_factor):
-        start_obj = bpy.data.objects.get(f"GridNode_{x1}_{y1}_{z1}")
-        end_obj = bpy.data.objects.get(f"GridNode_{x2}_{y2}_{z2}")
-        if start_obj and end_obj:
-            self.create_edge(start_obj, end_obj, grid_settings, scale_factor)
-        else:
-            print(f"Error: Cannot find objects for edge ({x1},{y1},{z1}) to ({x2},{y2},{z2})")
\ No newline at end of file
@@ -0,0 +1,20 @@
+import bpy
+
+from ..core import registry
+from ..core.teardown import format_freed
+
+class DeleteGridOperator(bpy.types.Operator):
+    bl_idname = "object.delete_grid"
+    bl_label = "Delete Grid"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        grid = registry.get_active_grid(context.scene)
+        if grid is None:
+            self.report({'ERROR'}, "No grid found.")
+            return {'CANCELLED'}
+
+        # Objects, their curves and meshes, the shared label data and the collection go in one batch
+        freed = registry.delete_grid(grid)
+        self.report({'INFO'}, format_freed(freed))
+        return {'FINISHED'}
@@ -0,0 +1,56 @@
+import bpy
+import numpy as np
+
+from ..core import registry
+from ..core.bounds import FIT_TYPES, fit_settings, selection_bounds
+from ..core.profiling import profile_for
+
+class FitGridToSelectionOperator(bpy.types.Operator):
+    bl_idname = "object.fit_grid_to_selection"
+    bl_label = "Fit Grid to Selection"
+    bl_description = "Set the unit, distances and origin so the grid spans the selected objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        with profile_for(self, context.scene.grid_settings) as profile:
+            self.profile = profile
+            result = self.fit(context)
+        return result
+
+    def fit(self, context):
+        grid_settings = context.scene.grid_settings
+        # Objects of a grid never count, the grid would otherwise fit itself
+        objects = [obj for obj in context.selected_objects
+                   if obj.type in FIT_TYPES and not any(registry.is_grid(coll) for coll in obj.users_collection)]
+        if not objects:
+            self.report({'ERROR'}, "Select the meshes, point clouds or volumes to fit the grid to.")
+            return {'CANCELLED'}
+
+        with self.profile.phase("bounds"):
+            bounds = selection_bounds(objects, context.evaluated_depsgraph_get())
+        if bounds is None:
+            self.report({'ERROR'}, "The selected objects have no geometry.")
+            return {'CANCELLED'}
+        lower, upper, points = bounds
+        self.profile.count("objects", len(objects))
+        self.profile.count("points", points)
+
+        # The fit is measured in the space of the grid root, which may be turned and scaled by hand
+        grid = registry.get_active_grid(context.scene)
+        root = registry.get_member(grid, 'root') if grid is not None else None
+        linear = np.array(root.matrix_world, dtype=np.float64)[:3, :3] if root is not None else None
+        fitted, clamped = fit_settings(lower, upper, registry.snapshot_settings(grid_settings), linear)
+        for key, value in fitted.items():
+            setattr(grid_settings, key, value)
+
+        distances = " x ".join(f"{fitted[key]:g}" for key in ('distance_x', 'distance_y', 'distance_z') if key in fitted)
+        message = f"Fitted the grid to {len(objects)} objects: {distances} {fitted['unit_measure']}"
+        if grid is not None and grid_settings.generation_mode != 'GEOMETRY_NODES':
+            message += ". Generate nodes to rebuild the grid"
+        if clamped:
+            axes = ", ".join(name[-1].upper() for name in clamped)
+            self.report({'WARNING'}, f"{message}. The selection is larger than the largest distance along {axes}, "
+                                     f"the grid does not cover it there")
+        else:
+            self.report({'INFO'}, message)
+        return {'FINISHED'}
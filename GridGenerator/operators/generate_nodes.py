@@ -1,31 +1,226 @@
+from collections import Counter
+from types import SimpleNamespace
+
 import bpy
-import mathutils
-import math
+import numpy as np
+
+from ..core import registry
+from ..core.animation import bind_active_grid
+from ..core.billboard import build_billboard
+from ..core.grid_cache import cache_directory, cache_key, cache_limit, cache_path, load_grid, store_grid
+from ..core.labels import (
+    LabelDataCache,
+    build_labels,
+    evict_label_cache,
+    label_axes,
+    label_locations,
+    label_mask,
+    label_texts,
+)
+from ..core.lattice import index_lookup, lattice_for_settings, node_names, unit_scale_factor
+from ..core.node_cloud import build_node_cloud
+from ..core.preflight import NODE_PARTS, PARTS, enforce_budget
+from ..core.procedural import build_procedural_grid
+from ..core.profiling import profile_for
+from ..core.teardown import format_freed
+
+# Settings that must match the previous build for it to be updated in place
+INCREMENTAL_KEYS = (
+    'generation_mode',
+    'node_mode',
+    'grid_type',
+    'grid_2d_orientation',
+    'show_numbers',
+    'unit_measure',
+    'base_text_size',
+    'use_custom_font',
+    'custom_font',
+    'label_facing',
+)
+
+# Members that make up billboarded labels
+BILLBOARD_ROLES = ['billboard', 'glyphs', 'glyph_collection']
+EDGE_ROLES = ['edges', 'edge_mesh', 'edge_curve', 'baked_edges']
 
 class GenerateNodesOperator(bpy.types.Operator):
     bl_idname = "object.generate_nodes"
     bl_label = "Generate Nodes"
     bl_options = {'REGISTER', 'UNDO'}
 
+    def label_layout(self, lattice, grid_settings, camera_location=None):
+        # {lattice key: (row, text, location)} for every labelled node
+        mask = label_mask(lattice, grid_settings, camera_location)
+        rows, texts = [], []
+        for row, text in label_texts(lattice, grid_settings, mask):
+            rows.append(row)
+            texts.append(text)
+        rows = np.array(rows, dtype=np.int64)
+        axes = label_axes(lattice, grid_settings)[rows]
+        locations = label_locations(lattice.coords[rows], axes, grid_settings).tolist()
+        return {
+            registry.grid_key(lattice.indices[row]): (row, text, tuple(location))
+            for row, text, location in zip(rows.tolist(), texts, locations)
+        }
+
+    def moved_rows(self, lattice, previous_lattice):
+        if previous_lattice is None:
+            return np.ones(len(lattice.coords), dtype=bool)
+        previous_lookup = index_lookup(previous_lattice)
+        previous_rows = np.array([previous_lookup.get(index, -1) for index in map(tuple, lattice.indices.tolist())],
+                                 dtype=np.int64)
+        moved = previous_rows < 0
+        kept = ~moved
+        delta = previous_lattice.coords[previous_rows[kept]] - lattice.coords[kept]
+        moved[kept] = np.any(np.abs(delta) > 1e-12, axis=1)
+        return moved
+
+    def can_update(self, grid, grid_settings):
+        previous = registry.settings_snapshot(grid)
+        if not grid_settings.incremental_update or grid_settings.generation_mode != 'OBJECTS' or not previous:
+            return False
+        return all(previous.get(name) == getattr(grid_settings, name) for name in INCREMENTAL_KEYS)
+
+    def update_nodes(self, grid, lattice, keys, names, previous_lattice):
+        # Existing nodes are moved only if their position changed, missing ones are created
+        existing = registry.object_map(grid, 'nodes')
+        wanted = set(keys)
+        self.freed.update(registry.delete_objects([obj for key, obj in existing.items() if key not in wanted]))
+
+        moved = self.moved_rows(lattice, previous_lattice).tolist()
+        coords = lattice.coords.tolist()
+        nodes = {}
+        for row, key in enumerate(keys):
+            node = existing.get(key)
+            if node is None:
+                node = bpy.data.objects.new(names[row], None)
+                node.location = coords[row]
+                registry.link_object(grid, node)
+            elif moved[row]:
+                node.location = coords[row]
+            nodes[key] = node
+        registry.set_map(grid, 'nodes', nodes)
+
+    def update_labels(self, grid, lattice, names, grid_settings, previous, previous_lattice,
+                      camera, text_size):
+        # Label distances are measured in grid space
+        camera_location = registry.to_grid_space(grid, camera.matrix_world.translation) if camera is not None else None
+        layout = self.label_layout(lattice, grid_settings, camera_location)
+        self.profile.count("labels", len(layout))
+
+        font_path = None
+        if grid_settings.use_custom_font and grid_settings.custom_font:
+            font_path = grid_settings.custom_font
+        cache = LabelDataCache(grid, font_path)
+        # Labels of a 2D grid lie in its plane and never track the camera
+        if grid_settings.grid_type == '2D_GRID':
+            camera = None
+
+        if grid_settings.label_facing == 'BILLBOARD':
+            # The point mesh is written in one call, so it is simply rebuilt
+            self.freed.update(registry.delete_members(grid, BILLBOARD_ROLES))
+            build_billboard(grid, [text for _, text, _ in layout.values()],
+                            [location for _, _, location in layout.values()],
+                            lattice.indices[[row for row, _, _ in layout.values()]],
+                            text_size, cache, camera=camera)
+        else:
+            previous_layout = {}
+            if previous is not None:
+                previous_layout = self.label_layout(previous_lattice, previous, camera_location)
+            self.update_label_objects(grid, layout, previous_layout, names, cache, camera, text_size)
+        if cache.font_failed:
+            self.report({'WARNING'}, "Failed to load custom font. Using default.")
+
+        self.freed.update(evict_label_cache(grid))
+
+    def update_label_objects(self, grid, layout, previous_layout, names, cache, camera, text_size):
+        existing = registry.object_map(grid, 'labels')
+        self.freed.update(registry.delete_objects([obj for key, obj in existing.items() if key not in layout]))
+
+        # Only labels whose text or position changed are rewritten
+        labels = {}
+        pending = []
+        for key, (row, text, location) in layout.items():
+            obj = existing.get(key)
+            if obj is None:
+                pending.append((key, names[row] + "_text", text, location))
+                continue
+            old = previous_layout.get(key)
+            if old is None or old[1] != text:
+                obj.data = cache.curve(text)
+            if old is None or old[2] != location:
+                obj.location = location
+            labels[key] = obj
+
+        if pending:
+            created = build_labels(
+                grid,
+                [name for _, name, _, _ in pending],
+                [text for _, _, text, _ in pending],
+                [location for _, _, _, location in pending],
+                text_size,
+                cache,
+                camera=camera
+            )
+            labels.update((item[0], obj) for item, obj in zip(pending, created))
+        else:
+            cache.store()
+
+        registry.set_map(grid, 'labels', labels)
+
     def execute(self, context):
+        self.freed = Counter()
+        with profile_for(self, context.scene.grid_settings) as profile:
+            self.profile = profile
+            result = self.generate(context)
+            if result == {'FINISHED'} and self.cache_path:
+                self.store_in_cache(context.scene)
+            profile.add_freed(self.freed)
+
+        if result == {'FINISHED'}:
+            bind_active_grid(context.scene)
+            message = profile.summary()
+            if self.freed:
+                message += f". {format_freed(self.freed)}"
+            self.report({'INFO'}, message)
+        return result
+
+    def load_from_cache(self, scene, grid, camera, built_with):
+        grid_settings = scene.grid_settings
+        with self.profile.phase("cache"):
+            path = cache_path(cache_directory(grid_settings.grid_cache_directory),
+                              cache_key(registry.snapshot_settings(grid_settings), 'nodes',
+                                        camera.matrix_world.translation))
+            cached = load_grid(path, scene, camera)
+            if cached is None:
+                self.cache_path = path
+                return False
+            # Settings the hash ignores, such as the origin, are taken from the scene
+            registry.store_settings(cached, grid_settings)
+            if grid is not None:
+                name = grid.name
+                registry.copy_placement(grid, cached)
+                registry.update_root(cached, built_with, registry.settings_snapshot(cached))
+                self.freed.update(registry.delete_grid(grid))
+                cached.name = name
+            else:
+                registry.update_root(cached, {}, registry.settings_snapshot(cached))
+            grid_settings.active_grid = cached
+        self.profile.count("cache_hits")
+        return True
+
+    def store_in_cache(self, scene):
+        grid = registry.get_active_grid(scene)
+        # Edges kept from an earlier build do not belong to this settings hash
+        if grid is None or registry.members(grid, EDGE_ROLES):
+            return
+        with self.profile.phase("cache"):
+            store_grid(grid, self.cache_path, cache_limit(scene.grid_settings))
+
+    def generate(self, context):
         scene = context.scene
         grid_settings = scene.grid_settings
 
-        scale_factor = {
-            'nm': 1e-9,
-            'µm': 1e-6,
-            'mm': 0.001,
-            'cm': 0.01,
-            'dm': 0.1,
-            'm': 1,
-            'dam': 10,
-            'hm': 100,
-            'km': 1000
-        }.get(grid_settings.unit_measure, 1)
-
-        dist_x = grid_settings.distance_x * scale_factor
-        dist_y = grid_settings.distance_y * scale_factor
-        dist_z = grid_settings.distance_z * scale_factor
+        scale_factor = unit_scale_factor(grid_settings.unit_measure)
 
         # Ajustar el tamaño del texto basado en la unidad de medida
         adjusted_text_size = grid_settings.base_text_size * scale_factor
@@ -38,282 +233,72 @@ class GenerateNodesOperator(bpy.types.Operator):
                 align='VIEW', location=(0, -10, 5), rotation=(0, 0, 0))
             camera = bpy.context.object
 
-        # Remove only objects related to the previous grid, but keep edges for EXTERIOR_EDGES_1 and EXTERIOR_EDGES_2
-        bpy.ops.object.select_all(action='DESELECT')
-        for obj in bpy.context.scene.objects:
-            if obj.name.startswith("GridNode_") or obj.name.startswith("GridNode_text_"):
-                obj.select_set(True)
-            elif obj.name.startswith("EdgeObj_") and grid_settings.grid_type == 'CUBIC_INTERNAL_EDGES':
-                obj.select_set(True)
-        bpy.ops.object.delete()
-
-        text_objects = []
-
-        def create_node(location, name):
-            empty = bpy.data.objects.new(name, None)
-            empty.location = location
-            bpy.context.collection.objects.link(empty)
-            return empty
-
-        def create_text(location, name, text, axis):
-            if grid_settings.show_numbers:
-                bpy.ops.object.text_add(location=location)
-                text_obj = bpy.context.object
-                text_obj.name = name
-                text_obj.data.body = text
-                text_obj.data.align_x = 'CENTER'
-                text_obj.data.align_y = 'CENTER'
-                text_obj.scale = (adjusted_text_size,) * 3
-                if grid_settings.use_custom_font and grid_settings.custom_font:
-                    try:
-                        font = bpy.data.fonts.load(grid_settings.custom_font)
-                        text_obj.data.font = font
-                    except:
-                        self.report({'WARNING'}, "Failed to load custom font. Using default.")
-                
-                # Aplicar tracking a la cámara solo si no es un grid 2D
-                if grid_settings.grid_type != '2D_GRID':
-                    constraint = text_obj.constraints.new(type='TRACK_TO')
-                    constraint.target = camera
-                    constraint.track_axis = 'TRACK_Z'
-                    constraint.up_axis = 'UP_Y'
-                
-                apply_text_offset(location, text_obj, axis)
-                text_objects.append(text_obj)
-                
-                print(f"Created text '{text}' for axis {axis} at location {location}")
-                print(f"Final text location: {text_obj.location}")
-            return text_obj if grid_settings.show_numbers else None
-
-        def apply_text_offset(node_location, text_obj, axis):
-            offset = getattr(grid_settings, f"text_offset_{axis.lower()}")
-            direction = getattr(grid_settings, f"text_direction_{axis.lower()}")
-            
-            offset_vector = mathutils.Vector((0, 0, 0))
-            if direction == 'X':
-                offset_vector.x = offset
-            elif direction == '-X':
-                offset_vector.x = -offset
-            elif direction == 'Y':
-                offset_vector.y = offset
-            elif direction == '-Y':
-                offset_vector.y = -offset
-            elif direction == 'Z':
-                offset_vector.z = offset
-            elif direction == '-Z':
-                offset_vector.z = -offset
-            
-            text_obj.location = node_location + offset_vector
-            
-            print(f"Applying offset for axis {axis}: direction {direction}, offset {offset}")
-            print(f"Offset vector: {offset_vector}")
-            print(f"Final text location: {text_obj.location}")
-
-        if grid_settings.grid_type == 'CUBIC_INTERNAL_EDGES':
-            for z in range(grid_settings.subdivisions + 1):
-                for y in range(grid_settings.subdivisions + 1):
-                    for x in range(grid_settings.subdivisions + 1):
-                        location = mathutils.Vector((
-                            x * dist_x / grid_settings.subdivisions,
-                            y * dist_y / grid_settings.subdivisions,
-                            z * dist_z / grid_settings.subdivisions
-                        ))
-                        
-                        node_name = f"GridNode_{x}_{y}_{z}"
-                        create_node(location, node_name)
-                        
-                        if grid_settings.show_numbers:
-                            text = f"{location.x:.2f},{location.y:.2f},{location.z:.2f}"
-                            if x == grid_settings.subdivisions:
-                                axis = 'X'
-                            elif y == grid_settings.subdivisions:
-                                axis = 'Y'
-                            elif z == grid_settings.subdivisions:
-                                axis = 'Z'
-                            else:
-                                axis = 'X'  # Default for internal nodes
-                            create_text(location, node_name + "_text", text, axis)
-
-        elif grid_settings.grid_type == 'CUBIC_EXTERIOR':
-            for z in [0, grid_settings.subdivisions]:
-                for y in range(grid_settings.subdivisions + 1):
-                    for x in range(grid_settings.subdivisions + 1):
-                        location = mathutils.Vector((
-                            x * dist_x / grid_settings.subdivisions,
-                            y * dist_y / grid_settings.subdivisions,
-                            z * dist_z / grid_settings.subdivisions
-                        ))
-                        
-                        node_name = f"GridNode_{x}_{y}_{z}"
-                        create_node(location, node_name)
-                        
-                        if grid_settings.show_numbers:
-                            text = f"{location.x:.2f},{location.y:.2f},{location.z:.2f}"
-                            if x == grid_settings.subdivisions:
-                                axis = 'X'
-                            elif y == grid_settings.subdivisions:
-                                axis = 'Y'
-                            else:
-                                axis = 'Z'
-                            create_text(location, node_name + "_text", text, axis)
-
-            for y in [0, grid_settings.subdivisions]:
-                for z in range(1, grid_settings.subdivisions):
-                    for x in range(grid_settings.subdivisions + 1):
-                        location = mathutils.Vector((
-                            x * dist_x / grid_settings.subdivisions,
-                            y * dist_y / grid_settings.subdivisions,
-                            z * dist_z / grid_settings.subdivisions
-                        ))
-                        
-                        node_name = f"GridNode_{x}_{y}_{z}"
-                        create_node(location, node_name)
-                        
-                        if grid_settings.show_numbers:
-                            text = f"{location.x:.2f},{location.y:.2f},{location.z:.2f}"
-                            if x == grid_settings.subdivisions:
-                                axis = 'X'
-                            else:
-                                axis = 'Y'
-                            create_text(location, node_name + "_text", text, axis)
-
-            for x in [0, grid_settings.subdivisions]:
-                for z in range(1, grid_settings.subdivisions):
-                    for y in range(1, grid_settings.subdivisions):
-                        location = mathutils.Vector((
-                            x * dist_x / grid_settings.subdivisions,
-                            y * dist_y / grid_settings.subdivisions,
-                            z * dist_z / grid_settings.subdivisions
-                        ))
-                        
-                        node_name = f"GridNode_{x}_{y}_{z}"
-                        create_node(location, node_name)
-                        
-                        if grid_settings.show_numbers:
-                            text = f"{location.x:.2f},{location.y:.2f},{location.z:.2f}"
-                            axis = 'X'
-                            create_text(location, node_name + "_text", text, axis)
-
-        elif grid_settings.grid_type in ['EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2']:
-            corners = [
-                (0, 0, 0),
-                (grid_settings.subdivisions, 0, 0),
-                (0, grid_settings.subdivisions, 0),
-                (grid_settings.subdivisions, 0, grid_settings.subdivisions) if grid_settings.grid_type == 'EXTERIOR_EDGES_2' else (0, 0, grid_settings.subdivisions)
-            ]
-            
-            for i, (x, y, z) in enumerate(corners):
-                location = mathutils.Vector((
-                    x * dist_x / grid_settings.subdivisions,
-                    y * dist_y / grid_settings.subdivisions,
-                    z * dist_z / grid_settings.subdivisions
-                ))
-                node_name = f"GridNode_{i}"
-                create_node(location, node_name)
-                
-                if grid_settings.show_numbers:
-                    coord_x = x * grid_settings.distance_x / grid_settings.subdivisions
-                    coord_y = y * grid_settings.distance_y / grid_settings.subdivisions
-                    coord_z = z * grid_settings.distance_z / grid_settings.subdivisions
-                    
-                    if x == grid_settings.subdivisions and z == 0:
-                        text = f"{coord_x:.2f}"
-                        axis = 'X'
-                    elif y == grid_settings.subdivisions:
-                        text = f"{coord_y:.2f}"
-                        axis = 'Y'
-                    elif z == grid_settings.subdivisions:
-                        text = f"{coord_z:.2f}"
-                        axis = 'Z'
-                    else:
-                        text = "0.00"
-                        axis = 'X'  # Valor predeterminado para el origen
-                    
-                    create_text(location, node_name + "_text", text, axis)
-            
-            # Generate subdivision nodes
-            edges = [
-                (0, 1),  # X-axis
-                (0, 2),  # Y-axis
-                (0, 3) if grid_settings.grid_type == 'EXTERIOR_EDGES_1' else (1, 3)  # Z-axis
-            ]
-            for edge in edges:
-                start = corners[edge[0]]
-                end = corners[edge[1]]
-                for i in range(1, grid_settings.subdivisions):
-                    t = i / grid_settings.subdivisions
-                    x = int(start[0] + t * (end[0] - start[0]))
-                    y = int(start[1] + t * (end[1] - start[1]))
-                    z = int(start[2] + t * (end[2] - start[2]))
-                    location = mathutils.Vector((
-                        x * dist_x / grid_settings.subdivisions,
-                        y * dist_y / grid_settings.subdivisions,
-                        z * dist_z / grid_settings.subdivisions
-                    ))
-                    
-                    node_name = f"GridNode_sub_{edge[0]}_{edge[1]}_{i}"
-                    create_node(location, node_name)
-                    
-                    if grid_settings.show_numbers:
-                        if end[0] > start[0]:  # X-axis
-                            coord = x * grid_settings.distance_x / grid_settings.subdivisions
-                            axis = 'X'
-                        elif end[1] > start[1]:  # Y-axis
-                            coord = y * grid_settings.distance_y / grid_settings.subdivisions
-                            axis = 'Y'
-                        else:  # Z-axis
-                            coord = z * grid_settings.distance_z / grid_settings.subdivisions
-                            axis = 'Z'
-                        text = f"{coord:.2f}"
-                        create_text(location, node_name + "_text", text, axis)
-
-        elif grid_settings.grid_type == '2D_GRID':
-            orientation = grid_settings.grid_2d_orientation
-            rotation_matrix = mathutils.Matrix.Identity(3)
-            if orientation == 'XZ':
-                rotation_matrix = mathutils.Matrix.Rotation(math.radians(90), 3, 'X')
-            elif orientation == 'YZ':
-                rotation_matrix = mathutils.Matrix.Rotation(math.radians(90), 3, 'Y')
-            elif orientation == '-XY':
-                rotation_matrix = mathutils.Matrix.Rotation(math.radians(180), 3, 'X')
-            elif orientation == '-XZ':
-                rotation_matrix = mathutils.Matrix.Rotation(math.radians(-90), 3, 'X')
-            elif orientation == '-YZ':
-                rotation_matrix = mathutils.Matrix.Rotation(math.radians(-90), 3, 'Y')
-
-            for y in range(grid_settings.subdivisions + 1):
-                for x in range(grid_settings.subdivisions + 1):
-                    original_location = mathutils.Vector((
-                        x * dist_x / grid_settings.subdivisions,
-                        y * dist_y / grid_settings.subdivisions,
-                        0
-                    ))
-                    location = rotation_matrix @ original_location
-                    
-                    node_name = f"GridNode_{x}_{y}_0"
-                    node = create_node(location, node_name)
-                    node.rotation_euler = rotation_matrix.to_euler()
-                    
-                    if grid_settings.show_numbers:
-                        show_x = grid_settings.length_axis_2d in ['X', 'BOTH']
-                        show_y = grid_settings.length_axis_2d in ['Y', 'BOTH']
-                        
-                        if (x == 0 and show_y) or (y == 0 and show_x):
-                            coord_x = x * grid_settings.distance_x / grid_settings.subdivisions
-                            coord_y = y * grid_settings.distance_y / grid_settings.subdivisions
-                            
-                            if x == 0 and y == 0:
-                                text = "0.00, 0.00" if grid_settings.length_axis_2d == 'BOTH' else "0.00"
-                                axis = 'X'
-                            elif x == 0 and show_y:
-                                text = f"{coord_y:.2f}"
-                                axis = 'Y'
-                            elif y == 0 and show_x:
-                                text = f"{coord_x:.2f}"
-                                axis = 'X'
-                            
-                            text_obj = create_text(location, node_name + "_text", text, axis)
-                            if text_obj:
-                                text_obj.rotation_euler = rotation_matrix.to_euler()
-
-        return {'FINISHED'}
\ No newline at end of file
+        grid = registry.get_active_grid(scene)
+        built_with = registry.settings_snapshot(grid) if grid is not None else {}
+        self.cache_path = None
+
+        # Procedural grids build their edges along with the nodes
+        parts = PARTS if grid_settings.generation_mode == 'GEOMETRY_NODES' else NODE_PARTS
+        camera_location = camera.matrix_world.translation
+        if grid is not None:
+            camera_location = registry.to_grid_space(grid, camera_location)
+        with self.profile.phase("preflight"):
+            allowed = enforce_budget(self, grid_settings, registry.snapshot_settings(grid_settings), parts,
+                                     camera_location)
+        if not allowed:
+            return {'CANCELLED'}
+        if grid is None:
+            # A grid built before the registry is replaced, as it was on every generate then
+            with self.profile.phase("deletion"):
+                self.freed.update(registry.delete_objects(registry.baseline_objects(scene)))
+        if grid_settings.use_grid_cache and self.load_from_cache(scene, grid, camera, built_with):
+            return {'FINISHED'}
+
+        previous = None
+        with self.profile.phase("deletion"):
+            if grid is None:
+                grid = registry.create_grid(scene)
+            elif self.can_update(grid, grid_settings):
+                # Reuse the previous build: only the point cloud, written in one call, is rebuilt
+                previous = SimpleNamespace(**registry.settings_snapshot(grid))
+                roles = ['cloud']
+                if grid_settings.grid_type == 'CUBIC_INTERNAL_EDGES':
+                    roles += EDGE_ROLES
+                self.freed.update(registry.delete_members(grid, roles))
+            else:
+                # Remove only the objects of the previous grid. Edges are kept, except for
+                # CUBIC_INTERNAL_EDGES and procedural grids
+                roles = ['nodes', 'labels', 'cloud', 'procedural'] + BILLBOARD_ROLES
+                if grid_settings.grid_type == 'CUBIC_INTERNAL_EDGES' or grid_settings.generation_mode == 'GEOMETRY_NODES':
+                    roles += EDGE_ROLES
+                self.freed.update(registry.delete_members(grid, roles))
+                self.freed.update(evict_label_cache(grid))
+        registry.store_settings(grid, grid_settings)
+        registry.update_root(grid, built_with, registry.settings_snapshot(grid))
+
+        if grid_settings.generation_mode == 'GEOMETRY_NODES':
+            with self.profile.phase("procedural"):
+                build_procedural_grid(grid, grid_settings, camera)
+            return {'FINISHED'}
+
+        with self.profile.phase("layout"):
+            lattice = lattice_for_settings(registry.settings_snapshot(grid))
+            previous_lattice = lattice_for_settings(vars(previous)) if previous is not None else None
+            keys = [registry.grid_key(index) for index in lattice.indices.tolist()]
+            names = node_names(lattice)
+        self.profile.count("lattice_nodes", len(keys))
+
+        with self.profile.phase("nodes"):
+            if grid_settings.node_mode == 'POINT_CLOUD':
+                cloud = build_node_cloud(lattice, grid, grid_settings.node_marker,
+                                         grid_settings.node_marker_size * scale_factor)
+                registry.set_member(grid, 'cloud', cloud)
+            else:
+                self.update_nodes(grid, lattice, keys, names, previous_lattice)
+
+        if grid_settings.show_numbers:
+            with self.profile.phase("labels"):
+                self.update_labels(grid, lattice, names, grid_settings, previous, previous_lattice,
+                                   camera, adjusted_text_size)
+
+        return {'FINISHED'}
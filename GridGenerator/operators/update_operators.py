@@ -1,5 +1,13 @@
 import bpy
 
+from ..core import registry
+from ..core.billboard import set_billboard_text_size
+from ..core.edge_mesh import set_skin_radius
+from ..core.lattice import unit_scale_factor
+from ..core.materials import assign_material, grid_material, grid_surfaces
+from ..core.procedural import sync_procedural_grid
+from ..core.profiling import profile_for
+
 class UpdateTextSizeOperator(bpy.types.Operator):
     bl_idname = "object.update_text_size"
     bl_label = "Update Text Size"
@@ -8,22 +16,19 @@ class UpdateTextSizeOperator(bpy.types.Operator):
     def execute(self, context):
         scene = context.scene
         grid_settings = scene.grid_settings
-        scale_factor = {
-            'nm': 1e-9,
-            'µm': 1e-6,
-            'mm': 0.001,
-            'cm': 0.01,
-            'dm': 0.1,
-            'm': 1,
-            'dam': 10,
-            'hm': 100,
-            'km': 1000
-        }.get(grid_settings.unit_measure, 1)
+        grid = registry.get_active_grid(scene)
+        if grid is None:
+            self.report({'ERROR'}, "No grid found. Generate nodes first.")
+            return {'CANCELLED'}
+
+        scale_factor = unit_scale_factor(grid_settings.unit_measure)
         adjusted_text_size = grid_settings.base_text_size * scale_factor
 
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'FONT':
-                obj.scale = (adjusted_text_size,) * 3
+        scale = (adjusted_text_size,) * 3
+        for obj in registry.object_map(grid, 'labels').values():
+            obj.scale = scale
+        set_billboard_text_size(grid, adjusted_text_size)
+        sync_procedural_grid(scene)
 
         return {'FINISHED'}
 
@@ -35,22 +40,25 @@ class UpdateEdgeSizeOperator(bpy.types.Operator):
     def execute(self, context):
         scene = context.scene
         grid_settings = scene.grid_settings
-        scale_factor = {
-            'nm': 1e-9,
-            'µm': 1e-6,
-            'mm': 0.001,
-            'cm': 0.01,
-            'dm': 0.1,
-            'm': 1,
-            'dam': 10,
-            'hm': 100,
-            'km': 1000
-        }.get(grid_settings.unit_measure, 1)
+        grid = registry.get_active_grid(scene)
+        if grid is None:
+            self.report({'ERROR'}, "No grid found. Generate nodes first.")
+            return {'CANCELLED'}
+
+        scale_factor = unit_scale_factor(grid_settings.unit_measure)
         adjusted_edge_size = grid_settings.base_edge_size * scale_factor
 
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'CURVE' and obj.name.startswith("EdgeObj_"):
+        edge_curve = registry.get_member(grid, 'edge_curve')
+        if edge_curve is not None:
+            # Instanced edges share one curve
+            edge_curve.bevel_depth = adjusted_edge_size
+        else:
+            for obj in registry.object_map(grid, 'edges').values():
                 obj.data.bevel_depth = adjusted_edge_size
+        edge_mesh = registry.get_member(grid, 'edge_mesh')
+        if edge_mesh is not None:
+            set_skin_radius(edge_mesh.data, adjusted_edge_size)
+        sync_procedural_grid(scene)
 
         return {'FINISHED'}
 
@@ -62,34 +70,16 @@ class ApplyEmissiveMaterialOperator(bpy.types.Operator):
     def execute(self, context):
         scene = context.scene
         grid_settings = scene.grid_settings
+        grid = registry.get_active_grid(scene)
+        if grid is None:
+            self.report({'ERROR'}, "No grid found. Generate nodes first.")
+            return {'CANCELLED'}
 
-        # Create a new emissive material
-        mat = bpy.data.materials.new(name="Emissive Material")
-        mat.use_nodes = True
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
-
-        # Clear existing nodes
-        nodes.clear()
-
-        # Create necessary nodes
-        node_emission = nodes.new(type='ShaderNodeEmission')
-        node_output = nodes.new(type='ShaderNodeOutputMaterial')
-
-        # Configure emission node
-        node_emission.inputs['Color'].default_value = grid_settings.emission_color
-        node_emission.inputs['Strength'].default_value = grid_settings.emission_strength
-
-        # Connect nodes
-        links.new(node_emission.outputs['Emission'], node_output.inputs['Surface'])
+        # Reuse the grid material, only its emission values are updated
+        mat = grid_material(grid, grid_settings.emission_color, grid_settings.emission_strength)
 
         # Apply material to edges and numbers
-        for obj in bpy.context.scene.objects:
-            if obj.type in ['CURVE', 'FONT']:
-                if obj.data.materials:
-                    obj.data.materials[0] = mat
-                else:
-                    obj.data.materials.append(mat)
+        assign_material(grid_surfaces(grid), mat)
 
         return {'FINISHED'}
 
@@ -99,35 +89,21 @@ class ResizeSceneOperator(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
+        with profile_for(self, context.scene.grid_settings) as profile:
+            with profile.phase("resize"):
+                return self.resize(context)
+
+    def resize(self, context):
         scene = context.scene
         grid_settings = scene.grid_settings
+        grid = registry.get_active_grid(scene)
+        if grid is None:
+            self.report({'ERROR'}, "No grid found. Generate nodes first.")
+            return {'CANCELLED'}
 
-        scale_factor = {
-            'nm': 1e-9,
-            'µm': 1e-6,
-            'mm': 0.001,
-            'cm': 0.01,
-            'dm': 0.1,
-            'm': 1,
-            'dam': 10,
-            'hm': 100,
-            'km': 1000
-        }.get(grid_settings.unit_measure, 1)
-
-        target_scale_factor = {
-            'nm': 1e-9,
-            'µm': 1e-6,
-            'mm': 0.001,
-            'cm': 0.01,
-            'dm': 0.1,
-            'm': 1,
-            'dam': 10,
-            'hm': 100,
-            'km': 1000
-        }.get(grid_settings.target_unit_measure, 1)
-
-        # Calculate the scale factor between current and target units
-        relative_scale = target_scale_factor / scale_factor
+        # Scale between the unit the grid was built in and the target unit
+        built_unit = registry.settings_snapshot(grid).get('unit_measure', grid_settings.unit_measure)
+        relative_scale = unit_scale_factor(grid_settings.target_unit_measure) / unit_scale_factor(built_unit)
 
         # Update the scene unit scale
         scene.unit_settings.scale_length = grid_settings.unit_scale * relative_scale
@@ -143,17 +119,10 @@ class ResizeSceneOperator(bpy.types.Operator):
             scene.unit_settings.system = 'METRIC'
             scene.unit_settings.length_unit = 'KILOMETERS'
 
-        # Scale all objects in the scene
-        for obj in bpy.context.scene.objects:
-            obj.scale *= relative_scale
+        # The root carries the size of the whole grid: one write keeps every location
+        # and scale consistent, and regenerating keeps the size. The grid settings
+        # still describe the grid inside the root, in the unit it was built with.
+        registry.get_member(grid, 'root').scale = (relative_scale,) * 3
 
-        # Update grid settings
-        grid_settings.unit_measure = grid_settings.target_unit_measure
-        grid_settings.distance_x *= relative_scale
-        grid_settings.distance_y *= relative_scale
-        grid_settings.distance_z *= relative_scale
-        grid_settings.base_text_size *= relative_scale
-        grid_settings.base_edge_size *= relative_scale
-
-        self.report({'INFO'}, f"Scene resized to {grid_settings.target_unit_measure}")
-        return {'FINISHED'}
\ No newline at end of file
+        self.report({'INFO'}, f"Grid resized to {grid_settings.target_unit_measure}")
+        return {'FINISHED'}
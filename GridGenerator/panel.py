@@ -1,5 +1,13 @@
 import bpy
 
+from .core.lattice import SUBDIVISION_KEYS, axis_subdivisions
+from .core.preflight import cached_estimate, over_budget
+from .core.procedural import MAX_PROCEDURAL_LABELS, procedural_labels_shown
+from .core.profiling import last_profiles
+from .core.registry import get_active_grid, get_member, snapshot_settings
+
+LARGE_GRID_NODES = 10000
+
 class OBJECT_PT_GridGeneratorPanel(bpy.types.Panel):
     bl_label = "Grid Generator"
     bl_idname = "OBJECT_PT_grid_generator_panel"
@@ -15,16 +23,46 @@ class OBJECT_PT_GridGeneratorPanel(bpy.types.Panel):
         # Grid Type
         box = layout.box()
         box.label(text="Grid Type", icon='MESH_CUBE')
+        box.prop(grid_settings, "active_grid", text="Grid")
+        box.prop(grid_settings, "generation_mode", text="Mode")
+        if grid_settings.generation_mode == 'OBJECTS':
+            box.prop(grid_settings, "incremental_update")
         box.prop(grid_settings, "grid_type", text="Type")
 
         # Grid Settings
         box = layout.box()
         box.label(text="Grid Settings", icon='GRID')
         box.prop(grid_settings, "unit_measure", text="Unit of Measure")
+        grid = get_active_grid(scene)
+        root = get_member(grid, 'root') if grid is not None else None
+        if root is not None and tuple(root.scale) != (1.0, 1.0, 1.0):
+            # Resize Scene and hand scaling only write the root, the settings describe the grid inside it
+            scale = ", ".join(f"{value:g}" for value in dict.fromkeys(root.scale))
+            box.label(text=f"Grid root scaled by {scale}", icon='INFO')
         box.prop(grid_settings, "distance_x", text="Distance X")
         box.prop(grid_settings, "distance_y", text="Distance Y")
         box.prop(grid_settings, "distance_z", text="Distance Z")
-        box.prop(grid_settings, "subdivisions", text="Subdivisions")
+        box.prop(grid_settings, "grid_origin", text="Origin")
+        box.operator("object.fit_grid_to_selection", text="Fit to Selection", icon='SHADING_BBOX')
+        box.prop(grid_settings, "use_axis_subdivisions")
+        if grid_settings.use_axis_subdivisions:
+            row = box.row(align=True)
+            row.prop(grid_settings, "subdivisions_x", text="X")
+            row.prop(grid_settings, "subdivisions_y", text="Y")
+            row.prop(grid_settings, "subdivisions_z", text="Z")
+        else:
+            box.prop(grid_settings, "subdivisions", text="Subdivisions")
+        nx, ny, nz = axis_subdivisions({key: getattr(grid_settings, key) for key in SUBDIVISION_KEYS})
+        if (nx + 1) * (ny + 1) * (nz + 1) > LARGE_GRID_NODES and grid_settings.generation_mode == 'OBJECTS':
+            # Beyond this only the single-object backends stay responsive
+            if grid_settings.node_mode == 'EMPTIES' or grid_settings.edge_mode != 'MESH':
+                box.label(text="Large grid: use Point Cloud nodes and Single Mesh edges", icon='INFO')
+        box.prop(grid_settings, "node_mode", text="Nodes")
+        if grid_settings.node_mode == 'POINT_CLOUD':
+            row = box.row(align=True)
+            row.prop(grid_settings, "node_marker", text="")
+            if grid_settings.node_marker != 'NONE':
+                row.prop(grid_settings, "node_marker_size", text="Size")
 
         # Nuevas opciones para el grid 2D
         if grid_settings.grid_type == '2D_GRID':
@@ -37,6 +75,25 @@ class OBJECT_PT_GridGeneratorPanel(bpy.types.Panel):
         box = layout.box()
         box.label(text="Number Settings", icon='FONT_DATA')
         box.prop(grid_settings, "show_numbers", text="Show Numbers")
+        if (grid_settings.show_numbers and grid_settings.generation_mode == 'GEOMETRY_NODES'
+                and not procedural_labels_shown(grid_settings)):
+            box.label(text=f"Over {MAX_PROCEDURAL_LABELS} labels: procedural numbers are off", icon='INFO')
+        if grid_settings.show_numbers and grid_settings.generation_mode == 'OBJECTS':
+            box.prop(grid_settings, "label_facing", text="Facing")
+            box.prop(grid_settings, "label_lod", text="Detail")
+            if grid_settings.label_lod == 'EVERY_NTH':
+                box.prop(grid_settings, "label_stride", text="Every")
+            elif grid_settings.label_lod == 'DISTANCE':
+                box.prop(grid_settings, "label_distance", text="Distance")
+            elif grid_settings.label_lod == 'AXIS_TICKS':
+                # 2D grids have no Z ticks and no far side along Z
+                axes = "XY" if grid_settings.grid_type == '2D_GRID' else "XYZ"
+                for prop, text in (("tick_axes", "Axes"), ("tick_far_side", "Far Side")):
+                    row = box.row(align=True)
+                    row.label(text=f"{text}:")
+                    for index, axis in enumerate(axes):
+                        row.prop(grid_settings, prop, index=index, text=axis, toggle=True)
+                box.prop(grid_settings, "tick_interval", text="Every")
         box.prop(grid_settings, "text_size", text="Text Size")
         box.prop(grid_settings, "use_custom_font", text="Custom Font")
         if grid_settings.use_custom_font:
@@ -47,7 +104,13 @@ class OBJECT_PT_GridGeneratorPanel(bpy.types.Panel):
         # Edge Settings
         box = layout.box()
         box.label(text="Edge Settings", icon='MOD_WIREFRAME')
+        box.prop(grid_settings, "edge_mode", text="Mode")
         box.prop(grid_settings, "edge_size", text="Edge Thickness")
+        box.label(text="Bake:")
+        box.prop(grid_settings, "bake_mode", text="Mode")
+        if grid_settings.bake_mode == 'TUBES':
+            box.prop(grid_settings, "bake_resolution", text="Sides")
+        box.prop(grid_settings, "bake_polygon_budget", text="Polygon Budget")
 
         layout.separator()
 
@@ -67,6 +130,15 @@ class OBJECT_PT_GridGeneratorPanel(bpy.types.Panel):
 
         layout.separator()
 
+        # Animation
+        box = layout.box()
+        box.label(text="Animation", icon='ANIM')
+        box.prop(grid_settings, "animate_grid")
+        if grid_settings.animate_grid:
+            box.label(text="Keyframe the distances and unit scale", icon='KEYFRAME')
+
+        layout.separator()
+
         # Text Offset Settings
         box = layout.box()
         box.label(text="Text Offset Settings", icon='ALIGN_LEFT')
@@ -79,6 +151,27 @@ class OBJECT_PT_GridGeneratorPanel(bpy.types.Panel):
 
         layout.separator()
 
+        # Cost Estimate
+        box = layout.box()
+        box.label(text="Cost Estimate", icon='INFO')
+        estimate = cached_estimate(snapshot_settings(grid_settings))
+        cost = estimate.total()
+        col = box.column(align=True)
+        bound = "" if estimate.labels_exact else "at most "
+        col.label(text=f"{estimate.nodes} nodes, {estimate.edges} edges, {bound}{estimate.labels} labels")
+        col.label(text=f"{cost.objects} objects, {cost.datablocks} datablocks, {cost.vertices} vertices")
+        col.label(text=f"~{cost.memory / 1024 / 1024:.0f} MB, ~{cost.seconds:.1f} s")
+        for exceeded in over_budget(cost, grid_settings):
+            col.label(text=f"Over budget: {exceeded}", icon='ERROR')
+        box.prop(grid_settings, "budget_action")
+        if grid_settings.budget_action != 'OFF':
+            row = box.row(align=True)
+            row.prop(grid_settings, "budget_objects", text="Objects")
+            row.prop(grid_settings, "budget_memory", text="MB")
+            row.prop(grid_settings, "budget_seconds", text="Seconds")
+
+        layout.separator()
+
         # Operations
         box = layout.box()
         box.label(text="Operations", icon='TOOL_SETTINGS')
@@ -98,4 +191,40 @@ class OBJECT_PT_GridGeneratorPanel(bpy.types.Panel):
         row.operator("object.update_text_size",
                      text="Update Text Size", icon='FONT_DATA')
         row.operator("object.update_edge_size",
-                     text="Update Edge Size", icon='MOD_WIREFRAME')
\ No newline at end of file
+                     text="Update Edge Size", icon='MOD_WIREFRAME')
+
+        row = box.row(align=True)
+        row.operator("object.bake_edges", text="Bake Edges", icon='MESH_DATA')
+        row.operator("object.delete_grid", text="Delete Grid", icon='TRASH')
+
+        layout.separator()
+
+        # Grid Cache
+        box = layout.box()
+        box.label(text="Grid Cache", icon='FILE_CACHE')
+        box.prop(grid_settings, "use_grid_cache")
+        if grid_settings.use_grid_cache:
+            box.prop(grid_settings, "grid_cache_directory", text="")
+            box.prop(grid_settings, "grid_cache_size")
+            box.operator("object.clear_grid_cache", text="Clear Cache", icon='TRASH')
+
+        layout.separator()
+
+        # Profiling
+        box = layout.box()
+        box.label(text="Profiling", icon='TIME')
+        box.prop(grid_settings, "log_level", text="Log Level")
+        box.prop(grid_settings, "profile_capture")
+        box.prop(grid_settings, "write_profile_report")
+        if grid_settings.write_profile_report:
+            box.prop(grid_settings, "profile_report", text="")
+
+        for operation, profile in last_profiles.items():
+            col = box.column(align=True)
+            col.label(text=f"{operation}: {profile['total_seconds']:.3f} s")
+            for name, seconds in profile['phases'].items():
+                col.label(text=f"    {name}: {seconds:.3f} s")
+            for name, value in profile['counters'].items():
+                col.label(text=f"    {name.replace('_', ' ')}: {value}")
+            if profile['peak_memory_bytes'] is not None:
+                col.label(text=f"    peak memory: {profile['peak_memory_bytes'] / 1e6:.1f} MB")
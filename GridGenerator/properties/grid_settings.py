@@ -1,6 +1,32 @@
 import bpy
 
+from ..core.animation import bind_active_grid
+from ..core.procedural import sync_procedural_grid
+from ..core.registry import get_active_grid, get_member, is_grid
+
+
+def update_procedural_grid(self, context):
+    sync_procedural_grid(context.scene)
+
+
+def update_animate_grid(self, context):
+    bind_active_grid(context.scene)
+
+
+def update_grid_origin(self, context):
+    grid = get_active_grid(context.scene)
+    root = get_member(grid, 'root') if grid is not None else None
+    if root is not None:
+        root.location = self.grid_origin
+
+
 class GridSettings(bpy.types.PropertyGroup):
+    active_grid: bpy.props.PointerProperty(
+        name="Active Grid",
+        description="Grid collection the operators work on. Clear it to generate a new grid",
+        type=bpy.types.Collection,
+        poll=lambda self, collection: is_grid(collection)
+    )
     unit_measure: bpy.props.EnumProperty(
         name="Unit of Measure",
         description="Select the unit of measure for the distance",
@@ -15,40 +41,145 @@ class GridSettings(bpy.types.PropertyGroup):
             ('hm', "Hectometers", ""),
             ('km', "Kilometers", "")
         ],
-        default='m'
+        default='m',
+        update=update_procedural_grid
     )
     distance_x: bpy.props.FloatProperty(
         name="Distance X",
         description="Distance between numbers on X axis",
         default=1.0,
         min=0.1,
-        max=1000.0
+        max=1000.0,
+        update=update_procedural_grid
     )
     distance_y: bpy.props.FloatProperty(
         name="Distance Y",
         description="Distance between numbers on Y axis",
         default=1.0,
         min=0.1,
-        max=1000.0
+        max=1000.0,
+        update=update_procedural_grid
     )
     distance_z: bpy.props.FloatProperty(
         name="Distance Z",
         description="Distance between numbers on Z axis",
         default=1.0,
         min=0.1,
-        max=1000.0
+        max=1000.0,
+        update=update_procedural_grid
+    )
+    grid_origin: bpy.props.FloatVectorProperty(
+        name="Origin",
+        description="World position of the first grid node, carried by the grid root",
+        size=3,
+        default=(0.0, 0.0, 0.0),
+        subtype='TRANSLATION',
+        unit='LENGTH',
+        update=update_grid_origin
     )
     subdivisions: bpy.props.IntProperty(
         name="Subdivisions",
         description="Number of subdivisions in each dimension",
         default=2,
         min=1,
-        max=20
+        soft_max=20,
+        max=1000,
+        update=update_procedural_grid
+    )
+    use_axis_subdivisions: bpy.props.BoolProperty(
+        name="Per-Axis Subdivisions",
+        description="Set a different number of subdivisions along each axis",
+        default=False,
+        update=update_procedural_grid
+    )
+    subdivisions_x: bpy.props.IntProperty(
+        name="Subdivisions X",
+        description="Number of subdivisions along the X axis",
+        default=2,
+        min=1,
+        soft_max=200,
+        max=1000,
+        update=update_procedural_grid
+    )
+    subdivisions_y: bpy.props.IntProperty(
+        name="Subdivisions Y",
+        description="Number of subdivisions along the Y axis",
+        default=2,
+        min=1,
+        soft_max=200,
+        max=1000,
+        update=update_procedural_grid
+    )
+    subdivisions_z: bpy.props.IntProperty(
+        name="Subdivisions Z",
+        description="Number of subdivisions along the Z axis",
+        default=2,
+        min=1,
+        soft_max=200,
+        max=1000,
+        update=update_procedural_grid
     )
     show_numbers: bpy.props.BoolProperty(
         name="Show Numbers",
         description="Show numbers on nodes",
-        default=True
+        default=True,
+        update=update_procedural_grid
+    )
+    label_facing: bpy.props.EnumProperty(
+        name="Label Facing",
+        description="How labels are turned toward the camera",
+        items=[
+            ('BILLBOARD', "Billboard", "One Geometry Nodes instancer turns every label toward the camera in a single pass"),
+            ('CONSTRAINTS', "Label Objects", "One text object per label, each with its own Track To constraint"),
+        ],
+        default='CONSTRAINTS'
+    )
+    label_lod: bpy.props.EnumProperty(
+        name="Label Detail",
+        description="Which nodes get a label. Nodes left out get no text object at all",
+        items=[
+            ('ALL', "All Nodes", "Label every node"),
+            ('EVERY_NTH', "Every Nth Node", "Label nodes whose indices are multiples of the stride, plus the last ones"),
+            ('BOUNDARY', "Boundary", "Only label nodes on the edges of the grid's bounding box"),
+            ('DISTANCE', "Camera Distance", "Only label nodes within a distance of the camera"),
+            ('AXIS_TICKS', "Axis Ticks", "One label per axis value, along one boundary edge of each axis"),
+        ],
+        default='ALL'
+    )
+    tick_axes: bpy.props.BoolVectorProperty(
+        name="Tick Axes",
+        description="Axes that get tick labels",
+        size=3,
+        default=(True, True, True),
+        subtype='XYZ'
+    )
+    tick_far_side: bpy.props.BoolVectorProperty(
+        name="Far Side",
+        description="Place the ticks of the other axes on the far side of this axis instead of at the origin",
+        size=3,
+        default=(False, False, False),
+        subtype='XYZ'
+    )
+    tick_interval: bpy.props.IntProperty(
+        name="Tick Interval",
+        description="Label every Nth division along each axis, plus the last one",
+        default=1,
+        min=1,
+        soft_max=20
+    )
+    label_stride: bpy.props.IntProperty(
+        name="Label Stride",
+        description="Label every Nth node along each axis",
+        default=2,
+        min=1,
+        soft_max=20
+    )
+    label_distance: bpy.props.FloatProperty(
+        name="Label Distance",
+        description="Nodes farther than this from the camera are not labelled",
+        default=10.0,
+        min=0.0,
+        subtype='DISTANCE'
     )
     text_size: bpy.props.FloatProperty(
         name="Text Size",
@@ -122,28 +253,32 @@ class GridSettings(bpy.types.PropertyGroup):
             ('EXTERIOR_EDGES_2', "Exterior Edges 2", "Generate only exterior edges (type 2)"),
             ('2D_GRID', "2D Grid", "Generate a 2D square grid without internal edges"),
         ],
-        default='CUBIC_INTERNAL_EDGES'
+        default='CUBIC_INTERNAL_EDGES',
+        update=update_procedural_grid
     )
     text_offset_x: bpy.props.FloatProperty(
         name="Text Offset X",
         description="Offset for text on X axis",
         default=0.0,
         min=-10.0,
-        max=10.0
+        max=10.0,
+        update=update_procedural_grid
     )
     text_offset_y: bpy.props.FloatProperty(
         name="Text Offset Y",
         description="Offset for text on Y axis",
         default=0.0,
         min=-10.0,
-        max=10.0
+        max=10.0,
+        update=update_procedural_grid
     )
     text_offset_z: bpy.props.FloatProperty(
         name="Text Offset Z",
         description="Offset for text on Z axis",
         default=0.0,
         min=-10.0,
-        max=10.0
+        max=10.0,
+        update=update_procedural_grid
     )
     text_direction_x: bpy.props.EnumProperty(
         name="Text Direction X",
@@ -156,7 +291,8 @@ class GridSettings(bpy.types.PropertyGroup):
             ('Z', "Z", "Positive Z"),
             ('-Z', "-Z", "Negative Z"),
         ],
-        default='X'
+        default='X',
+        update=update_procedural_grid
     )
     text_direction_y: bpy.props.EnumProperty(
         name="Text Direction Y",
@@ -169,7 +305,8 @@ class GridSettings(bpy.types.PropertyGroup):
             ('Z', "Z", "Positive Z"),
             ('-Z', "-Z", "Negative Z"),
         ],
-        default='Y'
+        default='Y',
+        update=update_procedural_grid
     )
     text_direction_z: bpy.props.EnumProperty(
         name="Text Direction Z",
@@ -182,7 +319,8 @@ class GridSettings(bpy.types.PropertyGroup):
             ('Z', "Z", "Positive Z"),
             ('-Z', "-Z", "Negative Z"),
         ],
-        default='Z'
+        default='Z',
+        update=update_procedural_grid
     )
 
     base_text_size: bpy.props.FloatProperty(
@@ -190,7 +328,8 @@ class GridSettings(bpy.types.PropertyGroup):
         description="Base size of the text on nodes",
         default=0.5,
         min=0.1,
-        max=5.0
+        max=5.0,
+        update=update_procedural_grid
     )
 
     base_edge_size: bpy.props.FloatProperty(
@@ -198,7 +337,89 @@ class GridSettings(bpy.types.PropertyGroup):
         description="Base thickness of the grid edges",
         default=0.05,
         min=0.01,
-        max=0.5
+        max=0.5,
+        update=update_procedural_grid
+    )
+
+    generation_mode: bpy.props.EnumProperty(
+        name="Generation Mode",
+        description="How the grid is generated",
+        items=[
+            ('OBJECTS', "Objects", "Build nodes, labels and edges as separate Python-created objects"),
+            ('GEOMETRY_NODES', "Geometry Nodes", "Build the whole grid procedurally on one object with live parameters"),
+        ],
+        default='OBJECTS'
+    )
+
+    incremental_update: bpy.props.BoolProperty(
+        name="Incremental Update",
+        description="Update the existing grid in place when regenerating, moving kept nodes and rewriting only changed labels",
+        default=True
+    )
+
+    node_mode: bpy.props.EnumProperty(
+        name="Node Mode",
+        description="How the grid nodes are stored",
+        items=[
+            ('EMPTIES', "Empty Objects", "Create one empty object per node"),
+            ('POINT_CLOUD', "Point Cloud", "Store every node as a vertex of one mesh object"),
+        ],
+        default='EMPTIES'
+    )
+
+    node_marker: bpy.props.EnumProperty(
+        name="Node Marker",
+        description="Marker drawn on every node of the point cloud",
+        items=[
+            ('NONE', "None", "Do not draw node markers"),
+            ('SPHERE', "Sphere", "Instance a small sphere on every node"),
+            ('POINT', "Point", "Render every node as a point"),
+        ],
+        default='NONE'
+    )
+
+    node_marker_size: bpy.props.FloatProperty(
+        name="Node Marker Size",
+        description="Radius of the node markers",
+        default=0.05,
+        min=0.001,
+        max=1.0
+    )
+
+    edge_mode: bpy.props.EnumProperty(
+        name="Edge Mode",
+        description="How the grid edges are built",
+        items=[
+            ('CURVES', "Curve Objects", "Create one beveled curve object per edge"),
+            ('MESH', "Single Mesh", "Build every edge into one mesh object with skin thickness"),
+            ('INSTANCED', "Instanced Curve", "Place objects sharing one unit curve, so thickness is a single write"),
+        ],
+        default='CURVES'
+    )
+
+    bake_mode: bpy.props.EnumProperty(
+        name="Bake Mode",
+        description="Geometry the edges are baked into",
+        items=[
+            ('TUBES', "Tubes", "Open tubes with a fixed number of sides"),
+            ('RIBBONS', "Ribbons", "One flat quad per edge, facing the camera"),
+        ],
+        default='TUBES'
+    )
+
+    bake_resolution: bpy.props.IntProperty(
+        name="Tube Sides",
+        description="Sides of each baked tube",
+        default=6,
+        min=3,
+        max=32
+    )
+
+    bake_polygon_budget: bpy.props.IntProperty(
+        name="Polygon Budget",
+        description="Maximum polygons of the baked mesh, 0 for no limit. Tubes lose sides or turn into ribbons to fit it, a bake that cannot fit as ribbons is refused",
+        default=200000,
+        min=0
     )
 
     grid_2d_orientation: bpy.props.EnumProperty(
@@ -212,7 +433,8 @@ class GridSettings(bpy.types.PropertyGroup):
             ('-XZ', "-XZ Plane", "Orient grid on -XZ plane"),
             ('-YZ', "-YZ Plane", "Orient grid on -YZ plane"),
         ],
-        default='XY'
+        default='XY',
+        update=update_procedural_grid
     )
 
     length_axis_2d: bpy.props.EnumProperty(
@@ -223,5 +445,91 @@ class GridSettings(bpy.types.PropertyGroup):
             ('Y', "Y Axis", "Show lengths on Y axis"),
             ('BOTH', "Both Axes", "Show lengths on both X and Y axes"),
         ],
-        default='BOTH'
-    )
\ No newline at end of file
+        default='BOTH',
+        update=update_procedural_grid
+    )
+    animate_grid: bpy.props.BoolProperty(
+        name="Animate Grid",
+        description="On frame change, move the objects of the active grid to the keyframed distances and unit scale instead of regenerating it",
+        default=False,
+        update=update_animate_grid
+    )
+    budget_action: bpy.props.EnumProperty(
+        name="Over Budget",
+        description="What Generate Nodes and Create Edges do when the estimated cost exceeds the budget",
+        items=[
+            ('OFF', "Ignore", "Build regardless of the estimate"),
+            ('WARN', "Warn", "Build and report which limits are exceeded"),
+            ('DEGRADE', "Degrade", "Switch to compact nodes, labels and edges, then fewer labels, until the build fits"),
+            ('REFUSE', "Refuse", "Do not build"),
+        ],
+        default='WARN'
+    )
+    budget_objects: bpy.props.IntProperty(
+        name="Object Budget",
+        description="Most objects one operation may create. 0 for no limit",
+        default=100000,
+        min=0
+    )
+    budget_memory: bpy.props.IntProperty(
+        name="Memory Budget (MB)",
+        description="Most memory one operation may take. 0 for no limit",
+        default=4096,
+        min=0
+    )
+    budget_seconds: bpy.props.FloatProperty(
+        name="Time Budget",
+        description="Longest one operation may take, in seconds. 0 for no limit",
+        default=60.0,
+        min=0.0
+    )
+
+    log_level: bpy.props.EnumProperty(
+        name="Log Level",
+        description="Messages the add-on writes to the console",
+        items=[
+            ('WARNING', "Warnings", "Only report problems"),
+            ('INFO', "Info", "Report a timing summary for each operation"),
+            ('DEBUG', "Debug", "Report every timed phase"),
+        ],
+        default='WARNING'
+    )
+
+    profile_capture: bpy.props.BoolProperty(
+        name="Capture Profile",
+        description="Run cProfile and tracemalloc during operations. Slows them down",
+        default=False
+    )
+
+    write_profile_report: bpy.props.BoolProperty(
+        name="Write Report",
+        description="Write the latest timings of each operation to a JSON file",
+        default=False
+    )
+
+    profile_report: bpy.props.StringProperty(
+        name="Report File",
+        description="JSON report path. Defaults to the temporary directory",
+        default="",
+        subtype='FILE_PATH'
+    )
+
+    use_grid_cache: bpy.props.BoolProperty(
+        name="Use Grid Cache",
+        description="Append grids built before with the same settings from an on-disk .blend cache instead of rebuilding them",
+        default=False
+    )
+
+    grid_cache_directory: bpy.props.StringProperty(
+        name="Cache Directory",
+        description="Directory of the grid cache. Defaults to the user data directory",
+        default="",
+        subtype='DIR_PATH'
+    )
+
+    grid_cache_size: bpy.props.IntProperty(
+        name="Cache Size (MB)",
+        description="Oldest cached grids are evicted past this size, 0 for no limit",
+        default=512,
+        min=0
+    )
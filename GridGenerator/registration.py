@@ -2,6 +2,10 @@ import bpy
 from .panel import OBJECT_PT_GridGeneratorPanel
 from .operators.generate_nodes import GenerateNodesOperator
 from .operators.create_edges import CreateEdgesOperator
+from .operators.delete_grid import DeleteGridOperator
+from .operators.bake_edges import BakeEdgesOperator
+from .operators.clear_grid_cache import ClearGridCacheOperator
+from .operators.fit_grid import FitGridToSelectionOperator
 from .operators.update_operators import (
     UpdateTextSizeOperator,
     UpdateEdgeSizeOperator,
@@ -9,11 +13,16 @@ from .operators.update_operators import (
     ResizeSceneOperator
 )
 from .properties.grid_settings import GridSettings
+from .core.animation import animate_grids, clear_bindings, reset_bindings
 
 def register():
     bpy.utils.register_class(OBJECT_PT_GridGeneratorPanel)
     bpy.utils.register_class(GenerateNodesOperator)
     bpy.utils.register_class(CreateEdgesOperator)
+    bpy.utils.register_class(DeleteGridOperator)
+    bpy.utils.register_class(BakeEdgesOperator)
+    bpy.utils.register_class(ClearGridCacheOperator)
+    bpy.utils.register_class(FitGridToSelectionOperator)
     bpy.utils.register_class(UpdateTextSizeOperator)
     bpy.utils.register_class(UpdateEdgeSizeOperator)
     bpy.utils.register_class(ApplyEmissiveMaterialOperator)
@@ -21,12 +30,23 @@ def register():
     bpy.utils.register_class(GridSettings)
     bpy.types.Scene.grid_settings = bpy.props.PointerProperty(
         type=GridSettings)
+    bpy.app.handlers.frame_change_post.append(animate_grids)
+    bpy.app.handlers.load_post.append(reset_bindings)
 
 
 def unregister():
+    if animate_grids in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(animate_grids)
+    if reset_bindings in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(reset_bindings)
+    clear_bindings()
     bpy.utils.unregister_class(OBJECT_PT_GridGeneratorPanel)
     bpy.utils.unregister_class(GenerateNodesOperator)
     bpy.utils.unregister_class(CreateEdgesOperator)
+    bpy.utils.unregister_class(DeleteGridOperator)
+    bpy.utils.unregister_class(BakeEdgesOperator)
+    bpy.utils.unregister_class(ClearGridCacheOperator)
+    bpy.utils.unregister_class(FitGridToSelectionOperator)
     bpy.utils.unregister_class(UpdateTextSizeOperator)
     bpy.utils.unregister_class(UpdateEdgeSizeOperator)
     bpy.utils.unregister_class(ApplyEmissiveMaterialOperator)
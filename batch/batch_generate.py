@@ -0,0 +1,278 @@
+# Batch grid generation over a pool of background Blender processes.
+#
+#   python batch/batch_generate.py spec.json --output build/grids --workers 8
+#
+# The spec lists grid configurations. Every job runs in its own
+# `blender --background` process, started by this script, which generates the
+# nodes, creates the edges, applies the emissive material and exports the
+# result as .blend and/or .glb. Each job writes its own log file and a summary
+# of the failed jobs is printed at the end, with exit status 1 if any failed.
+#
+# Spec format:
+#
+#   {
+#     "defaults": {"unit_measure": "cm", "show_numbers": true},
+#     "steps": ["generate", "edges", "material"],
+#     "export": ["blend", "glb"],
+#     "jobs": [
+#       {"name": "cube_10", "settings": {"grid_type": "CUBIC_INTERNAL_EDGES", "subdivisions": 10}},
+#       {"name": "plane_xz", "settings": {"grid_type": "2D_GRID", "grid_2d_orientation": "XZ"},
+#        "export": ["glb"]}
+#     ]
+#   }
+#
+# "settings" holds GridSettings properties by name. "steps" and "export" may be
+# overridden per job.
+
+import argparse
+import json
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.abspath(__file__)
+
+STEPS = ("generate", "edges", "material", "bake")
+DEFAULT_STEPS = ("generate", "edges", "material")
+EXPORTS = ("blend", "glb")
+DEFAULT_EXPORTS = ("blend",)
+
+STEP_OPERATORS = {
+    "generate": "generate_nodes",
+    "edges": "create_edges",
+    "material": "apply_emissive_material",
+    "bake": "bake_edges",
+}
+
+
+def safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name) or "grid"
+
+
+def load_jobs(spec_path):
+    with open(spec_path, encoding="utf-8") as spec_file:
+        spec = json.load(spec_file)
+    defaults = spec.get("defaults", {})
+    jobs = []
+    names = set()
+    for i, job in enumerate(spec.get("jobs", [])):
+        name = safe_name(job.get("name", f"grid_{i:04d}"))
+        if name in names:
+            raise ValueError(f"Duplicate job name {name!r} in {spec_path}")
+        names.add(name)
+        steps = job.get("steps", spec.get("steps", DEFAULT_STEPS))
+        exports = job.get("export", spec.get("export", DEFAULT_EXPORTS))
+        unknown = [step for step in steps if step not in STEPS] + [kind for kind in exports if kind not in EXPORTS]
+        if unknown:
+            raise ValueError(f"Job {name!r} has unknown steps or exports: {', '.join(unknown)}")
+        jobs.append({
+            "name": name,
+            "settings": {**defaults, **job.get("settings", {})},
+            "steps": list(steps),
+            "export": list(exports),
+        })
+    return jobs
+
+
+# Driver: runs outside Blender and spreads the jobs over worker processes
+
+def parse_driver_args(argv):
+    parser = argparse.ArgumentParser(prog="batch_generate.py", description="Generate grids in batch")
+    parser.add_argument("spec", help="JSON spec of the grid configurations")
+    parser.add_argument("--output", default="grids", help="Directory for the exported files and logs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Blender processes running at once")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable. Defaults to $BLENDER or blender on the PATH")
+    parser.add_argument("--timeout", type=float, help="Seconds before a job is killed")
+    parser.add_argument("--only", nargs="+", help="Run only the jobs with these names")
+    return parser.parse_args(argv)
+
+
+def run_job(job, args, log_dir):
+    job_path = os.path.join(log_dir, f"{job['name']}.json")
+    log_path = os.path.join(log_dir, f"{job['name']}.log")
+    with open(job_path, "w", encoding="utf-8") as job_file:
+        json.dump(job, job_file, indent=2)
+
+    command = [
+        args.blender, "--background", "--factory-startup", "--python-exit-code", "1",
+        "--python", SCRIPT, "--",
+        "--job", job_path, "--output", os.path.abspath(args.output),
+    ]
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        try:
+            process = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT, timeout=args.timeout)
+            error = None if process.returncode == 0 else f"exit status {process.returncode}"
+        except subprocess.TimeoutExpired:
+            error = f"timed out after {args.timeout} s"
+        except OSError as exc:
+            error = str(exc)
+    return job["name"], error, time.perf_counter() - start, log_path
+
+
+def drive(argv):
+    args = parse_driver_args(argv)
+    if shutil.which(args.blender) is None and not os.path.isfile(args.blender):
+        sys.exit(f"Blender executable not found: {args.blender}")
+    jobs = load_jobs(args.spec)
+    if args.only:
+        jobs = [job for job in jobs if job["name"] in args.only]
+
+    log_dir = os.path.join(args.output, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    workers = max(1, min(args.workers, len(jobs) or 1))
+    print(f"Running {len(jobs)} jobs on {workers} workers")
+
+    failures = []
+    start = time.perf_counter()
+    # Threads only wait on the Blender processes, the work itself runs in parallel there
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_job, job, args, log_dir) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            name, error, seconds, log_path = future.result()
+            status = "ok" if error is None else f"FAILED ({error})"
+            print(f"[{done}/{len(jobs)}] {name}: {status} in {seconds:.1f}s")
+            if error is not None:
+                failures.append((name, error, log_path))
+
+    print(f"{len(jobs) - len(failures)} of {len(jobs)} jobs succeeded in {time.perf_counter() - start:.1f}s")
+    if failures:
+        print("Failed jobs:")
+        for name, error, log_path in sorted(failures):
+            print(f"  {name}: {error}, see {log_path}")
+        sys.exit(1)
+
+
+# Worker: runs inside Blender, one job per process
+
+def parse_worker_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="batch_generate.py (worker)")
+    parser.add_argument("--job", required=True)
+    parser.add_argument("--output", required=True)
+    return parser.parse_args(argv)
+
+
+def load_addon():
+    sys.path.insert(0, REPO_ROOT)
+    import GridGenerator
+    if not hasattr(bpy.types.Scene, "grid_settings"):
+        GridGenerator.register()
+    return GridGenerator
+
+
+def new_scene():
+    bpy.ops.wm.read_homefile(use_empty=True)
+    scene = bpy.context.scene
+    # A camera up front keeps generate_nodes from calling camera_add
+    camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    camera.location = (0, -10, 5)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    return scene
+
+
+def apply_settings(grid_settings, settings):
+    for key, value in settings.items():
+        if not hasattr(grid_settings, key):
+            raise KeyError(f"Unknown grid setting {key!r}")
+        setattr(grid_settings, key, value)
+
+
+def run_step(step):
+    operator = getattr(bpy.ops.object, STEP_OPERATORS[step])
+    result = operator()
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"{step} returned {set(result)}")
+
+
+def export_glb(grid, path):
+    for obj in bpy.context.view_layer.objects:
+        obj.select_set(obj.name in grid.all_objects)
+    # Billboarded labels and node markers are Geometry Nodes instances, which the
+    # exporter skips unless asked to write them
+    bpy.ops.export_scene.gltf(filepath=path, export_format='GLB', use_selection=True, export_apply=True,
+                              export_gn_mesh=True)
+
+
+def glb_nodes(path):
+    # The node list from the JSON chunk of a GLB file
+    with open(path, "rb") as glb:
+        glb.read(12)
+        length, _ = struct.unpack("<II", glb.read(8))
+        document = json.loads(glb.read(length))
+    return document.get("nodes", [])
+
+
+def check_glb_labels(grid, path):
+    # Labels are text objects or instances, both easily left out of an export
+    from GridGenerator.core import registry
+
+    nodes = glb_nodes(path)
+    names = {node.get("name") for node in nodes}
+    missing = [obj.name for obj in registry.object_map(grid, 'labels').values() if obj.name not in names]
+    if missing:
+        raise RuntimeError(f"{path} lacks {len(missing)} label objects, e.g. {missing[0]}")
+    billboard = registry.get_member(grid, 'billboard')
+    if billboard is not None:
+        node = next((node for node in nodes if node.get("name") == billboard.name), None)
+        instances = len(node.get("children", ())) if node is not None else 0
+        if instances < len(billboard.data.vertices):
+            raise RuntimeError(f"{path} holds {instances} of the {len(billboard.data.vertices)} billboarded labels")
+
+
+def work():
+    args = parse_worker_args()
+    with open(args.job, encoding="utf-8") as job_file:
+        job = json.load(job_file)
+    scene = new_scene()
+    load_addon()
+    grid_settings = scene.grid_settings
+    apply_settings(grid_settings, job["settings"])
+
+    for step in job["steps"]:
+        if step in ("edges", "bake") and grid_settings.generation_mode == 'GEOMETRY_NODES':
+            # Procedural grids build their edges in Geometry Nodes
+            continue
+        start = time.perf_counter()
+        run_step(step)
+        print(f"{job['name']}: {step} {time.perf_counter() - start:.3f}s")
+
+    grid = grid_settings.active_grid
+    if grid is None:
+        raise RuntimeError("No grid was generated")
+    os.makedirs(args.output, exist_ok=True)
+    base = os.path.join(args.output, job["name"])
+    if "blend" in job["export"]:
+        bpy.ops.wm.save_as_mainfile(filepath=base + ".blend", copy=True)
+        print(f"{job['name']}: wrote {base}.blend")
+    if "glb" in job["export"]:
+        export_glb(grid, base + ".glb")
+        if grid_settings.show_numbers:
+            check_glb_labels(grid, base + ".glb")
+        print(f"{job['name']}: wrote {base}.glb")
+
+
+if __name__ == "__main__":
+    if bpy is None:
+        drive(sys.argv[1:])
+    else:
+        try:
+            work()
+        except Exception:
+            traceback.print_exc()
+            sys.exit(1)
@@ -0,0 +1,256 @@
+# Headless benchmark suite for the Grid Generator add-on.
+#
+#   blender --background --factory-startup --python-exit-code 1 \
+#       --python benchmarks/run_benchmarks.py -- \
+#       --output results.json --baseline benchmarks/baselines.json
+#
+# Every case builds a grid in a fresh scene with object.generate_nodes and
+# object.create_edges and records wall time, peak Python heap memory, the
+# process peak RSS, object and datablock counts and the size of the grid
+# written to a .blend file. Wall time is measured in a pass of its own, the
+# Python heap in a second pass under tracemalloc. When a baseline is given the
+# results are compared against it and the script exits with status 1 if any
+# metric regressed beyond its threshold.
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import bpy
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GRID_TYPES = ('CUBIC_INTERNAL_EDGES', 'CUBIC_EXTERIOR', 'EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2', '2D_GRID')
+QUICK_SUBDIVISIONS = (2, 5, 10)
+FULL_SUBDIVISIONS = (2, 5, 10, 15, 20)
+
+# Allowed relative growth per metric before it counts as a regression
+THRESHOLDS = {
+    'generate_seconds': 0.25,
+    'edges_seconds': 0.25,
+    'peak_python_bytes': 0.25,
+    'blend_bytes': 0.10,
+    'objects': 0.0,
+    'datablocks': 0.0,
+}
+# Timing differences below this are treated as noise
+MIN_SECONDS = 0.02
+
+COUNTED_DATA = ("objects", "meshes", "curves", "fonts", "materials", "node_groups")
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="run_benchmarks.py", description="Grid Generator benchmarks")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this JSON baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write the results to --baseline instead of comparing")
+    parser.add_argument("--full", action="store_true", help="Sweep subdivisions up to the maximum")
+    parser.add_argument("--subdivisions", type=int, nargs="+", help="Explicit subdivisions sweep")
+    parser.add_argument("--grid-types", nargs="+", choices=GRID_TYPES, default=GRID_TYPES)
+    parser.add_argument("--edge-mode", default='CURVES', help="Edge mode used by object.create_edges")
+    parser.add_argument("--font", help="Font file for the custom font cases. Defaults to a bundled font")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case, the fastest one is kept")
+    parser.add_argument("--threshold", type=float, help="Override every relative threshold")
+    return parser.parse_args(argv)
+
+
+def load_addon():
+    sys.path.insert(0, REPO_ROOT)
+    import GridGenerator
+    if not hasattr(bpy.types.Scene, "grid_settings"):
+        GridGenerator.register()
+    return GridGenerator
+
+
+def bundled_font():
+    fonts_dir = bpy.utils.system_resource('DATAFILES', path="fonts")
+    if not fonts_dir or not os.path.isdir(fonts_dir):
+        return None
+    for name in sorted(os.listdir(fonts_dir)):
+        if name.lower().endswith((".ttf", ".otf", ".woff", ".woff2")):
+            return os.path.join(fonts_dir, name)
+    return None
+
+
+def benchmark_cases(args, font):
+    if args.subdivisions:
+        subdivisions = args.subdivisions
+    else:
+        subdivisions = FULL_SUBDIVISIONS if args.full else QUICK_SUBDIVISIONS
+    fonts = (None, font) if font else (None,)
+    for grid_type, n, show_numbers, custom_font in itertools.product(args.grid_types, subdivisions,
+                                                                     (False, True), fonts):
+        if custom_font and not show_numbers:
+            continue
+        name = f"{grid_type}-{n}-{'numbers' if show_numbers else 'plain'}{'-font' if custom_font else ''}"
+        yield name, {
+            'grid_type': grid_type,
+            'subdivisions': n,
+            'show_numbers': show_numbers,
+            'use_custom_font': custom_font is not None,
+            'custom_font': custom_font or "",
+        }
+
+
+def datablock_count():
+    return sum(len(getattr(bpy.data, attr)) for attr in COUNTED_DATA)
+
+
+def new_scene(name):
+    scene = bpy.data.scenes.new(name)
+    # A camera up front keeps generate_nodes from calling camera_add
+    camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    camera.location = (0, -10, 5)
+    scene.collection.objects.link(camera)
+    return scene
+
+
+def clear_scene(scene):
+    for obj in list(scene.objects):
+        bpy.data.objects.remove(obj)
+    for collection in list(scene.collection.children_recursive):
+        bpy.data.collections.remove(collection)
+    bpy.data.scenes.remove(scene)
+    bpy.data.orphans_purge(do_recursive=True)
+
+
+def blend_size(grid):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "grid.blend")
+        bpy.data.libraries.write(path, {grid}, fake_user=True, compress=False)
+        return os.path.getsize(path)
+
+
+def peak_rss():
+    # High-water mark of the whole process, Blender's C allocations included.
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def build(scene):
+    with bpy.context.temp_override(scene=scene, view_layer=scene.view_layers[0]):
+        start = time.perf_counter()
+        bpy.ops.object.generate_nodes()
+        generate_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        bpy.ops.object.create_edges()
+        edges_seconds = time.perf_counter() - start
+    return generate_seconds, edges_seconds
+
+
+def case_scene(name, settings, edge_mode):
+    scene = new_scene(name)
+    grid_settings = scene.grid_settings
+    grid_settings.edge_mode = edge_mode
+    for key, value in settings.items():
+        setattr(grid_settings, key, value)
+    return scene
+
+
+def run_case(name, settings, edge_mode):
+    # Timing pass, tracemalloc would slow down every allocation
+    scene = case_scene(name, settings, edge_mode)
+    data_before = datablock_count()
+    generate_seconds, edges_seconds = build(scene)
+    grid = scene.grid_settings.active_grid
+    result = {
+        'generate_seconds': generate_seconds,
+        'edges_seconds': edges_seconds,
+        'objects': len(grid.all_objects) if grid else 0,
+        'datablocks': datablock_count() - data_before,
+        'blend_bytes': blend_size(grid) if grid else 0,
+    }
+    clear_scene(scene)
+
+    # Memory pass. tracemalloc only sees the Python heap, meshes, curves and
+    # objects are allocated by Blender and only show up in the process RSS
+    scene = case_scene(name, settings, edge_mode)
+    tracemalloc.start()
+    build(scene)
+    result['peak_python_bytes'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result['peak_rss_bytes'] = peak_rss()
+    clear_scene(scene)
+    return result
+
+
+def run(args, font):
+    results = {}
+    for name, settings in benchmark_cases(args, font):
+        runs = [run_case(name, settings, args.edge_mode) for _ in range(max(1, args.repeat))]
+        best = min(runs, key=lambda result: result['generate_seconds'] + result['edges_seconds'])
+        results[name] = {**best, 'settings': settings}
+        print(f"{name}: generate {best['generate_seconds']:.3f}s, edges {best['edges_seconds']:.3f}s, "
+              f"{best['objects']} objects, {best['datablocks']} datablocks, {best['blend_bytes']} bytes, "
+              f"Python peak {best['peak_python_bytes']} bytes")
+    return results
+
+
+def compare(results, baseline, override=None):
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric, threshold in THRESHOLDS.items():
+            if override is not None:
+                threshold = override
+            old, new = reference.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            if metric.endswith("_seconds") and new - old < MIN_SECONDS:
+                continue
+            # Counts are exact, any change means the generated topology changed
+            regressed = new > old * (1 + threshold) if threshold else new != old
+            if regressed:
+                regressions.append(f"{name}: {metric} {old} -> {new}")
+    return regressions
+
+
+def main():
+    args = parse_args()
+    addon = load_addon()
+    font = args.font or bundled_font()
+
+    results = run(args, font)
+    report = {
+        'blender': bpy.app.version_string,
+        'addon': ".".join(str(v) for v in addon.bl_info["version"]),
+        'edge_mode': args.edge_mode,
+        'cases': results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline:
+            regressions = compare(results, json.load(baseline)['cases'], args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
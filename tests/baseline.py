@@ -0,0 +1,152 @@
+# The node and edge loops of the operators before the NumPy lattice, reduced to
+# lattice indices. They take (nx, ny, nz) where the originals used one count for
+# every axis. Exterior subdivision nodes are stepped with integers: the original
+# int(start + t * (end - start)) could truncate a position one step short.
+
+GRID_TYPES = ('CUBIC_INTERNAL_EDGES', 'CUBIC_EXTERIOR', 'EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2', '2D_GRID')
+
+
+def exterior_corners(grid_type, nx, ny, nz):
+    return [
+        (0, 0, 0),
+        (nx, 0, 0),
+        (0, ny, 0),
+        (nx, 0, nz) if grid_type == 'EXTERIOR_EDGES_2' else (0, 0, nz),
+    ]
+
+
+def exterior_lines(grid_type):
+    return [(0, 1), (0, 2), (0, 3) if grid_type == 'EXTERIOR_EDGES_1' else (1, 3)]
+
+
+def nodes(grid_type, nx, ny, nz):
+    # [(index, label axis)] in creation order
+    result = []
+    if grid_type == 'CUBIC_INTERNAL_EDGES':
+        for z in range(nz + 1):
+            for y in range(ny + 1):
+                for x in range(nx + 1):
+                    if x == nx:
+                        axis = 'X'
+                    elif y == ny:
+                        axis = 'Y'
+                    elif z == nz:
+                        axis = 'Z'
+                    else:
+                        axis = 'X'
+                    result.append(((x, y, z), axis))
+
+    elif grid_type == 'CUBIC_EXTERIOR':
+        for z in [0, nz]:
+            for y in range(ny + 1):
+                for x in range(nx + 1):
+                    if x == nx:
+                        axis = 'X'
+                    elif y == ny:
+                        axis = 'Y'
+                    else:
+                        axis = 'Z'
+                    result.append(((x, y, z), axis))
+        for y in [0, ny]:
+            for z in range(1, nz):
+                for x in range(nx + 1):
+                    result.append(((x, y, z), 'X' if x == nx else 'Y'))
+        for x in [0, nx]:
+            for z in range(1, nz):
+                for y in range(1, ny):
+                    result.append(((x, y, z), 'X'))
+
+    elif grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2'):
+        corners = exterior_corners(grid_type, nx, ny, nz)
+        for x, y, z in corners:
+            if x == nx and z == 0:
+                axis = 'X'
+            elif y == ny:
+                axis = 'Y'
+            elif z == nz:
+                axis = 'Z'
+            else:
+                axis = 'X'
+            result.append(((x, y, z), axis))
+        for (a, b), n in zip(exterior_lines(grid_type), (nx, ny, nz)):
+            start, end = corners[a], corners[b]
+            for i in range(1, n):
+                index = tuple(s + i * (e - s) // n for s, e in zip(start, end))
+                if end[0] > start[0]:
+                    axis = 'X'
+                elif end[1] > start[1]:
+                    axis = 'Y'
+                else:
+                    axis = 'Z'
+                result.append((index, axis))
+
+    elif grid_type == '2D_GRID':
+        for y in range(ny + 1):
+            for x in range(nx + 1):
+                if x == 0 and y == 0:
+                    axis = 'X'
+                elif x == 0:
+                    axis = 'Y'
+                else:
+                    axis = 'X'
+                result.append(((x, y, 0), axis))
+
+    return result
+
+
+def edges(grid_type, nx, ny, nz):
+    # [(start index, end index)] as created, duplicates included
+    result = []
+    if grid_type == 'CUBIC_INTERNAL_EDGES':
+        for x in range(nx + 1):
+            for y in range(ny + 1):
+                for z in range(nz + 1):
+                    if x < nx:
+                        result.append(((x, y, z), (x + 1, y, z)))
+                    if y < ny:
+                        result.append(((x, y, z), (x, y + 1, z)))
+                    if z < nz:
+                        result.append(((x, y, z), (x, y, z + 1)))
+
+    elif grid_type == 'CUBIC_EXTERIOR':
+        for z in [0, nz]:
+            for y in range(ny + 1):
+                for x in range(nx):
+                    result.append(((x, y, z), (x + 1, y, z)))
+        for y in [0, ny]:
+            for z in range(nz + 1):
+                for x in range(nx):
+                    result.append(((x, y, z), (x + 1, y, z)))
+        for x in [0, nx]:
+            for z in range(nz + 1):
+                for y in range(ny):
+                    result.append(((x, y, z), (x, y + 1, z)))
+        for x in [0, nx]:
+            for y in range(ny + 1):
+                for z in range(nz):
+                    result.append(((x, y, z), (x, y, z + 1)))
+        for y in [0, ny]:
+            for x in range(nx + 1):
+                for z in range(nz):
+                    result.append(((x, y, z), (x, y, z + 1)))
+        for z in [0, nz]:
+            for x in range(nx + 1):
+                for y in range(ny):
+                    result.append(((x, y, z), (x, y + 1, z)))
+
+    elif grid_type in ('EXTERIOR_EDGES_1', 'EXTERIOR_EDGES_2'):
+        corners = exterior_corners(grid_type, nx, ny, nz)
+        for (a, b), n in zip(exterior_lines(grid_type), (nx, ny, nz)):
+            start, end = corners[a], corners[b]
+            chain = [start] + [tuple(s + i * (e - s) // n for s, e in zip(start, end)) for i in range(1, n)] + [end]
+            result.extend(zip(chain[:-1], chain[1:]))
+
+    elif grid_type == '2D_GRID':
+        for y in [0, ny]:
+            for x in range(nx):
+                result.append(((x, y, 0), (x + 1, y, 0)))
+        for x in [0, nx]:
+            for y in range(ny):
+                result.append(((x, y, 0), (x, y + 1, 0)))
+
+    return result
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The lattice and topology only need NumPy. They are imported from the add-on
+# directory so the package __init__, which needs bpy, is never run.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GridGenerator"))
@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pytest
+
+from core.lattice import AXIS_NAMES, ORIENTATIONS, build_lattice
+
+import baseline
+
+SUBDIVISIONS = [(1, 1, 1), (2, 2, 2), (5, 5, 5), (4, 3, 2), (1, 6, 3)]
+DISTANCES = (2.0, 3.5, 0.75)
+
+
+@pytest.mark.parametrize("grid_type", baseline.GRID_TYPES)
+@pytest.mark.parametrize("subdivisions", SUBDIVISIONS)
+def test_indices_and_axes_match_baseline(grid_type, subdivisions):
+    lattice = build_lattice(grid_type, subdivisions, DISTANCES)
+    expected = baseline.nodes(grid_type, *subdivisions)
+    assert lattice.indices.tolist() == [list(index) for index, _ in expected]
+    assert [AXIS_NAMES[axis] for axis in lattice.axes.tolist()] == [axis for _, axis in expected]
+
+
+@pytest.mark.parametrize("grid_type", baseline.GRID_TYPES)
+@pytest.mark.parametrize("subdivisions", SUBDIVISIONS)
+def test_coordinates_match_baseline(grid_type, subdivisions):
+    lattice = build_lattice(grid_type, subdivisions, DISTANCES)
+    expected = [[i * d / n for i, d, n in zip(index, DISTANCES, subdivisions)]
+                for index, _ in baseline.nodes(grid_type, *subdivisions)]
+    np.testing.assert_allclose(lattice.coords, expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("orientation", ORIENTATIONS)
+def test_2d_coordinates_follow_orientation(orientation):
+    # The baseline rotated every node of the XY plane with mathutils
+    lattice = build_lattice('2D_GRID', 3, DISTANCES, orientation)
+    flat = build_lattice('2D_GRID', 3, DISTANCES)
+    spec = ORIENTATIONS[orientation]
+    if spec is None:
+        expected = flat.coords
+    else:
+        axis, degrees = spec
+        c, s = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+        x, y, z = flat.coords.T
+        if axis == 'X':
+            expected = np.stack((x, c * y - s * z, s * y + c * z), axis=1)
+        else:
+            expected = np.stack((c * x + s * z, y, -s * x + c * z), axis=1)
+    np.testing.assert_allclose(lattice.coords, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("grid_type", baseline.GRID_TYPES)
+def test_indices_are_unique(grid_type):
+    lattice = build_lattice(grid_type, (6, 4, 5), DISTANCES)
+    assert len(np.unique(lattice.indices, axis=0)) == len(lattice.indices)
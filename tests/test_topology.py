@@ -0,0 +1,65 @@
+import pytest
+
+from core.lattice import build_lattice
+from core.topology import edge_counts, edge_topology, used_rows
+
+import baseline
+
+SUBDIVISIONS = [(1, 1, 1), (2, 2, 2), (5, 5, 5), (4, 3, 2), (1, 6, 3)]
+
+
+def edge_set(lattice, rows):
+    indices = lattice.indices.tolist()
+    return {frozenset((tuple(indices[start]), tuple(indices[end]))) for start, end in rows.tolist()}
+
+
+@pytest.mark.parametrize("grid_type", baseline.GRID_TYPES)
+@pytest.mark.parametrize("subdivisions", SUBDIVISIONS)
+def test_edges_match_baseline(grid_type, subdivisions):
+    lattice = build_lattice(grid_type, subdivisions, (1.0, 1.0, 1.0))
+    topology = edge_topology(lattice)
+    expected = {frozenset(edge) for edge in baseline.edges(grid_type, *subdivisions)}
+    assert edge_set(lattice, topology.rows) == expected
+    # Every undirected edge once
+    assert len(topology.rows) == len(expected)
+
+
+@pytest.mark.parametrize("grid_type", baseline.GRID_TYPES)
+@pytest.mark.parametrize("subdivisions", SUBDIVISIONS)
+def test_edges_run_along_their_axis(grid_type, subdivisions):
+    lattice = build_lattice(grid_type, subdivisions, (1.0, 1.0, 1.0))
+    topology = edge_topology(lattice)
+    steps = lattice.indices[topology.rows[:, 1]] - lattice.indices[topology.rows[:, 0]]
+    for step, axis in zip(steps.tolist(), topology.axes.tolist()):
+        assert step[axis] > 0
+        assert all(value == 0 for other, value in enumerate(step) if other != axis)
+
+
+@pytest.mark.parametrize("subdivisions", SUBDIVISIONS)
+def test_cubic_exterior_drops_duplicate_baseline_edges(subdivisions):
+    # The baseline created the edges along the box corners twice
+    created = baseline.edges('CUBIC_EXTERIOR', *subdivisions)
+    topology = edge_topology(build_lattice('CUBIC_EXTERIOR', subdivisions, (1.0, 1.0, 1.0)))
+    nx, ny, nz = subdivisions
+    assert len(created) - len(topology.rows) == 4 * (nx + ny + nz)
+
+
+@pytest.mark.parametrize("grid_type, subdivisions, counts", [
+    ('CUBIC_INTERNAL_EDGES', (2, 2, 2), {'X': 18, 'Y': 18, 'Z': 18, 'total': 54}),
+    ('CUBIC_INTERNAL_EDGES', (4, 3, 2), {'X': 48, 'Y': 45, 'Z': 40, 'total': 133}),
+    ('CUBIC_EXTERIOR', (2, 2, 2), {'X': 16, 'Y': 16, 'Z': 16, 'total': 48}),
+    ('CUBIC_EXTERIOR', (4, 3, 2), {'X': 40, 'Y': 36, 'Z': 28, 'total': 104}),
+    ('EXTERIOR_EDGES_1', (4, 3, 2), {'X': 4, 'Y': 3, 'Z': 2, 'total': 9}),
+    ('EXTERIOR_EDGES_2', (5, 5, 5), {'X': 5, 'Y': 5, 'Z': 5, 'total': 15}),
+    ('2D_GRID', (2, 2, 2), {'X': 4, 'Y': 4, 'Z': 0, 'total': 8}),
+    ('2D_GRID', (4, 3, 2), {'X': 8, 'Y': 6, 'Z': 0, 'total': 14}),
+])
+def test_edge_counts(grid_type, subdivisions, counts):
+    assert edge_counts(edge_topology(build_lattice(grid_type, subdivisions, (1.0, 1.0, 1.0)))) == counts
+
+
+@pytest.mark.parametrize("grid_type", baseline.GRID_TYPES)
+def test_used_rows_rebuild_the_edges(grid_type):
+    topology = edge_topology(build_lattice(grid_type, (4, 3, 2), (1.0, 1.0, 1.0)))
+    rows, edges = used_rows(topology)
+    assert (rows[edges] == topology.rows).all()